@@ -0,0 +1,67 @@
+"""add source group ids to schedule entries and snapshots
+
+Revision ID: 6b7c8d9e0f1a
+Revises: 5a6b7c8d9e0f
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "6b7c8d9e0f1a"
+down_revision: str | Sequence[str] | None = "5a6b7c8d9e0f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add group columns; existing rows belong to the configured group."""
+    op.add_column(
+        "schedule_entries", sa.Column("source_group_id", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_schedule_entries_source_group_id"),
+        "schedule_entries",
+        ["source_group_id"],
+        unique=False,
+    )
+    op.add_column(
+        "schedule_snapshots", sa.Column("group_id", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_schedule_snapshots_group_id"),
+        "schedule_snapshots",
+        ["group_id"],
+        unique=False,
+    )
+
+    # Until now every sync replaced the whole table with one group's schedule
+    group_id = settings.schedule_group_id
+    op.execute(
+        sa.text("UPDATE schedule_entries SET source_group_id = :group_id").bindparams(
+            group_id=group_id
+        )
+    )
+    op.execute(
+        sa.text("UPDATE schedule_snapshots SET group_id = :group_id").bindparams(
+            group_id=group_id
+        )
+    )
+
+
+def downgrade() -> None:
+    """Remove group columns."""
+    op.drop_index(
+        op.f("ix_schedule_snapshots_group_id"), table_name="schedule_snapshots"
+    )
+    op.drop_column("schedule_snapshots", "group_id")
+    op.drop_index(
+        op.f("ix_schedule_entries_source_group_id"), table_name="schedule_entries"
+    )
+    op.drop_column("schedule_entries", "source_group_id")
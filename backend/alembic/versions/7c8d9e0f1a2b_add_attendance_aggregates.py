@@ -0,0 +1,52 @@
+"""add attendance_aggregates table
+
+Revision ID: 7c8d9e0f1a2b
+Revises: 6b7c8d9e0f1a
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c8d9e0f1a2b"
+down_revision: str | Sequence[str] | None = "6b7c8d9e0f1a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "attendance_aggregates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("semester_id", sa.Integer(), nullable=False),
+        sa.Column("subject_name", sa.String(length=200), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=True),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("absences", sa.Integer(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+        sa.Column("as_of", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # One row per subject; NULL subject_id is a key value, not "unknown"
+    op.create_index(
+        "uq_attendance_aggregates_key",
+        "attendance_aggregates",
+        ["user_id", "semester_id", "subject_name", sa.text("coalesce(subject_id, 0)")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_attendance_aggregates_key", table_name="attendance_aggregates")
+    op.drop_table("attendance_aggregates")
@@ -0,0 +1,41 @@
+"""add keyset pagination indexes
+
+Revision ID: 8d9e0f1a2b3c
+Revises: 7c8d9e0f1a2b
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d9e0f1a2b3c"
+down_revision: str | Sequence[str] | None = "7c8d9e0f1a2b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add indexes matching the listing sort keys."""
+    op.create_index(
+        "ix_schedule_entries_date_start_id",
+        "schedule_entries",
+        ["lesson_date", "start_time", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_lesson_notes_user_updated_id",
+        "lesson_notes",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_files_created_id", "files", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Remove listing sort key indexes."""
+    op.drop_index("ix_files_created_id", table_name="files")
+    op.drop_index("ix_lesson_notes_user_updated_id", table_name="lesson_notes")
+    op.drop_index("ix_schedule_entries_date_start_id", table_name="schedule_entries")
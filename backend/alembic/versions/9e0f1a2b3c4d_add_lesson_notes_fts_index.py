@@ -0,0 +1,35 @@
+"""add full-text search index on lesson notes
+
+Revision ID: 9e0f1a2b3c4d
+Revises: 8d9e0f1a2b3c
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e0f1a2b3c4d"
+down_revision: str | Sequence[str] | None = "8d9e0f1a2b3c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add a GIN index over the Russian tsvector of note content."""
+    op.create_index(
+        "ix_lesson_notes_content_fts",
+        "lesson_notes",
+        [sa.text("to_tsvector('russian', content)")],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Remove the note full-text search index."""
+    op.drop_index("ix_lesson_notes_content_fts", table_name="lesson_notes")
@@ -0,0 +1,33 @@
+"""allow files to share content-addressed stored files
+
+Revision ID: a0f1a2b3c4d5
+Revises: 9e0f1a2b3c4d
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a0f1a2b3c4d5"
+down_revision: str | Sequence[str] | None = "9e0f1a2b3c4d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Replace the unique constraint with a plain index (reference counts)."""
+    op.drop_constraint("files_stored_filename_key", "files", type_="unique")
+    op.create_index(
+        "ix_files_stored_filename", "files", ["stored_filename"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Restore uniqueness (fails while records share a stored file)."""
+    op.drop_index("ix_files_stored_filename", table_name="files")
+    op.create_unique_constraint(
+        "files_stored_filename_key", "files", ["stored_filename"]
+    )
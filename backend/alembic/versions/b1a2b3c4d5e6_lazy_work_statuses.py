@@ -0,0 +1,69 @@
+"""create work statuses lazily (missing row means not_started)
+
+Revision ID: b1a2b3c4d5e6
+Revises: a0f1a2b3c4d5
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b1a2b3c4d5e6"
+down_revision: str | Sequence[str] | None = "a0f1a2b3c4d5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Drop untouched default statuses and make (work_id, user_id) unique.
+
+    Rows that were fanned out by create_work and never changed carry no
+    information once a missing row reads as not_started, so they are
+    removed (with their initial history entry).
+    """
+    # Step 1: Deduplicate — keep the latest row per (work_id, user_id)
+    op.execute("""
+        DELETE FROM work_statuses
+        WHERE id NOT IN (
+            SELECT DISTINCT ON (work_id, user_id) id
+            FROM work_statuses
+            ORDER BY work_id, user_id, updated_at DESC
+        )
+    """)
+
+    # Step 2: Remove default rows nobody has updated
+    op.execute("""
+        DELETE FROM work_statuses ws
+        WHERE ws.status = 'not_started'
+          AND ws.grade IS NULL
+          AND ws.notes IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM work_status_history h
+              WHERE h.work_status_id = ws.id AND h.old_status IS NOT NULL
+          )
+    """)
+
+    # Step 3: One status per user and work (also serves the per-user join)
+    op.create_unique_constraint(
+        "uq_work_status_work_user",
+        "work_statuses",
+        ["work_id", "user_id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the constraint and fan default statuses out to every user again."""
+    op.drop_constraint("uq_work_status_work_user", "work_statuses", type_="unique")
+
+    op.execute("""
+        INSERT INTO work_statuses (work_id, user_id, status, created_at, updated_at)
+        SELECT w.id, u.id, 'not_started', now(), now()
+        FROM works w CROSS JOIN users u
+        WHERE NOT EXISTS (
+            SELECT 1 FROM work_statuses ws
+            WHERE ws.work_id = w.id AND ws.user_id = u.id
+        )
+    """)
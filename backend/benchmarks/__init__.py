@@ -0,0 +1 @@
+"""Microbenchmarks for hot paths (run with `uv run python -m benchmarks.<name>`)."""
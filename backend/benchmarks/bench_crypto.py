@@ -0,0 +1,73 @@
+"""Benchmark credential encryption: per-call PBKDF2 vs cached key derivation.
+
+Usage:
+    uv run python -m benchmarks.bench_crypto [--calls N]
+"""
+
+import argparse
+import base64
+import time
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from src.config import settings
+from src.utils.crypto import (
+    APP_SALT,
+    KDF_ITERATIONS,
+    decrypt_credential,
+    encrypt_credential,
+)
+
+
+def _uncached_roundtrip(value: str) -> str:
+    """Encrypt + decrypt deriving the key on every call (previous behaviour)."""
+
+    def fernet() -> Fernet:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=APP_SALT,
+            iterations=KDF_ITERATIONS,
+        )
+        return Fernet(
+            base64.urlsafe_b64encode(kdf.derive(settings.secret_key.encode()))
+        )
+
+    token = fernet().encrypt(value.encode())
+    return fernet().decrypt(token).decode()
+
+
+def _cached_roundtrip(value: str) -> str:
+    """Encrypt + decrypt using the cached keyring."""
+    return decrypt_credential(encrypt_credential(value))
+
+
+def _measure(fn, calls: int) -> float:
+    """Return mean seconds per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn("benchmark-password")
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    """Run the benchmark and print per-call cost."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=3, help="Round trips per mode")
+    args = parser.parse_args()
+
+    # Warm the cache so the cached mode measures steady state
+    encrypt_credential("warm-up")
+
+    uncached = _measure(_uncached_roundtrip, args.calls)
+    cached = _measure(_cached_roundtrip, max(args.calls, 1000))
+
+    print(f"uncached encrypt+decrypt: {uncached * 1000:10.3f} ms/call")
+    print(f"cached   encrypt+decrypt: {cached * 1000:10.3f} ms/call")
+    print(f"speedup: {uncached / cached:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
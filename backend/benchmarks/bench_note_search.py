@@ -0,0 +1,167 @@
+"""Benchmark note search: ILIKE substring scan vs the full-text GIN index.
+
+Needs PostgreSQL (SQLite has neither tsvector nor GIN). Tables are created
+in a scratch schema that is dropped afterwards, so the application data in
+the target database is not touched.
+
+Usage:
+    uv run python -m benchmarks.bench_note_search [--notes N] [--users N]
+        [--runs N] [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.models.base import Base
+from src.models.note import LessonNote
+from src.models.user import User
+from src.services.note import search_notes
+
+SCHEMA = "bench_note_search"
+QUERIES = ["интеграл", "производная ряда", "контрольная", "теорема коши"]
+WORDS = [
+    "интеграл",
+    "производная",
+    "ряд",
+    "предел",
+    "функция",
+    "матрица",
+    "вектор",
+    "теорема",
+    "коши",
+    "лемма",
+    "доказательство",
+    "контрольная",
+    "экзамен",
+    "задача",
+    "решение",
+    "формула",
+    "график",
+    "лекция",
+    "семинар",
+    "конспект",
+    "вопрос",
+    "ответ",
+    "пример",
+    "определение",
+    "свойство",
+]
+CHUNK = 5000
+
+
+def _note_content(rng: random.Random) -> str:
+    """Generate a note body of 20-60 words."""
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 60)))
+
+
+async def _seed(session_maker, notes: int, users: int) -> None:
+    """Insert users and their notes in chunks."""
+    rng = random.Random(42)
+    now = datetime.now()
+    async with session_maker() as db:
+        await db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"bench{user_id}@example.com",
+                    "password_hash": "x",
+                    "name": f"Bench {user_id}",
+                }
+                for user_id in range(1, users + 1)
+            ],
+        )
+        rows = [
+            {
+                "user_id": 1 + i % users,
+                "subject_name": f"Дисциплина {i}",
+                "content": _note_content(rng),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(notes)
+        ]
+        for start in range(0, len(rows), CHUNK):
+            await db.execute(insert(LessonNote), rows[start : start + CHUNK])
+        await db.execute(text("ANALYZE lesson_notes"))
+        await db.commit()
+
+
+async def _ilike_search(db: AsyncSession, user_id: int, query: str, limit: int):
+    """Search the previous way: one ILIKE over the whole query string."""
+    result = await db.execute(
+        select(LessonNote)
+        .where(LessonNote.user_id == user_id, LessonNote.content.ilike(f"%{query}%"))
+        .order_by(LessonNote.updated_at.desc(), LessonNote.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def _measure(session_maker, search, users: int, runs: int) -> float:
+    """Return mean seconds per search across users and queries."""
+    async with session_maker() as db:
+        await search(db, 1, QUERIES[0], 20)  # warm-up
+        start = time.perf_counter()
+        for run in range(runs):
+            user_id = 1 + run % users
+            await search(db, user_id, QUERIES[run % len(QUERIES)], 20)
+            db.expunge_all()
+        return (time.perf_counter() - start) / runs
+
+
+async def run(database_url: str, notes: int, users: int, runs: int) -> None:
+    """Seed a scratch schema and print per-search timings."""
+    if not database_url.startswith("postgresql"):
+        raise SystemExit("This benchmark needs a PostgreSQL database URL")
+
+    admin = create_async_engine(database_url)
+    async with admin.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    engine = create_async_engine(
+        database_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        await _seed(session_maker, notes, users)
+
+        ilike = await _measure(session_maker, _ilike_search, users, runs)
+        fts = await _measure(session_maker, search_notes, users, runs)
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await admin.dispose()
+
+    print(f"notes: {notes} ({notes // users} per user)")
+    print(f"ILIKE substring scan:        {ilike * 1000:8.2f} ms/search")
+    print(f"full-text (GIN, ranked):     {fts * 1000:8.2f} ms/search")
+    print(f"speedup: {ilike / fts:.1f}x")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--notes", type=int, default=100_000, help="Notes in total")
+    parser.add_argument("--users", type=int, default=10, help="Note owners")
+    parser.add_argument("--runs", type=int, default=200, help="Searches per mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.database_url, args.notes, args.users, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark week view building: ORM + 7 list scans vs column tuples + buckets.
+
+Seeds an in-memory SQLite database with a dense multi-group week and times
+rendering the week view (including JSON serialization) both ways.
+
+Usage:
+    uv run python -m benchmarks.bench_week_schedule [--groups N] [--runs N]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.models.base import Base
+from src.models.schedule import ScheduleEntry
+from src.schemas.schedule import (
+    DayOfWeek,
+    DayScheduleResponse,
+    ScheduleEntryResponse,
+    WeekScheduleResponse,
+)
+from src.services.schedule import (
+    DAY_NAMES_RU,
+    get_schedule_entries_by_date_range,
+    get_week_bounds,
+    get_week_number,
+    get_week_schedule,
+    is_odd_week,
+)
+
+TARGET_DATE = date(2026, 10, 14)
+SLOTS = ["08:45", "10:30", "12:45", "14:30", "16:15", "18:00"]
+
+
+async def _legacy_week_schedule(
+    db: AsyncSession, target_date: date
+) -> WeekScheduleResponse:
+    """Build the week view the previous way (ORM objects, a scan per day)."""
+    week_start, week_end = get_week_bounds(target_date)
+    entries = await get_schedule_entries_by_date_range(db, week_start, week_end)
+
+    days: list[DayScheduleResponse] = []
+    for day_num in range(1, 8):
+        day_date = week_start + timedelta(days=day_num - 1)
+        day_entries = [e for e in entries if e.lesson_date == day_date]
+        days.append(
+            DayScheduleResponse(
+                date=day_date,
+                day_of_week=DayOfWeek(day_num),
+                day_name=DAY_NAMES_RU[day_num],
+                entries=[ScheduleEntryResponse.model_validate(e) for e in day_entries],
+            )
+        )
+
+    return WeekScheduleResponse(
+        week_start=week_start,
+        week_end=week_end,
+        week_number=get_week_number(target_date),
+        is_odd_week=is_odd_week(target_date),
+        days=days,
+    )
+
+
+def _week_rows(groups: int) -> list[dict]:
+    """Generate a full Mon-Sat timetable for `groups` groups."""
+    week_start, _ = get_week_bounds(TARGET_DATE)
+    now = datetime.now()
+    rows = []
+    for group in range(groups):
+        for day_offset in range(6):
+            for slot in SLOTS:
+                start = datetime.strptime(slot, "%H:%M")
+                rows.append(
+                    {
+                        "lesson_date": week_start + timedelta(days=day_offset),
+                        "day_of_week": day_offset + 1,
+                        "start_time": start.time(),
+                        "end_time": (start + timedelta(minutes=90)).time(),
+                        "subject_name": f"Дисциплина {group % 17}",
+                        "lesson_type": "lecture",
+                        "teacher_name": "Иванов И.И.",
+                        "room": f"{100 + group % 50}",
+                        "building": "Корпус 2",
+                        "group_name": f"МПБ-{group:03d}",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+    return rows
+
+
+async def _measure(session_maker, build, runs: int) -> float:
+    """Return mean seconds per rendered week view."""
+    async with session_maker() as db:
+        await build(db, TARGET_DATE)  # warm-up
+        start = time.perf_counter()
+        for _ in range(runs):
+            (await build(db, TARGET_DATE)).model_dump_json()
+            db.expunge_all()
+        return (time.perf_counter() - start) / runs
+
+
+async def run(groups: int, runs: int) -> None:
+    """Seed the database and print per-view timings."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    rows = _week_rows(groups)
+    async with session_maker() as db:
+        await db.execute(insert(ScheduleEntry), rows)
+        await db.commit()
+
+    legacy = await _measure(session_maker, _legacy_week_schedule, runs)
+    current = await _measure(session_maker, get_week_schedule, runs)
+    await engine.dispose()
+
+    print(f"entries/week: {len(rows)}")
+    print(f"legacy  (ORM + 7 scans):     {legacy * 1000:8.2f} ms/view")
+    print(f"current (tuples + buckets):  {current * 1000:8.2f} ms/view")
+    print(f"speedup: {legacy / current:.1f}x")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=40, help="Groups per week")
+    parser.add_argument("--runs", type=int, default=20, help="Views per mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.groups, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Benchmark works listing: eager-loading all statuses vs the caller's only.
+
+Seeds an in-memory SQLite database with works that every user has a status
+for (as create_work fans them out) and times GET /works for one user, both
+the previous way (selectinload of every WorkStatus, picked in Python) and
+with the per-user outer join.
+
+Usage:
+    uv run python -m benchmarks.bench_work_listing [--users N] [--works N]
+        [--runs N]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from src.models.base import Base
+from src.models.semester import Semester
+from src.models.subject import Subject
+from src.models.user import User
+from src.models.work import Work, WorkStatus
+from src.schemas.work import WorkStatusResponse, WorkWithStatusResponse
+from src.services.work import get_works
+
+CHUNK = 5000
+
+
+async def _legacy_get_works(
+    db: AsyncSession, user_id: int
+) -> list[WorkWithStatusResponse]:
+    """List works the previous way (all statuses loaded, filtered in Python)."""
+    result = await db.execute(
+        select(Work)
+        .options(selectinload(Work.statuses))
+        .order_by(Work.deadline.asc().nullslast(), Work.created_at.desc())
+    )
+    responses = []
+    for work in result.scalars().unique().all():
+        response = WorkWithStatusResponse.model_validate(work)
+        for ws in work.statuses:
+            if ws.user_id == user_id:
+                response.my_status = WorkStatusResponse.model_validate(ws)
+                break
+        responses.append(response)
+    return responses
+
+
+async def _seed(session_maker, users: int, works: int) -> None:
+    """Insert users, works and one status per (work, user)."""
+    now = datetime.now(UTC)
+    async with session_maker() as db:
+        await db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"bench{user_id}@example.com",
+                    "password_hash": "x",
+                    "name": f"Bench {user_id}",
+                }
+                for user_id in range(1, users + 1)
+            ],
+        )
+        await db.execute(
+            insert(Semester),
+            [{"id": 1, "number": 1, "year_start": 2026, "year_end": 2027, "name": "S"}],
+        )
+        await db.execute(
+            insert(Subject),
+            [{"id": s, "name": f"Дисциплина {s}", "semester_id": 1} for s in range(10)],
+        )
+        await db.execute(
+            insert(Work),
+            [
+                {
+                    "id": work_id,
+                    "title": f"Работа {work_id}",
+                    "work_type": "lab",
+                    "deadline": now + timedelta(days=work_id % 60),
+                    "subject_id": work_id % 10,
+                }
+                for work_id in range(1, works + 1)
+            ],
+        )
+        statuses = [
+            {"work_id": work_id, "user_id": user_id, "status": "not_started"}
+            for work_id in range(1, works + 1)
+            for user_id in range(1, users + 1)
+        ]
+        for start in range(0, len(statuses), CHUNK):
+            await db.execute(insert(WorkStatus), statuses[start : start + CHUNK])
+        await db.commit()
+
+
+async def _measure(session_maker, list_works, users: int, runs: int) -> float:
+    """Return mean seconds per serialized listing."""
+    async with session_maker() as db:
+        await list_works(db, 1)  # warm-up
+        db.expunge_all()
+        start = time.perf_counter()
+        for run in range(runs):
+            for work in await list_works(db, 1 + run % users):
+                work.model_dump_json()
+            db.expunge_all()
+        return (time.perf_counter() - start) / runs
+
+
+async def run(users: int, works: int, runs: int) -> None:
+    """Seed the database and print per-listing timings."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    await _seed(session_maker, users, works)
+
+    legacy = await _measure(session_maker, _legacy_get_works, users, runs)
+    current = await _measure(session_maker, get_works, users, runs)
+    await engine.dispose()
+
+    print(f"users: {users}, works: {works}, statuses: {users * works}")
+    print(f"legacy  (selectinload all):  {legacy * 1000:8.2f} ms/listing")
+    print(f"current (per-user join):     {current * 1000:8.2f} ms/listing")
+    print(f"speedup: {legacy / current:.1f}x")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=500, help="Users in total")
+    parser.add_argument("--works", type=int, default=300, help="Works in total")
+    parser.add_argument("--runs", type=int, default=20, help="Listings per mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.works, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Load test: /api/v1/schedule/today latency during a login storm.
+
+Runs the app in-process against an in-memory SQLite database, polls
+/schedule/today and reports p50/p99 latency, first idle and then while
+concurrent logins hammer bcrypt. With --blocking, bcrypt verification is
+run inline on the event loop (the previous behaviour) for comparison.
+
+Usage:
+    uv run python -m benchmarks.load_login_storm [--logins N] [--blocking]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from unittest.mock import patch
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.database import get_db
+from src.main import app
+from src.models.base import Base
+from src.utils.rate_limit import limiter
+from src.utils.security import verify_password
+
+USER = {"email": "storm@example.com", "password": "stormpassword1", "name": "Storm"}
+
+
+async def _poll_today(client: AsyncClient, headers: dict, duration: float) -> list:
+    """Request /schedule/today back-to-back for `duration` seconds."""
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        resp = await client.get("/api/v1/schedule/today", headers=headers)
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _login(client: AsyncClient) -> None:
+    """Perform one login request."""
+    resp = await client.post(
+        "/api/v1/auth/login",
+        data={"username": USER["email"], "password": USER["password"]},
+    )
+    resp.raise_for_status()
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    """Print p50/p99 for a latency sample."""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<14} n={len(ordered):5d}  "
+        f"p50={statistics.median(ordered) * 1000:8.2f} ms  p99={p99 * 1000:8.2f} ms"
+    )
+
+
+async def run(logins: int, duration: float) -> None:
+    """Run idle and storm phases and print latency percentiles."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    limiter.enabled = False
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            await client.post("/api/v1/auth/register", json=USER)
+            resp = await client.post(
+                "/api/v1/auth/login",
+                data={"username": USER["email"], "password": USER["password"]},
+            )
+            headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+            _report("idle", await _poll_today(client, headers, duration))
+
+            storm = asyncio.gather(*(_login(client) for _ in range(logins)))
+            latencies = await _poll_today(client, headers, duration)
+            await storm
+            _report("login storm", latencies)
+    finally:
+        app.dependency_overrides.clear()
+        limiter.enabled = True
+        await engine.dispose()
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50, help="Concurrent logins")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds/phase")
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="Verify passwords inline on the event loop (previous behaviour)",
+    )
+    args = parser.parse_args()
+
+    if args.blocking:
+
+        async def inline_verify(plain: str, hashed: str) -> bool:
+            return verify_password(plain, hashed)
+
+        with patch("src.services.auth.verify_password_async", inline_verify):
+            asyncio.run(run(args.logins, args.duration))
+    else:
+        asyncio.run(run(args.logins, args.duration))
+
+
+if __name__ == "__main__":
+    main()
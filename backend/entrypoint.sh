@@ -35,18 +35,22 @@ echo "Checking if initial schedule sync is needed..."
 python -c "
 import asyncio
 from src.database import get_session_maker
+from src.parser.http_pool import close_upstream_client
 from src.services.schedule import get_latest_snapshot, sync_schedule
 
 async def initial_sync():
-    session_maker = get_session_maker()
-    async with session_maker() as db:
-        snapshot = await get_latest_snapshot(db)
-        if snapshot is None:
-            print('No schedule snapshot found, running initial sync...')
-            result = await sync_schedule(db)
-            print(f'Initial sync result: {result}')
-        else:
-            print(f'Schedule snapshot exists ({snapshot.entries_count} entries), skipping initial sync')
+    try:
+        session_maker = get_session_maker()
+        async with session_maker() as db:
+            snapshot = await get_latest_snapshot(db)
+            if snapshot is None:
+                print('No schedule snapshot found, running initial sync...')
+                result = await sync_schedule(db)
+                print(f'Initial sync result: {result}')
+            else:
+                print(f'Schedule snapshot exists ({snapshot.entries_count} entries), skipping initial sync')
+    finally:
+        await close_upstream_client()
 
 asyncio.run(initial_sync())
 " || echo "WARNING: Initial schedule sync failed (non-blocking, will retry via scheduler)"
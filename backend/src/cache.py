@@ -0,0 +1,36 @@
+"""Shared Redis client for caches.
+
+Unlike the scheduler's client, this one does not ping on every access and
+returns raw bytes, which lets cached responses be sent without re-encoding.
+Callers must treat Redis as optional and fall back to the database on errors.
+"""
+
+from redis.asyncio import Redis
+
+from src.config import settings
+
+_redis: Redis | None = None
+
+
+def get_cache_redis() -> Redis:
+    """Get or create the cache Redis client.
+
+    The underlying connection pool reconnects on demand, so no health check
+    is done here.
+    """
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=settings.cache_redis_timeout_seconds,
+            socket_timeout=settings.cache_redis_timeout_seconds,
+        )
+    return _redis
+
+
+async def close_cache_redis() -> None:
+    """Close the cache Redis client (called on application shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -44,6 +44,7 @@ async def cmd_parse(args: argparse.Namespace) -> int:
         Exit code (0 for success, 1 for error).
     """
     from src.parser import OmsuScheduleParser
+    from src.parser.http_pool import close_upstream_client
 
     logger = logging.getLogger(__name__)
     logger.info("Starting schedule parsing (dry-run mode)")
@@ -109,6 +110,8 @@ async def cmd_parse(args: argparse.Namespace) -> int:
     except Exception as e:
         logger.error("Parsing failed: %s", e, exc_info=args.verbose)
         return 1
+    finally:
+        await close_upstream_client()
 
 
 async def cmd_sync(args: argparse.Namespace) -> int:
@@ -124,6 +127,7 @@ async def cmd_sync(args: argparse.Namespace) -> int:
     from sqlalchemy.orm import sessionmaker
 
     from src.config import settings
+    from src.parser.http_pool import close_upstream_client
     from src.services import schedule as schedule_service
 
     logger = logging.getLogger(__name__)
@@ -160,6 +164,7 @@ async def cmd_sync(args: argparse.Namespace) -> int:
         return 1
     finally:
         await engine.dispose()
+        await close_upstream_client()
 
 
 def main() -> int:
@@ -1,21 +1,85 @@
 """Database connection and session management."""
 
+import time
 from collections.abc import AsyncGenerator
 from functools import lru_cache
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
 
 from src.config import settings
+from src.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    DB_POOL_OVERFLOW,
+)
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Publish an engine's pool usage to Prometheus.
+
+    The gauges read checkedout()/overflow() from the pool at scrape time.
+    Checkouts are timed around pool.connect(), which covers waiting for a
+    free connection in the queue and opening a new one when there is room.
+    Pools without a queue (SQLite's static/singleton pools) are left alone.
+
+    Args:
+        engine: Async engine to instrument.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+
+    DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+    DB_POOL_OVERFLOW.set_function(pool.overflow)
+
+    checkout = pool.connect
+
+    def timed_checkout() -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return checkout()
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+    pool.connect = timed_checkout  # type: ignore[method-assign]
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    """Get pool options for a database URL (SQLite keeps its defaults)."""
+    if url.startswith("sqlite"):
+        return {"pool_pre_ping": settings.db_pool_pre_ping}
+
+    options: dict[str, Any] = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size
+        }
+    return options
 
 
 @lru_cache
 def get_engine():
     """Get or create async engine (lazy initialization)."""
-    return create_async_engine(
+    engine = create_async_engine(
         settings.database_url,
         echo=settings.debug,
-        pool_pre_ping=True,
+        **_engine_options(settings.database_url),
     )
+    instrument_pool(engine)
+    return engine
 
 
 @lru_cache
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
 from src.models.user import User
 from src.services.user import get_user_by_id
+from src.services.user_cache import cache_user, get_cached_user
 from src.utils.exceptions import CredentialsException
 from src.utils.security import decode_token
 
@@ -26,8 +27,14 @@ async def get_current_user(
     if not user_id:
         raise CredentialsException()
 
+    iat = int(payload.get("iat", 0))
+    user = await get_cached_user(db, int(user_id), iat)
+    if user:
+        return user
+
     user = await get_user_by_id(db, int(user_id))
     if not user:
         raise CredentialsException()
 
+    await cache_user(user, iat)
     return user
@@ -31,6 +31,7 @@ from src.routers import (
     auth,
     classmates,
     files,
+    jobs,
     lk,
     notes,
     schedule,
@@ -41,6 +42,7 @@ from src.routers import (
     uploads,
     works,
 )
+from src.utils.pagination import NEXT_CURSOR_HEADER
 from src.utils.rate_limit import limiter
 
 logger = logging.getLogger(__name__)
@@ -62,7 +64,13 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
+    from src.cache import close_cache_redis
+    from src.parser.http_pool import close_upstream_client, open_upstream_client
     from src.scheduler import start_scheduler, stop_scheduler
+    from src.services.preview import shutdown_preview_executor
+    from src.tasks.queue import start_job_workers, stop_job_workers
+    from src.utils.crypto import load_fernet
+    from src.utils.security import shutdown_password_executor
 
     # Startup
     setup_logging(debug=settings.debug)
@@ -103,11 +111,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("Sentry initialized")
 
     APP_INFO.labels(version="0.1.0").set(1)
+    # Derive credential encryption keys once, off the event loop
+    await load_fernet()
+    await open_upstream_client()
     logger.info("StudyHelper API starting up")
     await start_scheduler()
+    await start_job_workers()
     yield
     # Shutdown
+    await stop_job_workers()
     await stop_scheduler()
+    shutdown_password_executor()
+    shutdown_preview_executor()
+    await close_cache_redis()
+    await close_upstream_client()
     logger.info("StudyHelper API shutting down")
 
 
@@ -137,6 +154,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Prometheus metrics middleware (outermost — captures total request time)
@@ -216,5 +234,6 @@ api_v1.include_router(files.router, prefix="/files", tags=["Files"])
 api_v1.include_router(attendance.router, prefix="/attendance", tags=["Attendance"])
 api_v1.include_router(notes.router, prefix="/notes", tags=["Notes"])
 api_v1.include_router(lk.router, prefix="/lk", tags=["LK"])
+api_v1.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 
 app.include_router(api_v1)
@@ -26,6 +26,38 @@ HTTP_REQUESTS_IN_PROGRESS = Gauge(
     ["method"],
 )
 
+# --- Database pool metrics ---
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Database connections open beyond pool_size (negative: idle capacity)",
+)
+
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool (including opening new ones)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+# --- Auth metrics ---
+
+PASSWORD_HASH_QUEUE_WAIT_SECONDS = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time bcrypt jobs wait for a free password hashing worker",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+USER_CACHE_REQUESTS_TOTAL = Counter(
+    "user_cache_requests_total",
+    "Authenticated user cache lookups",
+    ["result"],
+)
+
 # --- Schedule sync metrics ---
 
 SCHEDULE_SYNC_TOTAL = Counter(
@@ -40,6 +72,88 @@ SCHEDULE_SYNC_DURATION_SECONDS = Histogram(
     buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
 )
 
+SCHEDULE_SYNC_ROWS_TOTAL = Counter(
+    "schedule_sync_rows_total",
+    "Schedule entries written by syncs (rate over sync duration = rows/s)",
+    ["operation"],
+)
+
+SCHEDULE_GROUP_SYNC_TOTAL = Counter(
+    "schedule_group_sync_total",
+    "Schedule sync results per study group",
+    ["group", "status"],
+)
+
+SCHEDULE_GROUP_SYNC_DURATION_SECONDS = Histogram(
+    "schedule_group_sync_duration_seconds",
+    "Per-group schedule sync duration in seconds (fetch + apply)",
+    ["group"],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+SCHEDULE_CACHE_REQUESTS_TOTAL = Counter(
+    "schedule_cache_requests_total",
+    "Schedule view cache lookups",
+    ["result"],
+)
+
+# --- LK metrics ---
+
+LK_SESSION_CACHE_REQUESTS_TOTAL = Counter(
+    "lk_session_cache_requests_total",
+    "LK logins answered from a cached session (hit), by logging in (miss) "
+    "or after a cached session turned out expired (expired)",
+    ["result"],
+)
+
+# --- File metrics ---
+
+FILE_PREVIEWS_TOTAL = Counter(
+    "file_previews_total",
+    "Study file preview generation attempts",
+    ["result"],
+)
+
+# --- Background job metrics ---
+
+JOBS_TOTAL = Counter(
+    "jobs_total",
+    "Background jobs run, by kind and outcome",
+    ["kind", "status"],
+)
+
+JOBS_DEDUPLICATED_TOTAL = Counter(
+    "jobs_deduplicated_total",
+    "Job requests answered with an already queued, running or finished job",
+    ["kind"],
+)
+
+JOB_DURATION_SECONDS = Histogram(
+    "job_duration_seconds",
+    "Background job run time in seconds",
+    ["kind"],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+# --- Upstream HTTP pool metrics ---
+
+UPSTREAM_HTTP_REQUESTS_TOTAL = Counter(
+    "upstream_http_requests_total",
+    "Requests sent to eservice.omsu.ru over the shared pool",
+    ["http_version"],
+)
+
+UPSTREAM_HTTP_CONNECTIONS_OPENED_TOTAL = Counter(
+    "upstream_http_connections_opened_total",
+    "New TCP connections opened by the shared upstream pool",
+)
+
+UPSTREAM_HTTP_POOL_CONNECTIONS = Gauge(
+    "upstream_http_pool_connections",
+    "Connections held by the shared upstream pool",
+    ["state"],
+)
+
 # --- App info ---
 
 APP_INFO = Gauge(
@@ -1,6 +1,6 @@
 """SQLAlchemy models."""
 
-from src.models.attendance import Absence
+from src.models.attendance import Absence, AttendanceAggregate
 from src.models.base import Base
 from src.models.classmate import Classmate
 from src.models.file import File
@@ -16,6 +16,7 @@ from src.models.work import Work, WorkStatus, WorkStatusHistory
 
 __all__ = [
     "Absence",
+    "AttendanceAggregate",
     "Base",
     "Building",
     "Classmate",
@@ -70,3 +70,53 @@ class Absence(Base):
             f"<Absence(id={self.id}, user_id={self.user_id}, "
             f"subject={self.subject_name}, entry_id={self.schedule_entry_id})>"
         )
+
+
+class AttendanceAggregate(Base):
+    """Materialized per-subject attendance counts of a user in a semester.
+
+    Covers completed lessons dated before ``as_of`` within the semester
+    bounds it was computed for; lessons of the current day are counted live.
+    Rows are derived data: they are rebuilt when stale and dropped whenever
+    the schedule changes.
+    """
+
+    __tablename__ = "attendance_aggregates"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    semester_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("semesters.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    subject_name: Mapped[str] = mapped_column(String(200), nullable=False)
+    subject_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    absences: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    as_of: Mapped[date] = mapped_column(Date, nullable=False)
+
+    __table_args__ = (
+        # One row per subject; NULL subject_id is a key value, not "unknown"
+        Index(
+            "uq_attendance_aggregates_key",
+            "user_id",
+            "semester_id",
+            "subject_name",
+            func.coalesce(subject_id, 0),
+            unique=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<AttendanceAggregate(user_id={self.user_id}, "
+            f"semester_id={self.semester_id}, subject={self.subject_name})>"
+        )
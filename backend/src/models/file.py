@@ -14,15 +14,18 @@ if TYPE_CHECKING:
 
 
 class File(Base):
-    """Uploaded file model — immutable after creation."""
+    """Uploaded file model — immutable after creation.
+
+    Content is stored once per SHA-256 (stored_filename is "<sha256><ext>"),
+    so several records may share a stored file; it is removed from disk when
+    the last of them is deleted.
+    """
 
     __tablename__ = "files"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    stored_filename: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False
-    )
+    stored_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
     size: Mapped[int] = mapped_column(Integer, nullable=False)
     category: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -50,6 +53,8 @@ class File(Base):
         Index("ix_files_subject_id", "subject_id"),
         Index("ix_files_category", "category"),
         Index("ix_files_uploaded_by", "uploaded_by"),
+        Index("ix_files_created_id", "created_at", "id"),
+        Index("ix_files_stored_filename", "stored_filename"),
     )
 
     def __repr__(self) -> str:
@@ -3,7 +3,16 @@
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base, TimestampMixin
@@ -12,6 +21,9 @@ if TYPE_CHECKING:
     from src.models.schedule import ScheduleEntry
     from src.models.user import User
 
+# Text search configuration of note content (notes are written in Russian)
+NOTE_SEARCH_CONFIG = "russian"
+
 
 class LessonNote(Base, TimestampMixin):
     """User note for a subject.
@@ -45,6 +57,13 @@ class LessonNote(Base, TimestampMixin):
     __table_args__ = (
         UniqueConstraint("user_id", "subject_name", name="uq_lesson_note_user_subject"),
         Index("ix_lesson_notes_user_date", "user_id", "lesson_date"),
+        Index("ix_lesson_notes_user_updated_id", "user_id", "updated_at", "id"),
+        # Full-text search; queries must use the same to_tsvector expression
+        Index(
+            "ix_lesson_notes_content_fts",
+            text(f"to_tsvector('{NOTE_SEARCH_CONFIG}', content)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
     )
 
     def __repr__(self) -> str:
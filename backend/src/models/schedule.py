@@ -3,7 +3,7 @@
 from datetime import date, time
 from enum import Enum
 
-from sqlalchemy import Date, ForeignKey, Integer, String, Text, Time
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, Text, Time
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base, TimestampMixin
@@ -66,6 +66,11 @@ class ScheduleEntry(Base, TimestampMixin):
     group_name: Mapped[str | None] = mapped_column(String(50), nullable=True)
     subgroup: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Schedule API group this entry was synced from (null for manual entries)
+    source_group_id: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, index=True
+    )
+
     # Notes
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
@@ -81,6 +86,11 @@ class ScheduleEntry(Base, TimestampMixin):
     )
     teacher: Mapped["Teacher | None"] = relationship("Teacher")
 
+    __table_args__ = (
+        # Sort key of attendance listings (keyset pagination)
+        Index("ix_schedule_entries_date_start_id", "lesson_date", "start_time", "id"),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return (
@@ -96,6 +106,7 @@ class ScheduleSnapshot(Base, TimestampMixin):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     snapshot_date: Mapped[date] = mapped_column(Date, nullable=False)
+    group_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
     content_hash: Mapped[str] = mapped_column(String(64), nullable=False)  # SHA-256
     raw_data: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON dump
     source_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base, TimestampMixin
@@ -66,9 +66,16 @@ class Work(Base, TimestampMixin):
 
 
 class WorkStatus(Base, TimestampMixin):
-    """Work status for each user (pair mode)."""
+    """Work status for each user (pair mode).
+
+    Rows are created on a user's first update; a missing row means
+    not_started.
+    """
 
     __tablename__ = "work_statuses"
+    __table_args__ = (
+        UniqueConstraint("work_id", "user_id", name="uq_work_status_work_user"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     work_id: Mapped[int] = mapped_column(
@@ -0,0 +1,164 @@
+"""Shared HTTP connection pool for eservice.omsu.ru.
+
+Schedule and LK requests all go to the same host, so one application-scoped
+pool keeps TCP/TLS connections (and, with HTTP/2, streams) alive across
+syncs instead of every parser handshaking from scratch. The pool is opened
+in the application lifespan and closed on shutdown; code running outside the
+application (CLI, scripts) gets it lazily and should close it when done.
+
+Schedule parsers use the shared client directly. LK sessions are per user,
+so each LkParser borrows a client of its own: a separate cookie jar over the
+shared connections.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import httpx
+
+from src.config import settings
+from src.metrics import (
+    UPSTREAM_HTTP_CONNECTIONS_OPENED_TOTAL,
+    UPSTREAM_HTTP_POOL_CONNECTIONS,
+    UPSTREAM_HTTP_REQUESTS_TOTAL,
+)
+
+try:
+    import h2  # noqa: F401
+
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_transport: _PoolTransport | None = None
+_client: httpx.AsyncClient | None = None
+
+
+class _PoolTransport(httpx.AsyncBaseTransport):
+    """Transport over the shared connection pool, recording pool metrics."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request over the pool and record its HTTP version."""
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                UPSTREAM_HTTP_CONNECTIONS_OPENED_TOTAL.inc()
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        response = await self._transport.handle_async_request(request)
+        http_version = response.extensions.get("http_version", b"HTTP/1.1")
+        UPSTREAM_HTTP_REQUESTS_TOTAL.labels(http_version=http_version.decode()).inc()
+        self._observe_pool()
+        return response
+
+    def _observe_pool(self) -> None:
+        """Update the pool gauges from the underlying httpcore pool."""
+        pool = getattr(self._transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return
+        idle = sum(1 for connection in connections if connection.is_idle())
+        UPSTREAM_HTTP_POOL_CONNECTIONS.labels(state="idle").set(idle)
+        UPSTREAM_HTTP_POOL_CONNECTIONS.labels(state="active").set(
+            len(connections) - idle
+        )
+
+    async def aclose(self) -> None:
+        """Close the pool's connections."""
+        await self._transport.aclose()
+        UPSTREAM_HTTP_POOL_CONNECTIONS.labels(state="idle").set(0)
+        UPSTREAM_HTTP_POOL_CONNECTIONS.labels(state="active").set(0)
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """View of the shared pool that a borrowing client cannot close."""
+
+    def __init__(self, transport: _PoolTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request over the shared pool."""
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Leave the shared pool open (it is closed on shutdown)."""
+
+
+def _get_transport() -> _PoolTransport:
+    """Get or create the shared pool transport."""
+    global _transport
+    if _transport is None:
+        http2 = settings.upstream_http_http2
+        if http2 and not H2_AVAILABLE:
+            logger.warning("upstream_http_http2 is set but h2 is not installed")
+            http2 = False
+        _transport = _PoolTransport(
+            httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=settings.upstream_http_max_connections,
+                    max_keepalive_connections=(
+                        settings.upstream_http_max_keepalive_connections
+                    ),
+                    keepalive_expiry=settings.upstream_http_keepalive_expiry_seconds,
+                ),
+                http2=http2,
+            )
+        )
+        logger.info("Upstream HTTP pool created (http2=%s)", http2)
+    return _transport
+
+
+def get_upstream_client() -> httpx.AsyncClient:
+    """Get or create the shared client for eservice.omsu.ru.
+
+    Must not be closed by callers. Cookies set on it are shared by everyone,
+    so per-user sessions use borrow_upstream_client() instead.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            transport=_BorrowedTransport(_get_transport()),
+            timeout=settings.upstream_http_timeout_seconds,
+        )
+    return _client
+
+
+def borrow_upstream_client(**kwargs: Any) -> httpx.AsyncClient:
+    """Create a client with its own cookie jar over the shared pool.
+
+    Closing the returned client leaves the pool's connections open.
+
+    Args:
+        **kwargs: httpx.AsyncClient options (timeout, follow_redirects, ...).
+
+    Returns:
+        New client borrowing the shared connections.
+    """
+    kwargs.setdefault("timeout", settings.upstream_http_timeout_seconds)
+    return httpx.AsyncClient(transport=_BorrowedTransport(_get_transport()), **kwargs)
+
+
+async def open_upstream_client() -> None:
+    """Create the shared pool (called on application startup)."""
+    get_upstream_client()
+
+
+async def close_upstream_client() -> None:
+    """Close the shared pool (called on application shutdown)."""
+    global _client, _transport
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
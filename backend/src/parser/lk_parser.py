@@ -1,7 +1,8 @@
 """LK (личный кабинет) HTTP parser for OmGU eservice.
 
 Handles OAuth2-based authentication and data fetching from student portal.
-httpx.AsyncClient automatically persists cookies between requests.
+httpx.AsyncClient automatically persists cookies between requests; each parser
+has its own cookie jar over the shared upstream connection pool.
 Source: https://www.python-httpx.org/advanced/clients/
 
 OAuth2 Flow (discovered from HAR analysis):
@@ -22,6 +23,7 @@ from typing import Any
 
 import httpx
 
+from src.parser.http_pool import borrow_upstream_client
 from src.parser.lk_exceptions import LkAuthError, LkDataError, LkSessionExpired
 from src.parser.retry import RetryConfig, retry_async
 
@@ -45,7 +47,9 @@ class LkParser:
     """HTTP client for LK authentication and data fetching.
 
     httpx.AsyncClient automatically persists cookies between requests,
-    so after login() the session is maintained for subsequent calls.
+    so after login() the session is maintained for subsequent calls. The
+    cookie jar belongs to the parser (one user's session); connections are
+    borrowed from the shared upstream pool.
 
     Usage:
         async with LkParser() as parser:
@@ -72,8 +76,8 @@ class LkParser:
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> LkParser:
-        """Create HTTP client with cookie persistence."""
-        self._client = httpx.AsyncClient(
+        """Create HTTP client with its own cookie jar over the shared pool."""
+        self._client = borrow_upstream_client(
             follow_redirects=False,  # Manual redirect handling for OAuth flow
             timeout=self.timeout,
         )
@@ -86,7 +90,7 @@ class LkParser:
         exc_val: BaseException | None,
         exc_tb: Any,
     ) -> None:
-        """Close HTTP client."""
+        """Close HTTP client (drops the cookies, keeps pooled connections)."""
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -98,6 +102,38 @@ class LkParser:
             raise RuntimeError("LkParser must be used as async context manager")
         return self._client
 
+    def export_cookies(self) -> list[dict[str, str]]:
+        """Get the session cookies, e.g. to resume the session later.
+
+        Returns:
+            Cookies as dicts with name, value, domain and path.
+        """
+        return [
+            {
+                "name": cookie.name,
+                "value": cookie.value or "",
+                "domain": cookie.domain,
+                "path": cookie.path,
+            }
+            for cookie in self._get_client().cookies.jar
+        ]
+
+    def import_cookies(self, cookies: list[dict[str, str]]) -> None:
+        """Replace the session cookies with previously exported ones.
+
+        Args:
+            cookies: Cookies as returned by export_cookies().
+        """
+        jar = self._get_client().cookies
+        jar.clear()
+        for cookie in cookies:
+            jar.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+            )
+
     async def _follow_redirects(
         self, resp: httpx.Response, max_redirects: int = 10
     ) -> httpx.Response:
@@ -13,6 +13,7 @@ from src.config import settings
 from src.parser.data_mapper import DataMapper
 from src.parser.exceptions import DataExtractionError, PageLoadError
 from src.parser.hash_utils import compute_schedule_hash
+from src.parser.http_pool import get_upstream_client
 from src.parser.retry import RetryConfig, retry_async
 from src.schemas.schedule import ScheduleEntryCreate
 
@@ -43,6 +44,7 @@ class ParseResult:
     raw_data: list[dict[str, Any]] = field(default_factory=list)
     content_hash: str = ""
     source_url: str = ""
+    group_id: int | None = None
     parsed_date: date = field(default_factory=date.today)
     errors: list[str] = field(default_factory=list)
 
@@ -69,6 +71,9 @@ class OmsuScheduleParser:
     Or without context manager:
         parser = OmsuScheduleParser()
         result = await parser.parse()
+
+    Requests go over the application's shared upstream client unless one is
+    injected; the parser never closes either.
     """
 
     # API URL template
@@ -82,6 +87,7 @@ class OmsuScheduleParser:
         group_id: int | None = None,
         timeout: int = DEFAULT_TIMEOUT,
         headless: bool = True,  # Kept for backwards compatibility, ignored
+        client: httpx.AsyncClient | None = None,
     ) -> None:
         """Initialize parser.
 
@@ -90,16 +96,15 @@ class OmsuScheduleParser:
             group_id: Group ID for schedule. Defaults to settings.schedule_group_id.
             timeout: HTTP request timeout in seconds.
             headless: Ignored, kept for backwards compatibility.
+            client: HTTP client to use instead of the shared upstream client.
         """
         self.group_id = group_id or settings.schedule_group_id
         self.url = url or self.API_URL_TEMPLATE.format(group_id=self.group_id)
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self._client: httpx.AsyncClient | None = client
 
     async def __aenter__(self) -> OmsuScheduleParser:
-        """Create HTTP client."""
-        self._client = httpx.AsyncClient(timeout=self.timeout)
-        logger.info("HTTP client created for schedule parsing")
+        """Enter the parser (connections come from the shared pool)."""
         return self
 
     async def __aexit__(
@@ -108,11 +113,7 @@ class OmsuScheduleParser:
         exc_val: BaseException | None,
         exc_tb: Any,
     ) -> None:
-        """Close HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-        logger.info("HTTP client closed")
+        """Exit the parser (the client stays open for reuse)."""
 
     async def parse(self, url: str | None = None) -> ParseResult:
         """Parse schedule from API.
@@ -130,7 +131,9 @@ class OmsuScheduleParser:
         target_url = url or self.url
         logger.info("Parsing schedule from API: %s", target_url)
 
-        result = ParseResult(source_url=target_url, parsed_date=date.today())
+        result = ParseResult(
+            source_url=target_url, group_id=self.group_id, parsed_date=date.today()
+        )
 
         try:
             # Fetch JSON from API
@@ -187,18 +190,11 @@ class OmsuScheduleParser:
         Raises:
             PageLoadError: If request fails after all retries.
         """
-        # Use existing client or create temporary one
-        client = self._client
-        should_close = False
-
-        if client is None:
-            client = httpx.AsyncClient(timeout=self.timeout)
-            should_close = True
-
+        client = self._client or get_upstream_client()
         retry_config = RetryConfig(max_attempts=3, base_delay=1.0, max_delay=10.0)
 
         async def _do_fetch() -> dict[str, Any]:
-            response = await client.get(url)
+            response = await client.get(url, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
 
@@ -210,9 +206,6 @@ class OmsuScheduleParser:
             ) from e
         except httpx.RequestError as e:
             raise PageLoadError(f"Failed to fetch API: {e}") from e
-        finally:
-            if should_close:
-                await client.aclose()
 
     def _extract_lessons(self, days_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Extract and normalize lessons from API response.
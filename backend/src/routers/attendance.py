@@ -1,7 +1,8 @@
 """Attendance router — mark absences and view stats."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
 from src.database import get_db
 from src.dependencies import get_current_user
@@ -9,12 +10,16 @@ from src.models.user import User
 from src.schemas.attendance import (
     AbsenceCreate,
     AbsenceResponse,
+    AttendanceBatchRequest,
+    AttendanceBatchResponse,
     AttendanceEntryResponse,
     AttendanceStatsResponse,
     MarkPresentRequest,
     SubjectAttendanceStats,
 )
 from src.services import attendance as attendance_service
+from src.utils.http_cache import json_response
+from src.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -79,25 +84,68 @@ async def mark_present(
         )
 
 
+@router.post("/batch", response_model=AttendanceBatchResponse)
+async def mark_attendance_batch(
+    data: AttendanceBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> AttendanceBatchResponse:
+    """Set attendance of many lessons at once (e.g. back-filling weeks).
+
+    All changes are applied in one transaction, or none if any item is
+    invalid. Marking an already absent lesson absent (or a present one
+    present) is not an error.
+
+    Args:
+        data: Request body with (schedule_entry_id, absent) items.
+        db: Database session.
+        current_user: Authenticated user.
+
+    Returns:
+        Number of absences added and removed.
+    """
+    try:
+        added, removed = await attendance_service.mark_attendance_batch(
+            db,
+            current_user.id,
+            [(item.schedule_entry_id, item.absent) for item in data.items],
+        )
+    except ValueError as e:
+        msg = str(e)
+        if "not found" in msg:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=msg
+            ) from e
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=msg) from e
+
+    return AttendanceBatchResponse(marked_absent=added, marked_present=removed)
+
+
 @router.get("/", response_model=list[AttendanceEntryResponse])
 async def get_attendance_entries(
+    response: Response,
     semester_id: int = Query(..., description="Semester ID (required)"),
     subject_id: int | None = Query(None, description="Filter by subject ID"),
     limit: int = Query(100, ge=1, le=500, description="Maximum entries to return"),
     offset: int = Query(0, ge=0, description="Number of entries to skip"),
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[AttendanceEntryResponse]:
     """Get completed schedule entries with attendance status for a semester.
 
     Only returns lessons that have already ended (past lessons and today's
-    lessons where end_time <= current_time).
+    lessons where end_time <= current_time). Pages either by offset or,
+    preferably, by cursor: a full page carries the cursor of the next one in
+    the X-Next-Cursor header.
 
     Args:
+        response: Response (for the next page cursor).
         semester_id: Semester ID (required).
         subject_id: Optional filter by subject.
         limit: Maximum entries to return (default 100, max 500).
-        offset: Number of entries to skip for pagination.
+        offset: Number of entries to skip (ignored with cursor).
+        cursor: Opaque cursor of the previous page.
         db: Database session.
         current_user: Authenticated user.
 
@@ -112,6 +160,7 @@ async def get_attendance_entries(
             subject_id=subject_id,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
     except ValueError as e:
         msg = str(e)
@@ -121,15 +170,20 @@ async def get_attendance_entries(
             ) from e
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=msg) from e
 
+    if len(entries) == limit:
+        set_next_cursor(
+            response, attendance_service.attendance_entry_cursor(entries[-1])
+        )
     return [AttendanceEntryResponse(**e) for e in entries]
 
 
 @router.get("/stats", response_model=AttendanceStatsResponse)
 async def get_attendance_stats(
+    request: Request,
     semester_id: int = Query(..., description="Semester ID (required)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> AttendanceStatsResponse:
+) -> Response:
     """Get overall attendance statistics with per-subject breakdown for a semester.
 
     Statistics are calculated based on:
@@ -139,7 +193,11 @@ async def get_attendance_stats(
     - attendance_percent: (attended / total_planned * 100) if planned_classes set,
       otherwise (attended / total_completed * 100)
 
+    The response carries an ETag of its body; a matching If-None-Match
+    gets 304 without the payload.
+
     Args:
+        request: Incoming request (for If-None-Match).
         semester_id: Semester ID (required).
         db: Database session.
         current_user: Authenticated user.
@@ -159,7 +217,8 @@ async def get_attendance_stats(
             ) from e
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=msg) from e
 
-    return AttendanceStatsResponse(**stats)
+    body = AttendanceStatsResponse(**stats).model_dump_json().encode()
+    return json_response(request, body)
 
 
 @router.get("/stats/{subject_id}", response_model=SubjectAttendanceStats)
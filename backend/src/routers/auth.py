@@ -17,6 +17,7 @@ from src.services.auth import (
     refresh_access_token,
     register_user,
 )
+from src.services.user_cache import invalidate_user
 from src.utils.rate_limit import limiter
 
 router = APIRouter()
@@ -78,6 +79,7 @@ async def update_settings(
         setattr(current_user, key, value)
     await db.commit()
     await db.refresh(current_user)
+    await invalidate_user(current_user.id)
     return current_user
 
 
@@ -1,11 +1,24 @@
 """File management router."""
 
+import asyncio
 import logging
+import os
 from pathlib import Path
 from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, Form, HTTPException, Query, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import FileResponse as DiskFileResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,24 +30,83 @@ from src.models.user import User
 from src.schemas.file import FileCategory, FileListResponse, FileResponse
 from src.services.file import (
     delete_file,
+    file_cursor,
     get_file_by_id,
     get_file_path,
+    get_file_storage_dir,
     get_files,
-    save_file,
+    get_preview_path,
+    release_stored_file,
+    store_upload,
     upload_file,
 )
-from src.services.upload import read_upload_streaming, validate_file_content
+from src.services.preview import generate_preview
+from src.services.upload import spool_upload
+from src.utils.http_cache import CACHE_CONTROL, is_not_modified, not_modified
+from src.utils.pagination import set_next_cursor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Previews of content-addressed files never change
+PREVIEW_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition with an RFC 5987 filename."""
+    safe_filename = filename.encode("ascii", errors="ignore").decode()
+    encoded_filename = quote(filename)
+    return (
+        f"attachment; filename=\"{safe_filename}\"; filename*=UTF-8''{encoded_filename}"
+    )
+
+
+def _send_stored_file(
+    request: Request,
+    file_path: Path,
+    stat_result: os.stat_result,
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """Send a file from storage, via nginx when X-Accel-Redirect is enabled.
+
+    Args:
+        request: Incoming request (for conditional headers).
+        file_path: Path inside the file storage directory.
+        stat_result: Stat of the file.
+        media_type: Content type to send.
+        headers: Extra headers (Cache-Control, Content-Disposition).
+
+    Returns:
+        File response, 304 Not Modified, or an empty X-Accel-Redirect response.
+    """
+    prefix = settings.files_accel_redirect_prefix
+    if prefix:
+        # nginx sends the file itself (sendfile, Range, ETag and 304s)
+        headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{quote(file_path.name)}"
+        return Response(media_type=media_type, headers=headers)
+
+    response = DiskFileResponse(
+        file_path, media_type=media_type, headers=headers, stat_result=stat_result
+    )
+    etag = response.headers["etag"]
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        not_modified_response = not_modified(etag)
+        not_modified_response.headers["Cache-Control"] = headers["Cache-Control"]
+        not_modified_response.headers["Last-Modified"] = response.headers[
+            "last-modified"
+        ]
+        return not_modified_response
+    return response
+
 
 @router.post(
     "/upload", response_model=FileResponse, status_code=status.HTTP_201_CREATED
 )
 async def upload_study_file(
     file: UploadFile,
+    background_tasks: BackgroundTasks,
     category: FileCategory = Form(...),
     subject_id: int | None = Form(None),
     db: AsyncSession = Depends(get_db),
@@ -42,8 +114,11 @@ async def upload_study_file(
 ) -> FileResponse:
     """Upload a study file.
 
+    The preview is generated in the background once the response is sent.
+
     Args:
         file: The file to upload (multipart/form-data).
+        background_tasks: Background tasks (preview generation).
         category: File category (textbook, lecture, etc.).
         subject_id: Optional subject ID to associate with.
         db: Database session.
@@ -78,9 +153,6 @@ async def upload_study_file(
                 detail="Subject not found",
             )
 
-    # Read file with streaming size check
-    content = await read_upload_streaming(file, max_size_mb=settings.max_file_size_mb)
-
     # Get extension from original filename
     original_filename = file.filename or "unnamed"
     extension = Path(original_filename).suffix.lower()
@@ -93,27 +165,33 @@ async def upload_study_file(
             detail=f"File extension not allowed. Allowed: {', '.join(settings.allowed_file_extensions)}",
         )
 
-    # Validate magic bytes
-    if not validate_file_content(content, extension):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File content does not match expected format",
+    # Stream to a temp file, checking magic bytes and size on the way
+    spooled = await spool_upload(
+        file,
+        get_file_storage_dir(),
+        extension,
+        max_size_mb=settings.max_file_size_mb,
+    )
+
+    # Move into storage and save to DB
+    stored_filename = await store_upload(db, spooled, extension)
+    try:
+        file_record = await upload_file(
+            db=db,
+            filename=original_filename,
+            stored_filename=stored_filename,
+            mime_type=file.content_type or "application/octet-stream",
+            size=spooled.size,
+            category=category,
+            subject_id=subject_id,
+            user_id=current_user.id,
         )
+    except Exception:
+        await db.rollback()
+        await release_stored_file(db, stored_filename)
+        raise
 
-    # Save to disk
-    stored_filename = save_file(content, extension)
-
-    # Save to DB
-    file_record = await upload_file(
-        db=db,
-        filename=original_filename,
-        stored_filename=stored_filename,
-        mime_type=file.content_type or "application/octet-stream",
-        size=len(content),
-        category=category,
-        subject_id=subject_id,
-        user_id=current_user.id,
-    )
+    background_tasks.add_task(generate_preview, stored_filename, file_record.mime_type)
 
     return FileResponse(
         id=file_record.id,
@@ -131,29 +209,48 @@ async def upload_study_file(
 
 @router.get("/", response_model=list[FileListResponse])
 async def list_files(
+    response: Response,
     subject_id: int | None = None,
     category: str | None = None,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[FileListResponse]:
     """List files with optional filtering and pagination.
 
+    Pages either by offset or, preferably, by cursor: a full page carries
+    the cursor of the next one in the X-Next-Cursor header.
+
     Args:
+        response: Response (for the next page cursor).
         subject_id: Filter by subject ID.
         category: Filter by category.
         limit: Maximum number of results (default 50, max 200).
-        offset: Number of results to skip.
+        offset: Number of results to skip (ignored with cursor).
+        cursor: Opaque cursor of the previous page.
         db: Database session.
         current_user: Authenticated user.
 
     Returns:
         List of files.
     """
-    files = await get_files(
-        db, subject_id=subject_id, category=category, limit=limit, offset=offset
-    )
+    try:
+        files = await get_files(
+            db,
+            subject_id=subject_id,
+            category=category,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if len(files) == limit:
+        set_next_cursor(response, file_cursor(files[-1]))
     return [
         FileListResponse(
             id=f.id,
@@ -173,18 +270,25 @@ async def list_files(
 @router.get("/{file_id}/download")
 async def download_file(
     file_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> StreamingResponse:
+) -> Response:
     """Download a file by ID.
 
+    Supports Range/If-Range (206 partial content) and conditional requests
+    (ETag, Last-Modified, 304). With files_accel_redirect_prefix set, the
+    transfer is delegated to nginx; otherwise the file is sent by the app
+    (zero-copy where the server supports http.response.pathsend).
+
     Args:
         file_id: File ID.
+        request: Incoming request (for conditional headers).
         db: Database session.
         current_user: Authenticated user.
 
     Returns:
-        StreamingResponse with file content.
+        File response, 304 Not Modified, or an empty X-Accel-Redirect response.
     """
     file_record = await get_file_by_id(db, file_id)
     if file_record is None:
@@ -194,29 +298,68 @@ async def download_file(
         )
 
     file_path = get_file_path(file_record.stored_filename)
-    if not file_path.exists():
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
         logger.error("File on disk missing: %s", file_record.stored_filename)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk",
+        ) from None
+
+    headers = {
+        "Content-Disposition": _content_disposition(file_record.filename),
+        "Cache-Control": CACHE_CONTROL,
+    }
+    return _send_stored_file(
+        request, file_path, stat_result, file_record.mime_type, headers
+    )
+
+
+@router.get("/{file_id}/thumbnail")
+async def get_thumbnail(
+    file_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Get the WebP preview of a file (first PDF page or downscaled image).
+
+    Previews are rendered in the background after upload; for older files
+    the preview is rendered on first request. Stored files are content
+    addressed, so the preview never changes and may be cached for long.
+
+    Args:
+        file_id: File ID.
+        request: Incoming request (for conditional headers).
+        db: Database session.
+        current_user: Authenticated user.
+
+    Returns:
+        WebP image response (or X-Accel-Redirect / 304 as for downloads).
+    """
+    file_record = await get_file_by_id(db, file_id)
+    if file_record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
         )
 
-    def iterfile():
-        with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                yield chunk
-
-    # RFC 5987 encoded filename for Content-Disposition
-    safe_filename = file_record.filename.encode("ascii", errors="ignore").decode()
-    encoded_filename = quote(file_record.filename)
-    return StreamingResponse(
-        iterfile(),
-        media_type=file_record.mime_type,
-        headers={
-            "Content-Disposition": f"attachment; filename=\"{safe_filename}\"; filename*=UTF-8''{encoded_filename}",
-            "Content-Length": str(file_record.size),
-        },
-    )
+    preview_path = get_preview_path(file_record.stored_filename)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, preview_path)
+    except FileNotFoundError:
+        if not await generate_preview(
+            file_record.stored_filename, file_record.mime_type
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preview not available",
+            ) from None
+        stat_result = await asyncio.to_thread(os.stat, preview_path)
+
+    headers = {"Cache-Control": PREVIEW_CACHE_CONTROL}
+    return _send_stored_file(request, preview_path, stat_result, "image/webp", headers)
 
 
 @router.delete("/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,29 @@
+"""Background jobs router."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from src.dependencies import get_current_user
+from src.models.user import User
+from src.schemas.job import JobResponse
+from src.tasks.queue import get_job
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> JobResponse:
+    """Get the state, progress and result of a background job.
+
+    Jobs of other users are reported as not found; shared jobs (schedule
+    refresh) are visible to everyone.
+    """
+    found = await get_job(job_id)
+    if found is None or found[1] not in (None, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return found[0]
@@ -4,11 +4,14 @@ API endpoints for LK credential management and data synchronization.
 """
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.database import get_db
 from src.dependencies import get_current_user
 from src.models.user import User
+from src.schemas.job import JobResponse
 from src.schemas.lk import (
     LkCredentialsCreate,
     LkImportResult,
@@ -18,6 +21,8 @@ from src.schemas.lk import (
     SessionGradeResponse,
 )
 from src.services import lk as lk_service
+from src.tasks.sync_jobs import enqueue_lk_sync
+from src.utils.exceptions import LkCredentialsNotFound
 
 router = APIRouter()
 
@@ -79,20 +84,34 @@ async def verify_credentials(
     return {"valid": is_valid}
 
 
-@router.post("/sync", response_model=LkSyncResponse)
+@router.post(
+    "/sync",
+    response_model=LkSyncResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse}},
+)
 async def sync_from_lk(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> LkSyncResponse:
+) -> LkSyncResponse | JSONResponse:
     """Sync data from LK.
 
     Requires saved credentials. Fetches grades and disciplines
-    from LK and stores them in the database.
+    from LK and stores them in the database. With background jobs enabled
+    the sync is queued instead and 202 returns the job to poll at
+    /jobs/{id} (its result has the LkSyncResponse fields).
 
     Raises:
         400: If credentials not saved.
         502: If LK sync fails.
     """
+    if settings.background_jobs_enabled:
+        if await lk_service.get_credentials(db, current_user.id) is None:
+            raise LkCredentialsNotFound()
+        job = await enqueue_lk_sync(current_user.id)
+        return JSONResponse(
+            job.model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED
+        )
+
     import logging
 
     logger = logging.getLogger(__name__)
@@ -8,8 +8,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.database import get_db
 from src.dependencies import get_current_user
 from src.models.user import User
-from src.schemas.note import LessonNoteCreate, LessonNoteResponse, LessonNoteUpdate
+from src.schemas.note import (
+    LessonNoteCreate,
+    LessonNoteResponse,
+    LessonNoteSearchResult,
+    LessonNoteUpdate,
+)
 from src.services import note as note_service
+from src.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -53,43 +59,92 @@ async def create_note(
 
 @router.get("/", response_model=list[LessonNoteResponse])
 async def get_notes(
+    response: Response,
     date_from: date | None = Query(None, description="Start date filter"),
     date_to: date | None = Query(None, description="End date filter"),
     subject_name: str | None = Query(None, description="Filter by subject name"),
     search: str | None = Query(None, description="Search in content"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
     offset: int = Query(0, ge=0, description="Skip results"),
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[LessonNoteResponse]:
     """Get lesson notes with optional filters and pagination.
 
+    Pages either by offset or, preferably, by cursor: a full page carries
+    the cursor of the next one in the X-Next-Cursor header.
+
     Args:
+        response: Response (for the next page cursor).
         date_from: Optional start date.
         date_to: Optional end date.
         subject_name: Optional subject name filter.
         search: Optional text search.
         limit: Maximum number of results (default 50, max 200).
-        offset: Number of results to skip.
+        offset: Number of results to skip (ignored with cursor).
+        cursor: Opaque cursor of the previous page.
         db: Database session.
         current_user: Authenticated user.
 
     Returns:
         List of matching notes.
     """
-    notes = await note_service.get_notes(
-        db,
-        current_user.id,
-        date_from,
-        date_to,
-        subject_name,
-        search,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        notes = await note_service.get_notes(
+            db,
+            current_user.id,
+            date_from,
+            date_to,
+            subject_name,
+            search,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if len(notes) == limit:
+        set_next_cursor(response, note_service.note_cursor(notes[-1]))
     return [LessonNoteResponse.model_validate(n) for n in notes]
 
 
+@router.get("/search", response_model=list[LessonNoteSearchResult])
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query"),
+    limit: int = Query(20, ge=1, le=100, description="Max results"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[LessonNoteSearchResult]:
+    """Full-text search in the user's notes, best matches first.
+
+    Args:
+        q: Search query (each word matches as a prefix).
+        limit: Maximum number of results.
+        db: Database session.
+        current_user: Authenticated user.
+
+    Returns:
+        Matching notes with rank and highlighted snippet.
+    """
+    try:
+        results = await note_service.search_notes(db, current_user.id, q, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    return [
+        LessonNoteSearchResult(
+            **LessonNoteResponse.model_validate(note).model_dump(),
+            rank=rank,
+            snippet=snippet,
+        )
+        for note, rank, snippet in results
+    ]
+
+
 @router.get("/subject/{subject_name}", response_model=LessonNoteResponse)
 async def get_note_for_subject(
     subject_name: str,
@@ -1,12 +1,16 @@
 """Schedule router."""
 
+from collections.abc import Awaitable, Callable
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse, Response
 
+from src.config import settings
 from src.dependencies import get_current_user, get_db
 from src.models.user import User
+from src.schemas.job import JobResponse
 from src.schemas.schedule import (
     CurrentLessonResponse,
     DayScheduleResponse,
@@ -17,40 +21,83 @@ from src.schemas.schedule import (
     WeekScheduleResponse,
 )
 from src.services import schedule as schedule_service
+from src.services.schedule_cache import get_view_etag
+from src.tasks.sync_jobs import enqueue_schedule_refresh
+from src.utils.http_cache import etag_matches, json_response, not_modified
 
 router = APIRouter()
 
 
+async def _view_response(
+    request: Request,
+    db: AsyncSession,
+    view: str,
+    render: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Render a schedule view, answering 304 from the version alone if possible."""
+    etag = await get_view_etag(db, view)
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(request, await render(), etag)
+
+
 # High-level schedule endpoints (most commonly used)
 @router.get("/week", response_model=WeekScheduleResponse)
 async def get_week_schedule(
+    request: Request,
     target_date: date | None = Query(None, description="Date within target week"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> WeekScheduleResponse:
-    """Get schedule for a week (defaults to current week)."""
-    return await schedule_service.get_week_schedule(db, target_date)
+) -> Response:
+    """Get schedule for a week (defaults to current week).
+
+    Supports conditional requests: a matching If-None-Match gets 304.
+    """
+    return await _view_response(
+        request,
+        db,
+        schedule_service.week_view_key(target_date),
+        lambda: schedule_service.get_week_schedule_json(db, target_date),
+    )
 
 
 @router.get("/today", response_model=DayScheduleResponse)
 async def get_today_schedule(
+    request: Request,
     target_date: date | None = Query(
         None, description="Target date (defaults to today)"
     ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> DayScheduleResponse:
-    """Get schedule for today (or specified date)."""
-    return await schedule_service.get_today_schedule(db, target_date)
+) -> Response:
+    """Get schedule for today (or specified date).
+
+    Supports conditional requests: a matching If-None-Match gets 304.
+    """
+    return await _view_response(
+        request,
+        db,
+        schedule_service.day_view_key(target_date),
+        lambda: schedule_service.get_today_schedule_json(db, target_date),
+    )
 
 
 @router.get("/current", response_model=CurrentLessonResponse)
 async def get_current_lesson(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> CurrentLessonResponse:
-    """Get current and next upcoming lesson."""
-    return await schedule_service.get_current_lesson(db)
+) -> Response:
+    """Get current and next upcoming lesson.
+
+    Supports conditional requests; the ETag changes every minute.
+    """
+    return await _view_response(
+        request,
+        db,
+        schedule_service.current_view_key(),
+        lambda: schedule_service.get_current_lesson_json(db),
+    )
 
 
 # CRUD endpoints for schedule entries
@@ -149,16 +196,22 @@ async def get_latest_snapshot(
 
 
 # Schedule refresh endpoint
-@router.post("/refresh")
+@router.post(
+    "/refresh",
+    response_model=dict,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobResponse}},
+)
 async def refresh_schedule(
     force: bool = Query(False, description="Force refresh even if unchanged"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> dict:
+) -> dict | JSONResponse:
     """Refresh schedule from OmGU website.
 
     Parses the schedule, compares with the last snapshot, and updates
-    the database if changes are detected.
+    the database if changes are detected. With background jobs enabled the
+    refresh is queued instead and 202 returns the job to poll at
+    /jobs/{id}; concurrent requests share one job.
 
     Args:
         force: Force update even if content hash is unchanged.
@@ -168,6 +221,12 @@ async def refresh_schedule(
     Returns:
         Sync result with success status, changed flag, and entries count.
     """
+    if settings.background_jobs_enabled:
+        job = await enqueue_schedule_refresh(current_user.id, force)
+        return JSONResponse(
+            job.model_dump(mode="json"), status_code=status.HTTP_202_ACCEPTED
+        )
+
     result = await schedule_service.sync_schedule(db, force=force)
 
     if not result["success"]:
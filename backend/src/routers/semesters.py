@@ -1,7 +1,8 @@
 """Semesters router."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
 from src.dependencies import get_current_user, get_db
 from src.models.user import User
@@ -12,6 +13,7 @@ from src.schemas.semester import (
     TimelineResponse,
 )
 from src.services import semester as semester_service
+from src.utils.http_cache import json_response
 
 router = APIRouter()
 
@@ -63,10 +65,15 @@ async def get_semester(
 @router.get("/{semester_id}/timeline", response_model=TimelineResponse)
 async def get_semester_timeline(
     semester_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> TimelineResponse:
-    """Get aggregated timeline data for a semester."""
+) -> Response:
+    """Get aggregated timeline data for a semester.
+
+    The response carries an ETag of its body; a matching If-None-Match
+    gets 304 without the payload.
+    """
     try:
         result = await semester_service.get_semester_timeline(
             db, semester_id, current_user.id
@@ -82,7 +89,7 @@ async def get_semester_timeline(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Semester not found",
         )
-    return result
+    return json_response(request, result.model_dump_json().encode())
 
 
 @router.put("/{semester_id}", response_model=SemesterResponse)
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.dependencies import get_current_user, get_db
 from src.models.user import User
 from src.schemas.subject import SubjectCreate, SubjectResponse, SubjectUpdate
-from src.schemas.work import WorkStatusResponse, WorkWithStatusResponse
+from src.schemas.work import WorkWithStatusResponse
 from src.services import semester as semester_service
 from src.services import subject as subject_service
 from src.services import work as work_service
@@ -116,15 +116,4 @@ async def get_subject_works(
             detail="Subject not found",
         )
 
-    works = await work_service.get_works(db, subject_id=subject_id)
-
-    result = []
-    for work in works:
-        work_dict = WorkWithStatusResponse.model_validate(work)
-        for ws in work.statuses:
-            if ws.user_id == current_user.id:
-                work_dict.my_status = WorkStatusResponse.model_validate(ws)
-                break
-        result.append(work_dict)
-
-    return result
+    return await work_service.get_works(db, current_user.id, subject_id=subject_id)
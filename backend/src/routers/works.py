@@ -33,26 +33,14 @@ async def get_works(
     current_user: User = Depends(get_current_user),
 ) -> list[WorkWithStatusResponse]:
     """Get all works with optional filters."""
-    works = await work_service.get_works(
+    return await work_service.get_works(
         db,
+        current_user.id,
         subject_id=subject_id,
         status=work_status,
-        user_id=current_user.id,
         has_deadline=has_deadline,
     )
 
-    result = []
-    for work in works:
-        work_dict = WorkWithStatusResponse.model_validate(work)
-        # Find current user's status
-        for ws in work.statuses:
-            if ws.user_id == current_user.id:
-                work_dict.my_status = WorkStatusResponse.model_validate(ws)
-                break
-        result.append(work_dict)
-
-    return result
-
 
 @router.post(
     "", response_model=WorkWithStatusResponse, status_code=status.HTTP_201_CREATED
@@ -72,15 +60,7 @@ async def create_work(
         )
 
     work = await work_service.create_work(db, work_data, current_user)
-    work = await work_service.get_work_by_id(db, work.id, with_statuses=True)
-
-    result = WorkWithStatusResponse.model_validate(work)
-    for ws in work.statuses:
-        if ws.user_id == current_user.id:
-            result.my_status = WorkStatusResponse.model_validate(ws)
-            break
-
-    return result
+    return await work_service.get_work_with_status(db, work.id, current_user.id)
 
 
 @router.get("/upcoming", response_model=list[UpcomingWorkResponse])
@@ -90,29 +70,7 @@ async def get_upcoming_works(
     current_user: User = Depends(get_current_user),
 ) -> list[UpcomingWorkResponse]:
     """Get works with upcoming deadlines."""
-    works = await work_service.get_upcoming_works(db, current_user.id, limit=limit)
-
-    result = []
-    for work in works:
-        my_status = None
-        for ws in work.statuses:
-            if ws.user_id == current_user.id:
-                my_status = WorkStatusEnum(ws.status)
-                break
-
-        result.append(
-            UpcomingWorkResponse(
-                id=work.id,
-                title=work.title,
-                work_type=work.work_type,
-                deadline=work.deadline,
-                subject_id=work.subject_id,
-                subject_name=work.subject.name,
-                my_status=my_status,
-            )
-        )
-
-    return result
+    return await work_service.get_upcoming_works(db, current_user.id, limit=limit)
 
 
 @router.get("/{work_id}", response_model=WorkWithStatusResponse)
@@ -122,19 +80,12 @@ async def get_work(
     current_user: User = Depends(get_current_user),
 ) -> WorkWithStatusResponse:
     """Get a work by ID."""
-    work = await work_service.get_work_by_id(db, work_id, with_statuses=True)
-    if not work:
+    result = await work_service.get_work_with_status(db, work_id, current_user.id)
+    if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Work not found",
         )
-
-    result = WorkWithStatusResponse.model_validate(work)
-    for ws in work.statuses:
-        if ws.user_id == current_user.id:
-            result.my_status = WorkStatusResponse.model_validate(ws)
-            break
-
     return result
 
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 import contextlib
 import logging
 import time
+from collections.abc import AsyncIterator
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -44,12 +45,15 @@ async def _get_redis() -> Redis:
     return _redis
 
 
-async def _sync_schedule_with_lock() -> None:
-    """Run schedule sync with Redis distributed lock.
+@contextlib.asynccontextmanager
+async def schedule_sync_lock() -> AsyncIterator[bool]:
+    """Hold the Redis lock serializing schedule syncs across workers.
 
-    Acquires a non-blocking Redis lock so that only one worker
-    runs sync at a time. If the lock is already held, this
-    invocation is skipped silently.
+    The lock is not waited for: the context yields False if another sync
+    (scheduled or a refresh job, in any process) holds it.
+
+    Yields:
+        True if the lock was acquired.
     """
     redis = await _get_redis()
     lock = redis.lock(
@@ -57,42 +61,11 @@ async def _sync_schedule_with_lock() -> None:
         timeout=settings.schedule_sync_lock_ttl_seconds,
         blocking=False,
     )
-
-    acquired = await lock.acquire()
-    if not acquired:
-        logger.info("Schedule auto-sync skipped: another worker holds the lock")
-        SCHEDULE_SYNC_TOTAL.labels(status="skipped").inc()
+    if not await lock.acquire():
+        yield False
         return
-
-    start = time.perf_counter()
     try:
-        logger.info("Schedule auto-sync started")
-
-        from src.services.schedule import sync_schedule
-
-        session_maker = get_session_maker()
-        async with session_maker() as db:
-            result = await sync_schedule(db)
-
-        duration = time.perf_counter() - start
-        SCHEDULE_SYNC_DURATION_SECONDS.observe(duration)
-
-        if result.get("success"):
-            SCHEDULE_SYNC_TOTAL.labels(status="success").inc()
-            logger.info(
-                "Schedule auto-sync completed: changed=%s, entries=%s",
-                result.get("changed"),
-                result.get("entries_count"),
-            )
-        else:
-            SCHEDULE_SYNC_TOTAL.labels(status="success").inc()
-            logger.warning(
-                "Schedule auto-sync finished with issues: %s",
-                result.get("message"),
-            )
-    except Exception:
-        SCHEDULE_SYNC_TOTAL.labels(status="error").inc()
-        logger.exception("Schedule auto-sync failed")
+        yield True
     finally:
         try:
             await lock.release()
@@ -103,6 +76,58 @@ async def _sync_schedule_with_lock() -> None:
             )
 
 
+async def _sync_schedule_with_lock() -> None:
+    """Run schedule sync with Redis distributed lock.
+
+    Acquires a non-blocking Redis lock so that only one worker
+    runs sync at a time. If the lock is already held, this
+    invocation is skipped silently.
+    """
+    async with schedule_sync_lock() as acquired:
+        if not acquired:
+            logger.info("Schedule auto-sync skipped: another worker holds the lock")
+            SCHEDULE_SYNC_TOTAL.labels(status="skipped").inc()
+            return
+
+        start = time.perf_counter()
+        try:
+            logger.info("Schedule auto-sync started")
+
+            from src.services.schedule import sync_all_groups
+
+            results = await sync_all_groups(get_session_maker())
+
+            duration = time.perf_counter() - start
+            SCHEDULE_SYNC_DURATION_SECONDS.observe(duration)
+            succeeded = sum(1 for result in results.values() if result.get("success"))
+            if succeeded == len(results):
+                status = "success"
+            elif succeeded == 0:
+                status = "error"
+            else:
+                status = "partial"
+            SCHEDULE_SYNC_TOTAL.labels(status=status).inc()
+
+            for group_id, result in results.items():
+                if result.get("success"):
+                    logger.info(
+                        "Schedule auto-sync of group %d completed: "
+                        "changed=%s, entries=%s",
+                        group_id,
+                        result.get("changed"),
+                        result.get("entries_count"),
+                    )
+                else:
+                    logger.warning(
+                        "Schedule auto-sync of group %d finished with issues: %s",
+                        group_id,
+                        result.get("message"),
+                    )
+        except Exception:
+            SCHEDULE_SYNC_TOTAL.labels(status="error").inc()
+            logger.exception("Schedule auto-sync failed")
+
+
 async def start_scheduler() -> None:
     """Create and start the APScheduler instance.
 
@@ -2,7 +2,7 @@
 
 from datetime import date, datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AbsenceCreate(BaseModel):
@@ -30,6 +30,26 @@ class MarkPresentRequest(BaseModel):
     schedule_entry_id: int
 
 
+class AttendanceMark(BaseModel):
+    """Desired attendance state of one lesson."""
+
+    schedule_entry_id: int
+    absent: bool
+
+
+class AttendanceBatchRequest(BaseModel):
+    """Schema for marking many lessons at once."""
+
+    items: list[AttendanceMark] = Field(min_length=1, max_length=500)
+
+
+class AttendanceBatchResponse(BaseModel):
+    """Result of a batch attendance update."""
+
+    marked_absent: int
+    marked_present: int
+
+
 class AttendanceEntryResponse(BaseModel):
     """Schedule entry augmented with attendance status."""
 
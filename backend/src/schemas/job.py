@@ -0,0 +1,30 @@
+"""Pydantic schemas for background jobs."""
+
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobStatus(StrEnum):
+    """Lifecycle state of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobResponse(BaseModel):
+    """State of a background job, as reported by GET /jobs/{id}."""
+
+    id: str
+    kind: str
+    status: JobStatus
+    progress: int = 0  # percent
+    message: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
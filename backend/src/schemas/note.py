@@ -33,3 +33,10 @@ class LessonNoteResponse(BaseModel):
     content: str
     created_at: datetime
     updated_at: datetime
+
+
+class LessonNoteSearchResult(LessonNoteResponse):
+    """Lesson note matching a search query."""
+
+    rank: float
+    snippet: str = Field(description="HTML-escaped excerpt, matches in <mark> tags")
@@ -105,6 +105,7 @@ class ScheduleSnapshotBase(BaseModel):
     raw_data: str | None = Field(None, description="Raw JSON data")
     source_url: str | None = Field(None, max_length=500, description="Source URL")
     entries_count: int = Field(0, ge=0, description="Number of entries")
+    group_id: int | None = Field(None, description="Schedule API group ID")
 
 
 class ScheduleSnapshotCreate(ScheduleSnapshotBase):
@@ -101,6 +101,13 @@ class WorkStatusResponse(WorkStatusBase):
     updated_at: datetime
 
 
+class WorkStatusDefaultResponse(WorkStatusBase):
+    """Status of a work the user has never updated (no status record yet)."""
+
+    work_id: int
+    user_id: int
+
+
 # WorkStatusHistory schemas
 class WorkStatusHistoryResponse(BaseModel):
     """Schema for work status history response."""
@@ -119,7 +126,7 @@ class WorkStatusHistoryResponse(BaseModel):
 class WorkWithStatusResponse(WorkResponse):
     """Work response with current user's status."""
 
-    my_status: WorkStatusResponse | None = None
+    my_status: WorkStatusResponse | WorkStatusDefaultResponse | None = None
 
 
 # Upcoming works
@@ -3,17 +3,35 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from datetime import date, datetime, time
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Select, and_, delete, func, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    and_,
+    any_,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
-from src.models.attendance import Absence
+from src.models.attendance import Absence, AttendanceAggregate
 from src.models.schedule import ScheduleEntry
 from src.models.semester import Semester
 from src.models.subject import Subject
+from src.services.schedule_scope import is_visible, visible_entries
+from src.utils.pagination import after_cursor, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +56,7 @@ async def mark_absent(
     """
     # Validate entry exists
     entry = await db.get(ScheduleEntry, schedule_entry_id)
-    if entry is None:
+    if entry is None or not is_visible(entry):
         raise ValueError("Schedule entry not found")
 
     # Validate lesson_date is not in the future
@@ -64,6 +82,7 @@ async def mark_absent(
         lesson_date=entry.lesson_date,
     )
     db.add(absence)
+    await _adjust_aggregates(db, user_id, entry, 1)
     await db.flush()
     await db.commit()
     await db.refresh(absence)
@@ -93,8 +112,131 @@ async def mark_present(
             )
         )
     )
+    deleted = result.rowcount > 0  # type: ignore[union-attr]
+    if deleted:
+        entry = await db.get(ScheduleEntry, schedule_entry_id)
+        if entry is not None:
+            await _adjust_aggregates(db, user_id, entry, -1)
     await db.commit()
-    return result.rowcount > 0  # type: ignore[union-attr]
+    return deleted
+
+
+def _entry_id_in(
+    db: AsyncSession, column: ColumnElement[int], ids: list[int]
+) -> ColumnElement[bool]:
+    """Match a column against a list of IDs.
+
+    PostgreSQL gets `= ANY(:ids)` with a single array parameter, so the
+    statement is the same (and cached) whatever the number of IDs.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return column == any_(literal(ids, postgresql.ARRAY(Integer)))
+    return column.in_(ids)
+
+
+async def mark_attendance_batch(
+    db: AsyncSession,
+    user_id: int,
+    marks: list[tuple[int, bool]],
+) -> tuple[int, int]:
+    """Set the attendance state of many lessons in one transaction.
+
+    Entries are validated with one query; absences are then added with a
+    single INSERT ... ON CONFLICT DO NOTHING and removed with a single
+    DELETE, so already-applied states are no-ops rather than errors.
+
+    Args:
+        db: Database session.
+        user_id: Current user ID.
+        marks: (schedule_entry_id, absent) pairs.
+
+    Returns:
+        Tuple of (absences added, absences removed).
+
+    Raises:
+        ValueError: If an entry is not found, listed with conflicting
+            states, or a future lesson is marked absent.
+    """
+    desired: dict[int, bool] = {}
+    for entry_id, absent in marks:
+        if desired.setdefault(entry_id, absent) != absent:
+            raise ValueError(f"Conflicting states for schedule entry {entry_id}")
+
+    result = await db.execute(
+        select(
+            ScheduleEntry.id, ScheduleEntry.subject_name, ScheduleEntry.lesson_date
+        ).where(_entry_id_in(db, ScheduleEntry.id, list(desired)), visible_entries())
+    )
+    entries = {row.id: row for row in result}
+    missing = sorted(set(desired) - set(entries))
+    if missing:
+        raise ValueError(f"Schedule entry not found: {', '.join(map(str, missing))}")
+
+    today = date.today()
+    absent_rows = []
+    present_ids = []
+    for entry_id, absent in desired.items():
+        if not absent:
+            present_ids.append(entry_id)
+            continue
+        entry = entries[entry_id]
+        if entry.lesson_date is not None and entry.lesson_date > today:
+            raise ValueError("Cannot mark future lessons as absent")
+        absent_rows.append(
+            {
+                "user_id": user_id,
+                "schedule_entry_id": entry_id,
+                "subject_name": entry.subject_name,
+                "lesson_date": entry.lesson_date,
+            }
+        )
+
+    added = removed = 0
+    if absent_rows:
+        is_sqlite = db.get_bind().dialect.name == "sqlite"
+        insert = sqlite.insert if is_sqlite else postgresql.insert
+        inserted = await db.execute(
+            insert(Absence)
+            .values(absent_rows)
+            .on_conflict_do_nothing(index_elements=["user_id", "schedule_entry_id"])
+            .returning(Absence.id)
+        )
+        added = len(inserted.all())
+    if present_ids:
+        deleted = await db.execute(
+            delete(Absence)
+            .where(
+                Absence.user_id == user_id,
+                _entry_id_in(db, Absence.schedule_entry_id, present_ids),
+            )
+            .returning(Absence.id)
+        )
+        removed = len(deleted.all())
+
+    if added or removed:
+        # Rebuilt on the next read; cheaper than one update per lesson
+        await db.execute(
+            delete(AttendanceAggregate).where(AttendanceAggregate.user_id == user_id)
+        )
+    await db.commit()
+    return added, removed
+
+
+# Sort key of attendance entries (newest first); also the cursor contents
+ATTENDANCE_SORT_KEY = (
+    ScheduleEntry.lesson_date,
+    ScheduleEntry.start_time,
+    ScheduleEntry.id,
+)
+
+
+def attendance_entry_cursor(entry: dict) -> str:
+    """Get the cursor pointing after an entry from get_attendance_entries."""
+    return encode_cursor(
+        date.fromisoformat(entry["lesson_date"]),
+        time.fromisoformat(entry["start_time"]),
+        entry["id"],
+    )
 
 
 def _get_completed_filter(today: date, current_time: time) -> Select:
@@ -155,11 +297,11 @@ def _completed_entries_query(
                 Absence.user_id == user_id,
             ),
         )
-        .where(ScheduleEntry.lesson_date.isnot(None))
+        .where(ScheduleEntry.lesson_date.isnot(None), visible_entries())
         .where(ScheduleEntry.lesson_date >= semester_start)
         .where(ScheduleEntry.lesson_date <= semester_end)
         .where(completed_filter)
-        .order_by(ScheduleEntry.lesson_date.desc(), ScheduleEntry.start_time.desc())
+        .order_by(*(column.desc() for column in ATTENDANCE_SORT_KEY))
     )
 
     if subject_id is not None:
@@ -175,6 +317,7 @@ async def get_attendance_entries(
     subject_id: int | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[dict]:
     """Get completed schedule entries with attendance status for a semester.
 
@@ -184,13 +327,15 @@ async def get_attendance_entries(
         semester_id: Semester ID (required).
         subject_id: Optional filter by subject.
         limit: Maximum number of entries to return.
-        offset: Number of entries to skip.
+        offset: Number of entries to skip (ignored when cursor is given).
+        cursor: Continue after the entry the cursor points to.
 
     Returns:
         List of dicts with entry data and is_absent flag.
 
     Raises:
-        ValueError: If semester not found or has no dates set.
+        ValueError: If semester not found, has no dates set, or the cursor
+            is invalid.
     """
     # Get semester with dates
     semester = await db.get(Semester, semester_id)
@@ -213,7 +358,11 @@ async def get_attendance_entries(
         current_time=current_time,
         subject_id=subject_id,
     )
-    query = query.limit(limit).offset(offset)
+    if cursor is not None:
+        key = decode_cursor(cursor, date, time, int)
+        query = query.where(after_cursor(ATTENDANCE_SORT_KEY, key)).limit(limit)
+    else:
+        query = query.limit(limit).offset(offset)
     result = await db.execute(query)
 
     entries = []
@@ -238,6 +387,287 @@ async def get_attendance_entries(
     return entries
 
 
+def _subject_counts_query(
+    user_id: int,
+    semester_start: date,
+    semester_end: date,
+    lessons_filter: ColumnElement[bool],
+) -> Select:
+    """Build per-subject lesson and absence counts within a semester.
+
+    Args:
+        user_id: User ID for counting absences.
+        semester_start: Semester start date.
+        semester_end: Semester end date.
+        lessons_filter: Condition selecting the lessons to count.
+
+    Returns:
+        Select of (subject_name, subject_id, completed, absences).
+    """
+    return (
+        select(
+            ScheduleEntry.subject_name,
+            ScheduleEntry.subject_id,
+            func.count(ScheduleEntry.id).label("completed"),
+            func.count(Absence.id).label("absences"),
+        )
+        .outerjoin(
+            Absence,
+            and_(
+                Absence.schedule_entry_id == ScheduleEntry.id,
+                Absence.user_id == user_id,
+            ),
+        )
+        .where(
+            ScheduleEntry.lesson_date.isnot(None),
+            ScheduleEntry.lesson_date >= semester_start,
+            ScheduleEntry.lesson_date <= semester_end,
+            lessons_filter,
+            visible_entries(),
+        )
+        .group_by(ScheduleEntry.subject_name, ScheduleEntry.subject_id)
+    )
+
+
+def _stats_query(
+    user_id: int, semester: Semester, today: date, current_time: time
+) -> Select:
+    """Build a single query for semester totals and the per-subject breakdown.
+
+    Returns one row per subject with completed lessons (or a single row with
+    NULL subject columns if there are none). Totals are repeated on every
+    row: planned classes of the semester via a scalar subquery, completed
+    lessons and absences via window sums over the subject counts.
+    """
+    counts = _subject_counts_query(
+        user_id,
+        semester.start_date,
+        semester.end_date,
+        _get_completed_filter(today, current_time),
+    ).cte("subject_counts")
+    planned = (
+        select(Subject.name, func.max(Subject.planned_classes).label("planned"))
+        .where(Subject.semester_id == semester.id)
+        .group_by(Subject.name)
+        .cte("subject_planned")
+    )
+    total_planned = (
+        select(func.coalesce(func.sum(Subject.planned_classes), 0))
+        .where(Subject.semester_id == semester.id)
+        .scalar_subquery()
+    )
+    anchor = select(literal(1).label("one")).cte("anchor")
+
+    return (
+        select(
+            total_planned.label("total_planned"),
+            func.coalesce(func.sum(counts.c.completed).over(), 0).label(
+                "total_completed"
+            ),
+            func.coalesce(func.sum(counts.c.absences).over(), 0).label(
+                "total_absences"
+            ),
+            counts.c.subject_name,
+            counts.c.subject_id,
+            counts.c.completed,
+            counts.c.absences,
+            func.coalesce(planned.c.planned, 0).label("planned"),
+        )
+        .select_from(anchor)
+        .outerjoin(counts, true())
+        .outerjoin(planned, planned.c.name == counts.c.subject_name)
+        .order_by(counts.c.subject_name)
+    )
+
+
+def _percent(attended: int, planned: int, completed: int) -> float:
+    """Attendance percentage against planned classes, else completed lessons."""
+    if planned > 0:
+        return round(attended / planned * 100, 1)
+    if completed > 0:
+        return round(attended / completed * 100, 1)
+    return 0.0
+
+
+def _build_stats(
+    total_planned: int,
+    total_completed: int,
+    total_absences: int,
+    subjects: list[tuple[str, int | None, int, int, int]],
+) -> dict:
+    """Assemble the stats response.
+
+    Args:
+        total_planned: Planned classes of all semester subjects.
+        total_completed: Completed lessons in the semester.
+        total_absences: Absences on completed lessons.
+        subjects: (subject_name, subject_id, completed, absences, planned)
+            rows ordered by subject name.
+
+    Returns:
+        Stats dict as returned by get_attendance_stats.
+    """
+    attended = total_completed - total_absences
+
+    by_subject = [
+        {
+            "subject_name": name,
+            "subject_id": subject_id,
+            "planned_classes": planned,
+            "total_classes": completed,  # completed lessons
+            "absences": absences,
+            "attended": completed - absences,
+            "attendance_percent": _percent(completed - absences, planned, completed),
+        }
+        for name, subject_id, completed, absences, planned in subjects
+    ]
+
+    return {
+        "total_planned": total_planned,
+        "total_completed": total_completed,
+        "total_classes": total_completed,  # backwards compat
+        "absences": total_absences,
+        "attended": attended,
+        "attendance_percent": _percent(attended, total_planned, total_completed),
+        "by_subject": by_subject,
+    }
+
+
+async def _load_aggregates(
+    db: AsyncSession, user_id: int, semester: Semester, today: date
+) -> list[AttendanceAggregate]:
+    """Get materialized counts for lessons before today, rebuilding stale ones.
+
+    Rows are stale if they were computed on an earlier day or for other
+    semester dates.
+    """
+    result = await db.execute(
+        select(AttendanceAggregate).where(
+            AttendanceAggregate.user_id == user_id,
+            AttendanceAggregate.semester_id == semester.id,
+        )
+    )
+    stored = list(result.scalars().all())
+    if stored and all(
+        a.as_of == today
+        and a.start_date == semester.start_date
+        and a.end_date == semester.end_date
+        for a in stored
+    ):
+        return stored
+
+    counts = await db.execute(
+        _subject_counts_query(
+            user_id,
+            semester.start_date,
+            semester.end_date,
+            ScheduleEntry.lesson_date < today,
+        )
+    )
+    rows = [
+        {
+            "user_id": user_id,
+            "semester_id": semester.id,
+            "subject_name": row.subject_name,
+            "subject_id": row.subject_id,
+            "completed": row.completed,
+            "absences": row.absences,
+            "start_date": semester.start_date,
+            "end_date": semester.end_date,
+            "as_of": today,
+        }
+        for row in counts.all()
+    ]
+    # Upsert so that concurrent rebuilds of the same user converge instead
+    # of inserting duplicate rows
+    stored = []
+    if rows:
+        is_sqlite = db.get_bind().dialect.name == "sqlite"
+        insert = sqlite.insert if is_sqlite else postgresql.insert
+        stmt = insert(AttendanceAggregate).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                AttendanceAggregate.user_id,
+                AttendanceAggregate.semester_id,
+                AttendanceAggregate.subject_name,
+                func.coalesce(AttendanceAggregate.subject_id, literal_column("0")),
+            ],
+            set_={
+                f: stmt.excluded[f]
+                for f in ("completed", "absences", "start_date", "end_date", "as_of")
+            },
+        )
+        result = await db.scalars(
+            stmt.returning(AttendanceAggregate),
+            execution_options={"populate_existing": True},
+        )
+        stored = list(result.all())
+    # Subjects without lessons any more
+    await db.execute(
+        delete(AttendanceAggregate).where(
+            AttendanceAggregate.user_id == user_id,
+            AttendanceAggregate.semester_id == semester.id,
+            AttendanceAggregate.id.not_in([a.id for a in stored]),
+        )
+    )
+    await db.commit()
+    return stored
+
+
+async def _get_aggregated_stats(
+    db: AsyncSession,
+    user_id: int,
+    semester: Semester,
+    today: date,
+    current_time: time,
+) -> dict:
+    """Get stats from materialized counts plus live counts for today."""
+    counts: dict[tuple[str, int | None], list[int]] = {
+        (a.subject_name, a.subject_id): [a.completed, a.absences]
+        for a in await _load_aggregates(db, user_id, semester, today)
+    }
+
+    today_result = await db.execute(
+        _subject_counts_query(
+            user_id,
+            semester.start_date,
+            semester.end_date,
+            and_(
+                ScheduleEntry.lesson_date == today,
+                ScheduleEntry.end_time <= current_time,
+            ),
+        )
+    )
+    for row in today_result.all():
+        total = counts.setdefault((row.subject_name, row.subject_id), [0, 0])
+        total[0] += row.completed
+        total[1] += row.absences
+
+    planned_result = await db.execute(
+        select(Subject.name, Subject.planned_classes).where(
+            Subject.semester_id == semester.id
+        )
+    )
+    total_planned = 0
+    subject_planned: dict[str, int] = {}
+    for name, planned in planned_result.all():
+        total_planned += planned or 0
+        subject_planned[name] = max(subject_planned.get(name, 0), planned or 0)
+
+    subjects = [
+        (name, subject_id, completed, absences, subject_planned.get(name, 0))
+        for (name, subject_id), (completed, absences) in sorted(
+            counts.items(), key=lambda item: item[0][0]
+        )
+    ]
+    return _build_stats(
+        total_planned,
+        sum(row[2] for row in subjects),
+        sum(row[3] for row in subjects),
+        subjects,
+    )
+
+
 async def get_attendance_stats(
     db: AsyncSession,
     user_id: int,
@@ -246,7 +676,9 @@ async def get_attendance_stats(
     """Get overall attendance statistics plus per-subject breakdown for a semester.
 
     Uses planned_classes from Subject for total, and counts completed lessons
-    for attendance calculation.
+    for attendance calculation. Totals and the breakdown come from a single
+    query; with attendance_aggregates_enabled, past lessons are read from
+    materialized per-subject counts instead of being scanned.
 
     Args:
         db: Database session.
@@ -273,130 +705,83 @@ async def get_attendance_stats(
     today = now.date()
     current_time = now.time()
 
-    completed_filter = _get_completed_filter(today, current_time)
-
-    # Get all subjects for semester with planned_classes
-    subjects_result = await db.execute(
-        select(Subject.id, Subject.name, Subject.planned_classes).where(
-            Subject.semester_id == semester_id
-        )
+    if settings.attendance_aggregates_enabled:
+        return await _get_aggregated_stats(db, user_id, semester, today, current_time)
+
+    result = await db.execute(_stats_query(user_id, semester, today, current_time))
+    rows = result.all()
+    subjects = [
+        (row.subject_name, row.subject_id, row.completed, row.absences, row.planned)
+        for row in rows
+        if row.subject_name is not None
+    ]
+    totals = rows[0]
+    return _build_stats(
+        totals.total_planned,
+        totals.total_completed,
+        totals.total_absences,
+        subjects,
     )
-    subjects = subjects_result.all()
-
-    # Total planned classes from Subject.planned_classes
-    total_planned = sum(s.planned_classes or 0 for s in subjects)
 
-    # Build subject name to planned_classes mapping
-    subject_planned: dict[str, int] = {}
-    for s in subjects:
-        if s.planned_classes:
-            subject_planned[s.name] = s.planned_classes
 
-    # Count completed lessons in semester
-    total_completed_result = await db.execute(
-        select(func.count(ScheduleEntry.id)).where(
-            and_(
-                ScheduleEntry.lesson_date.isnot(None),
-                ScheduleEntry.lesson_date >= semester.start_date,
-                ScheduleEntry.lesson_date <= semester.end_date,
-                completed_filter,
-            )
-        )
-    )
-    total_completed = total_completed_result.scalar() or 0
+async def _adjust_aggregates(
+    db: AsyncSession, user_id: int, entry: ScheduleEntry, delta: int
+) -> None:
+    """Apply an absence change to materialized counts covering the lesson.
 
-    # Count absences for completed lessons in semester
-    absences_result = await db.execute(
-        select(func.count(Absence.id))
-        .join(ScheduleEntry, Absence.schedule_entry_id == ScheduleEntry.id)
+    Args:
+        db: Database session (not committed).
+        user_id: User whose absence changed.
+        entry: Schedule entry of the lesson.
+        delta: +1 for a new absence, -1 for a removed one.
+    """
+    if entry.lesson_date is None:
+        return
+    await db.execute(
+        update(AttendanceAggregate)
         .where(
-            and_(
-                Absence.user_id == user_id,
-                ScheduleEntry.lesson_date >= semester.start_date,
-                ScheduleEntry.lesson_date <= semester.end_date,
-                completed_filter,
-            )
+            AttendanceAggregate.user_id == user_id,
+            AttendanceAggregate.subject_name == entry.subject_name,
+            AttendanceAggregate.subject_id.is_not_distinct_from(entry.subject_id),
+            AttendanceAggregate.start_date <= entry.lesson_date,
+            AttendanceAggregate.end_date >= entry.lesson_date,
+            AttendanceAggregate.as_of > entry.lesson_date,
         )
+        .values(absences=AttendanceAggregate.absences + delta)
     )
-    total_absences = absences_result.scalar() or 0
 
-    # Attended = completed - absences
-    attended = total_completed - total_absences
 
-    # Calculate percentage based on total_planned (if set) or total_completed
-    if total_planned > 0:
-        percent = attended / total_planned * 100
-    elif total_completed > 0:
-        percent = attended / total_completed * 100
-    else:
-        percent = 0.0
+async def invalidate_attendance_aggregates(
+    db: AsyncSession, lesson_dates: Iterable[date | None]
+) -> None:
+    """Drop materialized counts that may cover changed lessons.
 
-    # Per-subject breakdown
-    subject_stats_query = (
-        select(
-            ScheduleEntry.subject_name,
-            ScheduleEntry.subject_id,
-            func.count(ScheduleEntry.id).label("completed"),
-            func.count(Absence.id).label("absent_count"),
-        )
-        .outerjoin(
-            Absence,
-            and_(
-                Absence.schedule_entry_id == ScheduleEntry.id,
-                Absence.user_id == user_id,
-            ),
-        )
-        .where(
-            and_(
-                ScheduleEntry.lesson_date.isnot(None),
-                ScheduleEntry.lesson_date >= semester.start_date,
-                ScheduleEntry.lesson_date <= semester.end_date,
-                completed_filter,
-            )
+    Call when schedule entries are added, changed or removed. The schedule
+    is shared, so rows of every user are affected, but only those whose
+    semester window and as_of cover the lessons' dates. Rows are dropped
+    per (user, semester) window rather than per subject so that a newly
+    added subject is not missed. Runs in the caller's transaction; the
+    rows are rebuilt on the next read. Does nothing with
+    attendance_aggregates_enabled off.
+
+    Args:
+        db: Database session (not committed).
+        lesson_dates: Dates of the changed lessons (old and new dates of
+            moved ones); undated entries are ignored.
+    """
+    if not settings.attendance_aggregates_enabled:
+        return
+    dates = [d for d in lesson_dates if d is not None]
+    if not dates:
+        return
+    first, last = min(dates), max(dates)
+    await db.execute(
+        delete(AttendanceAggregate).where(
+            AttendanceAggregate.start_date <= last,
+            AttendanceAggregate.end_date >= first,
+            AttendanceAggregate.as_of > first,
         )
-        .group_by(ScheduleEntry.subject_name, ScheduleEntry.subject_id)
-        .order_by(ScheduleEntry.subject_name)
     )
-    subject_result = await db.execute(subject_stats_query)
-
-    by_subject = []
-    for row in subject_result.all():
-        subj_name = row[0]
-        subj_id = row[1]
-        subj_completed = row[2]
-        subj_absent = row[3]
-        subj_attended = subj_completed - subj_absent
-
-        # Use planned_classes if available, otherwise use completed count
-        subj_planned = subject_planned.get(subj_name, 0)
-        if subj_planned > 0:
-            subj_percent = subj_attended / subj_planned * 100
-        elif subj_completed > 0:
-            subj_percent = subj_attended / subj_completed * 100
-        else:
-            subj_percent = 0.0
-
-        by_subject.append(
-            {
-                "subject_name": subj_name,
-                "subject_id": subj_id,
-                "planned_classes": subj_planned,
-                "total_classes": subj_completed,  # completed lessons
-                "absences": subj_absent,
-                "attended": subj_attended,
-                "attendance_percent": round(subj_percent, 1),
-            }
-        )
-
-    return {
-        "total_planned": total_planned,
-        "total_completed": total_completed,
-        "total_classes": total_completed,  # backwards compat
-        "absences": total_absences,
-        "attended": attended,
-        "attendance_percent": round(percent, 1),
-        "by_subject": by_subject,
-    }
 
 
 async def get_subject_attendance_stats(
@@ -451,6 +836,7 @@ async def get_subject_attendance_stats(
                 ScheduleEntry.lesson_date >= semester.start_date,
                 ScheduleEntry.lesson_date <= semester.end_date,
                 completed_filter,
+                visible_entries(),
             )
         )
         .group_by(ScheduleEntry.subject_name)
@@ -472,6 +858,7 @@ async def get_subject_attendance_stats(
                 ScheduleEntry.lesson_date >= semester.start_date,
                 ScheduleEntry.lesson_date <= semester.end_date,
                 completed_filter,
+                visible_entries(),
             )
         )
     )
@@ -19,7 +19,7 @@ from src.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    verify_password,
+    verify_password_async,
 )
 
 logger = logging.getLogger(__name__)
@@ -41,7 +41,7 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
 
@@ -1,19 +1,39 @@
-"""File service for study material management."""
+"""File service for study material management.
 
+Stored files are content-addressed: an upload is kept under its SHA-256, and
+File records reference it by stored_filename. Identical uploads share one
+file on disk, which is unlinked when the last referencing record goes.
+"""
+
+import hashlib
 import logging
-import uuid
+import os
+from datetime import datetime
 from pathlib import Path
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from src.config import settings
 from src.models.file import File
+from src.services.upload import SpooledUpload
+from src.utils.pagination import after_cursor, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Sort key of file listings (newest first); also the cursor contents
+FILE_SORT_KEY = (File.created_at, File.id)
+
+# Previews are stored next to their (content-addressed) original
+PREVIEW_SUFFIX = ".preview.webp"
+
+
+def file_cursor(file: File) -> str:
+    """Get the cursor pointing after a file."""
+    return encode_cursor(file.created_at, file.id)
+
 
 def get_file_storage_dir() -> Path:
     """Get and create storage directory for study files.
@@ -30,7 +50,7 @@ def get_file_path(stored_filename: str) -> Path:
     """Get safe file path with path traversal protection.
 
     Args:
-        stored_filename: The stored filename (UUID-based).
+        stored_filename: The stored filename (content hash based).
 
     Returns:
         Resolved path to the file.
@@ -50,23 +70,79 @@ def get_file_path(stored_filename: str) -> Path:
     return file_path
 
 
-def save_file(content: bytes, extension: str) -> str:
-    """Save file content to disk.
+async def _lock_stored_file(db: AsyncSession, stored_filename: str) -> None:
+    """Serialize reference changes of a stored file until the transaction ends.
+
+    Uses a PostgreSQL advisory lock so that an upload reusing a stored file
+    and the deletion of its last reference cannot interleave. Other databases
+    (SQLite in tests) serialize writers on their own.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    digest = hashlib.sha256(stored_filename.encode()).digest()
+    key = int.from_bytes(digest[:8], "big", signed=True)
+    await db.execute(select(func.pg_advisory_xact_lock(key)))
+
+
+def get_preview_path(stored_filename: str) -> Path:
+    """Get the path of a stored file's WebP preview."""
+    return get_file_path(f"{stored_filename}{PREVIEW_SUFFIX}")
+
+
+async def store_upload(db: AsyncSession, upload: SpooledUpload, extension: str) -> str:
+    """Move a spooled upload into content-addressed storage.
+
+    If the same content is already stored, the spooled copy is dropped and
+    the existing file is reused, so the upload costs a database insert only.
+    Otherwise the spooled file is renamed into place atomically. The lock
+    taken here is held until the caller commits the referencing record.
 
     Args:
-        content: File bytes to save.
+        db: Database session (the caller's transaction).
+        upload: Upload spooled into the storage directory.
         extension: File extension (e.g. '.pdf').
 
     Returns:
-        Generated unique stored filename.
+        Stored filename ("<sha256><extension>").
     """
-    stored_filename = f"{uuid.uuid4().hex}{extension}"
+    stored_filename = f"{upload.sha256}{extension}"
+    await _lock_stored_file(db, stored_filename)
+
     file_path = get_file_path(stored_filename)
+    if file_path.exists():
+        upload.path.unlink(missing_ok=True)
+        logger.info("Reusing stored file: %s", stored_filename)
+    else:
+        os.replace(upload.path, file_path)
+    return stored_filename
 
-    with open(file_path, "wb") as f:
-        f.write(content)
 
-    return stored_filename
+async def release_stored_file(db: AsyncSession, stored_filename: str) -> bool:
+    """Unlink a stored file (and its preview) once no File record references it.
+
+    Args:
+        db: Database session (no pending changes; this commits).
+        stored_filename: Stored filename.
+
+    Returns:
+        True if the file was removed from disk.
+    """
+    await _lock_stored_file(db, stored_filename)
+    references = await db.scalar(
+        select(func.count())
+        .select_from(File)
+        .where(File.stored_filename == stored_filename)
+    )
+    removed = False
+    if not references:
+        file_path = get_file_path(stored_filename)
+        if file_path.exists():
+            file_path.unlink()
+            removed = True
+            logger.info("Deleted file from disk: %s", stored_filename)
+        get_preview_path(stored_filename).unlink(missing_ok=True)
+    await db.commit()
+    return removed
 
 
 async def upload_file(
@@ -84,7 +160,7 @@ async def upload_file(
     Args:
         db: Database session.
         filename: Original filename.
-        stored_filename: UUID filename on disk.
+        stored_filename: Content-addressed filename on disk.
         mime_type: MIME type of the file.
         size: File size in bytes.
         category: File category.
@@ -116,6 +192,7 @@ async def get_files(
     category: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[File]:
     """Get list of files with optional filtering and pagination.
 
@@ -124,13 +201,19 @@ async def get_files(
         subject_id: Filter by subject ID.
         category: Filter by category.
         limit: Maximum number of results.
-        offset: Number of results to skip.
+        offset: Number of results to skip (ignored when cursor is given).
+        cursor: Continue after the file the cursor points to.
 
     Returns:
         List of File records with subject relationship loaded.
+
+    Raises:
+        ValueError: If the cursor is invalid.
     """
     query = (
-        select(File).options(joinedload(File.subject)).order_by(File.created_at.desc())
+        select(File)
+        .options(joinedload(File.subject))
+        .order_by(*(column.desc() for column in FILE_SORT_KEY))
     )
 
     if subject_id is not None:
@@ -138,7 +221,11 @@ async def get_files(
     if category is not None:
         query = query.where(File.category == category)
 
-    query = query.limit(limit).offset(offset)
+    if cursor is not None:
+        key = decode_cursor(cursor, datetime, int)
+        query = query.where(after_cursor(FILE_SORT_KEY, key)).limit(limit)
+    else:
+        query = query.limit(limit).offset(offset)
 
     result = await db.execute(query)
     return list(result.scalars().all())
@@ -161,18 +248,14 @@ async def get_file_by_id(db: AsyncSession, file_id: int) -> File | None:
 
 
 async def delete_file(db: AsyncSession, file: File) -> None:
-    """Delete a file from database and disk.
+    """Delete a file record, and its stored file if it was the last reference.
 
     Args:
         db: Database session.
         file: File record to delete.
     """
-    # Delete from disk
-    file_path = get_file_path(file.stored_filename)
-    if file_path.exists():
-        file_path.unlink()
-        logger.info("Deleted file from disk: %s", file.stored_filename)
-
-    # Delete from DB
+    stored_filename = file.stored_filename
     await db.delete(file)
     await db.commit()
+
+    await release_stored_file(db, stored_filename)
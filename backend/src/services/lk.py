@@ -6,19 +6,28 @@ Business logic for LK credential management and data synchronization.
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import UTC, date, datetime
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.metrics import LK_SESSION_CACHE_REQUESTS_TOTAL
 from src.models.lk import LkCredentials, SemesterDiscipline, SessionGrade
 from src.models.semester import Semester
 from src.models.subject import Subject
-from src.parser.lk_exceptions import LkAuthError
+from src.parser.lk_exceptions import LkAuthError, LkSessionExpired
 from src.parser.lk_parser import LkParser, LkStudentData
 from src.schemas.lk import LkCredentialsCreate, LkImportResult
-from src.utils.crypto import decrypt_credential, encrypt_credential
+from src.services import lk_session
+from src.utils.crypto import (
+    CryptoError,
+    decrypt_credential,
+    encrypt_credential,
+    load_fernet,
+)
 from src.utils.exceptions import LkCredentialsNotFound, LkSyncError
 
 logger = logging.getLogger(__name__)
@@ -55,6 +64,7 @@ async def save_credentials(
     """
     creds = await get_credentials(db, user_id)
 
+    await load_fernet()  # derive keys off the event loop on a cold cache
     encrypted_email = encrypt_credential(data.email)
     encrypted_password = encrypt_credential(data.password)
 
@@ -86,6 +96,20 @@ async def delete_credentials(db: AsyncSession, user_id: int) -> bool:
     Returns:
         True if credentials were deleted, False if not found.
     """
+    if settings.lk_session_cache_enabled:
+        creds = await get_credentials(db, user_id)
+        if creds:
+            await load_fernet()
+            try:
+                key = lk_session.session_key(
+                    decrypt_credential(creds.encrypted_email),
+                    decrypt_credential(creds.encrypted_password),
+                )
+            except CryptoError:
+                pass  # The session cannot be found either; it expires
+            else:
+                await lk_session.drop_session(key)
+
     result = await db.execute(
         delete(LkCredentials).where(LkCredentials.user_id == user_id)
     )
@@ -96,9 +120,50 @@ async def delete_credentials(db: AsyncSession, user_id: int) -> bool:
     return deleted
 
 
+async def _no_progress(percent: int, stage: str) -> None:
+    """Progress callback of syncs run inline."""
+
+
+async def _resume_session(parser: LkParser, key: str) -> bool:
+    """Load a cached LK session into the parser.
+
+    Args:
+        parser: Parser (entered) to load the session cookies into.
+        key: Session cache key of the credentials.
+
+    Returns:
+        True if a cached session was loaded. It is not validated yet.
+    """
+    if not settings.lk_session_cache_enabled:
+        return False
+    await load_fernet()
+    cookies = await lk_session.load_session(key)
+    if cookies is None:
+        LK_SESSION_CACHE_REQUESTS_TOTAL.labels(result="miss").inc()
+        return False
+    parser.import_cookies(cookies)
+    return True
+
+
+async def _discard_session(parser: LkParser, key: str) -> None:
+    """Forget a resumed session that LK no longer accepts."""
+    LK_SESSION_CACHE_REQUESTS_TOTAL.labels(result="expired").inc()
+    parser.import_cookies([])
+    await lk_session.drop_session(key)
+
+
+async def _remember_session(parser: LkParser, key: str) -> None:
+    """Cache the parser's authenticated session for the next login."""
+    if settings.lk_session_cache_enabled:
+        await lk_session.save_session(key, parser.export_cookies())
+
+
 async def verify_credentials(email: str, password: str) -> bool:
     """Verify LK credentials by attempting login.
 
+    A cached session obtained with the same credentials counts as a
+    successful login if LK still accepts it.
+
     Args:
         email: LK email.
         password: LK password.
@@ -106,19 +171,43 @@ async def verify_credentials(email: str, password: str) -> bool:
     Returns:
         True if credentials are valid, False otherwise.
     """
+    key = lk_session.session_key(email, password)
     try:
         async with LkParser() as parser:
-            return await parser.login(email, password)
+            if await _resume_session(parser, key):
+                if await parser.check_session():
+                    LK_SESSION_CACHE_REQUESTS_TOTAL.labels(result="hit").inc()
+                    return True
+                await _discard_session(parser, key)
+            if not await parser.login(email, password):
+                return False
+            await _remember_session(parser, key)
+            return True
     except LkAuthError:
         return False
 
 
-async def sync_from_lk(db: AsyncSession, user_id: int) -> tuple[int, int]:
+async def _login(parser: LkParser, email: str, password: str) -> None:
+    """Log in to LK, raising LkSyncError on rejected credentials."""
+    if not await parser.login(email, password):
+        raise LkSyncError("Authentication failed - check credentials")
+
+
+async def sync_from_lk(
+    db: AsyncSession,
+    user_id: int,
+    progress: Callable[[int, str], Awaitable[None]] | None = None,
+) -> tuple[int, int]:
     """Sync grades and disciplines from LK.
 
+    A cached session is used without a separate check: the data request
+    itself reveals an expired session, and only then is the user logged in.
+
     Args:
         db: Database session.
         user_id: User ID.
+        progress: Optional callback receiving (percent, stage) updates, used
+            when the sync runs as a background job.
 
     Returns:
         Tuple of (grades_count, disciplines_count).
@@ -131,15 +220,34 @@ async def sync_from_lk(db: AsyncSession, user_id: int) -> tuple[int, int]:
     if not creds:
         raise LkCredentialsNotFound()
 
+    await load_fernet()  # derive keys off the event loop on a cold cache
     email = decrypt_credential(creds.encrypted_email)
     password = decrypt_credential(creds.encrypted_password)
 
+    if progress is None:
+        progress = _no_progress
+
+    key = lk_session.session_key(email, password)
     try:
         async with LkParser() as parser:
-            if not await parser.login(email, password):
-                raise LkSyncError("Authentication failed - check credentials")
+            await progress(10, "Logging in to LK")
+            resumed = await _resume_session(parser, key)
+            if not resumed:
+                await _login(parser, email, password)
 
-            data = await parser.fetch_student_data()
+            await progress(30, "Fetching student data")
+            try:
+                data = await parser.fetch_student_data()
+            except LkSessionExpired:
+                if not resumed:
+                    raise
+                await _discard_session(parser, key)
+                await _login(parser, email, password)
+                data = await parser.fetch_student_data()
+            else:
+                if resumed:
+                    LK_SESSION_CACHE_REQUESTS_TOTAL.labels(result="hit").inc()
+            await _remember_session(parser, key)
     except LkAuthError as e:
         raise LkSyncError(f"Authentication error: {e}") from e
     except Exception as e:
@@ -153,6 +261,7 @@ async def sync_from_lk(db: AsyncSession, user_id: int) -> tuple[int, int]:
     logger.debug("SemInfo: %s", data.sem_info[:2] if data.sem_info else "empty")
 
     # Sync grades
+    await progress(70, "Saving grades")
     try:
         grades_count = await _sync_grades(db, user_id, data)
     except Exception as e:
@@ -160,6 +269,7 @@ async def sync_from_lk(db: AsyncSession, user_id: int) -> tuple[int, int]:
         raise LkSyncError(f"Failed to sync grades: {e}") from e
 
     # Sync disciplines
+    await progress(85, "Saving disciplines")
     try:
         disciplines_count = await _sync_disciplines(db, user_id, data)
     except Exception as e:
@@ -180,6 +290,61 @@ async def sync_from_lk(db: AsyncSession, user_id: int) -> tuple[int, int]:
     return grades_count, disciplines_count
 
 
+async def _upsert_changed(
+    db: AsyncSession,
+    model: type[SessionGrade] | type[SemesterDiscipline],
+    user_id: int,
+    rows: dict[tuple, dict],
+    key_fields: tuple[str, ...],
+    value_fields: tuple[str, ...],
+) -> int:
+    """Upsert rows whose values differ from what is stored.
+
+    Stored rows of the user are loaded once and compared in memory, so
+    unchanged rows are not rewritten (synced_at keeps the time of the last
+    actual change). The rest goes out as multi-row INSERT ... ON CONFLICT
+    statements of settings.lk_sync_batch_size rows each.
+
+    Args:
+        db: Database session.
+        model: SessionGrade or SemesterDiscipline.
+        user_id: User ID.
+        rows: Column values keyed by their natural key (unique per statement,
+            as Postgres refuses to update one row twice in an upsert).
+        key_fields: Natural key columns, without user_id.
+        value_fields: Columns that are compared and updated.
+
+    Returns:
+        Number of inserted or updated rows.
+    """
+    result = await db.execute(
+        select(
+            *(getattr(model, f) for f in key_fields),
+            *(getattr(model, f) for f in value_fields),
+        ).where(model.user_id == user_id)
+    )
+    stored = {
+        tuple(row[: len(key_fields)]): tuple(row[len(key_fields) :])
+        for row in result.all()
+    }
+
+    changed = [
+        row
+        for key, row in rows.items()
+        if stored.get(key) != tuple(row[f] for f in value_fields)
+    ]
+
+    batch_size = settings.lk_sync_batch_size
+    for i in range(0, len(changed), batch_size):
+        stmt = pg_insert(model).values(changed[i : i + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", *key_fields],
+            set_={f: stmt.excluded[f] for f in (*value_fields, "synced_at")},
+        )
+        await db.execute(stmt)
+    return len(changed)
+
+
 async def _sync_grades(db: AsyncSession, user_id: int, data: LkStudentData) -> int:
     """Sync session grades (upsert).
 
@@ -191,8 +356,8 @@ async def _sync_grades(db: AsyncSession, user_id: int, data: LkStudentData) -> i
     Returns:
         Number of grades synced.
     """
-    count = 0
     now = datetime.now(UTC)
+    rows: dict[tuple, dict] = {}
 
     for session in data.sessions:
         session_number = session.get("number", "")
@@ -205,23 +370,25 @@ async def _sync_grades(db: AsyncSession, user_id: int, data: LkStudentData) -> i
             if not subject_name:
                 continue
 
-            # Use PostgreSQL upsert (INSERT ... ON CONFLICT UPDATE)
-            stmt = pg_insert(SessionGrade).values(
-                user_id=user_id,
-                session_number=session_number,
-                subject_name=subject_name,
-                result=result,
-                synced_at=now,
-            )
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["user_id", "session_number", "subject_name"],
-                set_={"result": result, "synced_at": now},
-            )
-            await db.execute(stmt)
-            count += 1
+            rows[(session_number, subject_name)] = {
+                "user_id": user_id,
+                "session_number": session_number,
+                "subject_name": subject_name,
+                "result": result,
+                "synced_at": now,
+            }
 
+    changed = await _upsert_changed(
+        db,
+        SessionGrade,
+        user_id,
+        rows,
+        key_fields=("session_number", "subject_name"),
+        value_fields=("result",),
+    )
     await db.commit()
-    return count
+    logger.debug("LK grades for user %d: %d changed of %d", user_id, changed, len(rows))
+    return len(rows)
 
 
 async def _sync_disciplines(db: AsyncSession, user_id: int, data: LkStudentData) -> int:
@@ -235,8 +402,8 @@ async def _sync_disciplines(db: AsyncSession, user_id: int, data: LkStudentData)
     Returns:
         Number of disciplines synced.
     """
-    count = 0
     now = datetime.now(UTC)
+    rows: dict[tuple, dict] = {}
 
     # semInfo structure: [{number: 1, entries: [{discipline, controlForm, length}, ...]}, ...]
     for semester in data.sem_info:
@@ -263,28 +430,28 @@ async def _sync_disciplines(db: AsyncSession, user_id: int, data: LkStudentData)
             except (ValueError, TypeError):
                 hours = 0
 
-            # Use PostgreSQL upsert
-            stmt = pg_insert(SemesterDiscipline).values(
-                user_id=user_id,
-                semester_number=semester_number,
-                discipline_name=discipline_name,
-                control_form=control_form,
-                hours=hours,
-                synced_at=now,
-            )
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["user_id", "semester_number", "discipline_name"],
-                set_={
-                    "control_form": control_form,
-                    "hours": hours,
-                    "synced_at": now,
-                },
-            )
-            await db.execute(stmt)
-            count += 1
+            rows[(semester_number, discipline_name)] = {
+                "user_id": user_id,
+                "semester_number": semester_number,
+                "discipline_name": discipline_name,
+                "control_form": control_form,
+                "hours": hours,
+                "synced_at": now,
+            }
 
+    changed = await _upsert_changed(
+        db,
+        SemesterDiscipline,
+        user_id,
+        rows,
+        key_fields=("semester_number", "discipline_name"),
+        value_fields=("control_form", "hours"),
+    )
     await db.commit()
-    return count
+    logger.debug(
+        "LK disciplines for user %d: %d changed of %d", user_id, changed, len(rows)
+    )
+    return len(rows)
 
 
 async def get_grades(
@@ -433,7 +600,9 @@ async def import_to_app(db: AsyncSession, user_id: int) -> LkImportResult:
     """Import semesters and subjects from LK data to app.
 
     Creates or updates semesters and subjects based on previously
-    synced SemesterDiscipline records.
+    synced SemesterDiscipline records. Existing semesters and subjects are
+    preloaded with one query each and changes are written in bulk, so the
+    number of statements does not depend on the number of disciplines.
 
     Args:
         db: Database session.
@@ -481,8 +650,9 @@ async def import_to_app(db: AsyncSession, user_id: int) -> LkImportResult:
         max_discipline_semester,
     )
 
-    # Process each semester
-    for semester_number, sem_disciplines in disciplines_by_semester.items():
+    # Target values of every semester in the study plan
+    semester_values: dict[int, dict] = {}
+    for semester_number in disciplines_by_semester:
         # Calculate how many years back this semester is
         years_back = (current_semester - semester_number) // 2
         year_start = current_year_start - years_back
@@ -506,66 +676,91 @@ async def import_to_app(db: AsyncSession, user_id: int) -> LkImportResult:
 
         # Generate semester name
         season = "Осенний" if semester_number % 2 == 1 else "Весенний"
-        name = f"{season} семестр {year_start}/{year_end}"
 
-        # Find or create semester
+        semester_values[semester_number] = {
+            "number": semester_number,
+            "year_start": year_start,
+            "year_end": year_end,
+            "name": f"{season} семестр {year_start}/{year_end}",
+            "is_current": semester_number == current_semester,
+            "start_date": default_start,
+            "end_date": default_end,
+        }
+
+    # Preload existing semesters (one query instead of one per semester)
+    result = await db.execute(
+        select(Semester.id, Semester.number, Semester.start_date, Semester.end_date)
+        .where(Semester.number.in_(semester_values))
+        .order_by(Semester.id)
+    )
+    existing_semesters: dict[int, Row] = {}
+    for row in result.all():
+        existing_semesters.setdefault(row.number, row)
+
+    semester_ids: dict[int, int] = {}
+    semester_updates: list[dict] = []
+    semester_inserts: list[dict] = []
+    for semester_number, values in semester_values.items():
+        existing = existing_semesters.get(semester_number)
+        if existing is None:
+            semester_inserts.append(values)
+            continue
+        semester_ids[semester_number] = existing.id
+        semester_updates.append(
+            {
+                **values,
+                "id": existing.id,
+                # Fill dates only if not manually set
+                "start_date": existing.start_date or values["start_date"],
+                "end_date": existing.end_date or values["end_date"],
+            }
+        )
+
+    if semester_updates:
+        await db.execute(update(Semester), semester_updates)
+        semesters_updated = len(semester_updates)
+    if semester_inserts:
         result = await db.execute(
-            select(Semester).where(Semester.number == semester_number)
+            insert(Semester).returning(Semester.id, Semester.number),
+            semester_inserts,
         )
-        semester = result.scalar_one_or_none()
-
-        if semester:
-            # Update existing semester
-            semester.year_start = year_start
-            semester.year_end = year_end
-            semester.name = name
-            semester.is_current = semester_number == current_semester
-            # Fill dates only if not manually set
-            if semester.start_date is None:
-                semester.start_date = default_start
-            if semester.end_date is None:
-                semester.end_date = default_end
-            semesters_updated += 1
-        else:
-            # Create new semester
-            semester = Semester(
-                number=semester_number,
-                year_start=year_start,
-                year_end=year_end,
-                name=name,
-                is_current=semester_number == current_semester,
-                start_date=default_start,
-                end_date=default_end,
-            )
-            db.add(semester)
-            await db.flush()
-            semesters_created += 1
+        semester_ids.update({row.number: row.id for row in result.all()})
+        semesters_created = len(semester_inserts)
 
-        # Create/update subjects for this semester
+    # Preload subjects of these semesters, matched by (semester, name)
+    result = await db.execute(
+        select(Subject.id, Subject.name, Subject.semester_id, Subject.total_hours)
+        .where(Subject.semester_id.in_(semester_ids.values()))
+        .order_by(Subject.id)
+    )
+    existing_subjects: dict[tuple[int, str], Row] = {}
+    for row in result.all():
+        existing_subjects.setdefault((row.semester_id, row.name), row)
+
+    subject_updates: list[dict] = []
+    subject_inserts: list[dict] = []
+    for semester_number, sem_disciplines in disciplines_by_semester.items():
+        semester_id = semester_ids[semester_number]
         for disc in sem_disciplines:
-            # Find existing subject by name and semester
-            result = await db.execute(
-                select(Subject).where(
-                    Subject.name == disc.discipline_name,
-                    Subject.semester_id == semester.id,
+            subject = existing_subjects.get((semester_id, disc.discipline_name))
+            if subject is None:
+                subject_inserts.append(
+                    {
+                        "name": disc.discipline_name,
+                        "semester_id": semester_id,
+                        "total_hours": disc.hours,
+                    }
                 )
-            )
-            subject = result.scalar_one_or_none()
-
-            if subject:
+            elif subject.total_hours != disc.hours:
                 # Update total_hours if changed
-                if subject.total_hours != disc.hours:
-                    subject.total_hours = disc.hours
-                    subjects_updated += 1
-            else:
-                # Create new subject
-                subject = Subject(
-                    name=disc.discipline_name,
-                    semester_id=semester.id,
-                    total_hours=disc.hours,
-                )
-                db.add(subject)
-                subjects_created += 1
+                subject_updates.append({"id": subject.id, "total_hours": disc.hours})
+
+    if subject_updates:
+        await db.execute(update(Subject), subject_updates)
+        subjects_updated = len(subject_updates)
+    if subject_inserts:
+        await db.execute(insert(Subject), subject_inserts)
+        subjects_created = len(subject_inserts)
 
     await db.commit()
 
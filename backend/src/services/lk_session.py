@@ -0,0 +1,112 @@
+"""Cache of authenticated LK sessions.
+
+Logging in to LK walks a 5-6 request OAuth redirect chain. After a login the
+parser's cookie jar is stored in Redis, encrypted like the stored
+credentials, so the next sync or credential check can resume the session
+instead. Entries are keyed by a keyed hash of the credentials: a session is
+only reused with the credentials it was obtained with, and a changed
+password simply misses. The cache is best-effort; Redis or decryption
+errors fall back to logging in.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+from typing import TYPE_CHECKING
+
+from src.cache import get_cache_redis
+from src.config import settings
+from src.utils.crypto import decrypt_credential, encrypt_credential
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "studyhelper:lk:session:"
+
+
+def session_key(email: str, password: str) -> str:
+    """Get the cache key of the session for a pair of credentials.
+
+    Args:
+        email: LK email.
+        password: LK password.
+
+    Returns:
+        Redis key (an HMAC of the credentials, never the credentials).
+    """
+    digest = hmac.new(
+        settings.secret_key.encode(),
+        f"{email}\0{password}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+    return f"{REDIS_KEY_PREFIX}{digest}"
+
+
+def _get_redis() -> Redis | None:
+    """Get the cache Redis client if the session cache is enabled."""
+    if not settings.lk_session_cache_enabled:
+        return None
+    return get_cache_redis()
+
+
+async def load_session(key: str) -> list[dict[str, str]] | None:
+    """Get the cookies of a cached session.
+
+    Args:
+        key: Key from session_key().
+
+    Returns:
+        Cookies as exported by LkParser, or None if there is no usable entry.
+    """
+    try:
+        redis = _get_redis()
+        raw = await redis.get(key) if redis else None
+    except Exception:
+        logger.warning("LK session cache: Redis unavailable, logging in")
+        return None
+    if raw is None:
+        return None
+    try:
+        return json.loads(decrypt_credential(raw.decode()))
+    except Exception:
+        logger.warning("LK session cache: dropping unreadable entry")
+        await drop_session(key)
+        return None
+
+
+async def save_session(key: str, cookies: list[dict[str, str]]) -> None:
+    """Store the cookies of an authenticated session.
+
+    Args:
+        key: Key from session_key().
+        cookies: Cookies as exported by LkParser.
+    """
+    try:
+        redis = _get_redis()
+        if redis:
+            await redis.set(
+                key,
+                encrypt_credential(json.dumps(cookies)),
+                ex=settings.lk_session_ttl_seconds,
+            )
+    except Exception:
+        logger.warning("LK session cache: failed to store session")
+
+
+async def drop_session(key: str) -> None:
+    """Forget a cached session (expired, or its credentials were deleted).
+
+    Args:
+        key: Key from session_key().
+    """
+    try:
+        redis = _get_redis()
+        if redis:
+            await redis.delete(key)
+    except Exception:
+        logger.warning("LK session cache: failed to drop session")
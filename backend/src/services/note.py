@@ -2,18 +2,95 @@
 
 from __future__ import annotations
 
+import html
 import logging
-from datetime import date
+import re
+from datetime import date, datetime
 
-from sqlalchemy import and_, select
+from sqlalchemy import ColumnElement, and_, func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.note import LessonNote
+from src.models.note import NOTE_SEARCH_CONFIG, LessonNote
 from src.models.schedule import ScheduleEntry
 from src.schemas.note import LessonNoteCreate
+from src.utils.pagination import after_cursor, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Sort key of note listings (recently edited first); also the cursor contents
+NOTE_SORT_KEY = (LessonNote.updated_at, LessonNote.id)
+
+# ts_headline markers; control characters survive HTML escaping untouched
+_MARK_START = "\x02"
+_MARK_STOP = "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MinWords=8, MaxWords=25, "
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+_MAX_SEARCH_TERMS = 8
+_SNIPPET_LENGTH = 200
+
+
+def note_cursor(note: LessonNote) -> str:
+    """Get the cursor pointing after a note."""
+    return encode_cursor(note.updated_at, note.id)
+
+
+def _search_terms(search: str) -> list[str]:
+    """Split a search string into lowercase words, dropping punctuation."""
+    return re.findall(r"\w+", search.lower())[:_MAX_SEARCH_TERMS]
+
+
+def _like_pattern(term: str) -> str:
+    """Build an ILIKE substring pattern with wildcards escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _uses_full_text_search(db: AsyncSession) -> bool:
+    """Check whether the database supports the note full-text index."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _search_config() -> ColumnElement[str]:
+    """Get the text search configuration as an SQL literal.
+
+    A literal (rather than a bound parameter) keeps to_tsvector identical
+    to the indexed expression, so the planner can use the GIN index.
+    """
+    return literal_column(f"'{NOTE_SEARCH_CONFIG}'")
+
+
+def _note_tsvector() -> ColumnElement:
+    """Get the indexed tsvector expression of note content."""
+    return func.to_tsvector(_search_config(), LessonNote.content)
+
+
+def _prefix_tsquery(terms: list[str]) -> ColumnElement:
+    """Build a tsquery matching notes that contain every term as a prefix.
+
+    Prefix matching keeps results useful while the last word is still
+    being typed. Terms are plain words, so they cannot inject tsquery syntax.
+    """
+    return func.to_tsquery(_search_config(), " & ".join(f"{t}:*" for t in terms))
+
+
+def _render_snippet(raw: str) -> str:
+    """HTML-escape a snippet and turn highlight markers into <mark> tags."""
+    return (
+        html.escape(raw).replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+    )
+
+
+def _fallback_snippet(content: str, terms: list[str]) -> str:
+    """Cut a highlighted snippet around the first match (non-Postgres)."""
+    pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE)
+    match = pattern.search(content)
+    start = max(0, match.start() - _SNIPPET_LENGTH // 4) if match else 0
+    fragment = content[start : start + _SNIPPET_LENGTH]
+    marked = pattern.sub(lambda m: f"{_MARK_START}{m.group()}{_MARK_STOP}", fragment)
+    return _render_snippet(marked)
+
 
 async def create_note(
     db: AsyncSession,
@@ -149,6 +226,7 @@ async def get_notes(
     search: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[LessonNote]:
     """Get lesson notes with optional filters and pagination.
 
@@ -160,15 +238,19 @@ async def get_notes(
         subject_name: Optional subject name filter.
         search: Optional text search in content.
         limit: Maximum number of results.
-        offset: Number of results to skip.
+        offset: Number of results to skip (ignored when cursor is given).
+        cursor: Continue after the note the cursor points to.
 
     Returns:
         List of matching LessonNote objects.
+
+    Raises:
+        ValueError: If the cursor is invalid.
     """
     query = (
         select(LessonNote)
         .where(LessonNote.user_id == user_id)
-        .order_by(LessonNote.updated_at.desc())
+        .order_by(*(column.desc() for column in NOTE_SORT_KEY))
     )
 
     if date_from is not None:
@@ -178,15 +260,86 @@ async def get_notes(
     if subject_name is not None:
         query = query.where(LessonNote.subject_name == subject_name)
     if search is not None:
-        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-        query = query.where(LessonNote.content.ilike(f"%{escaped}%", escape="\\"))
+        # Substring match on every dialect; word search is search_notes()
+        query = query.where(
+            LessonNote.content.ilike(_like_pattern(search), escape="\\")
+        )
 
-    query = query.limit(limit).offset(offset)
+    if cursor is not None:
+        key = decode_cursor(cursor, datetime, int)
+        query = query.where(after_cursor(NOTE_SORT_KEY, key)).limit(limit)
+    else:
+        query = query.limit(limit).offset(offset)
 
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
+async def search_notes(
+    db: AsyncSession,
+    user_id: int,
+    search: str,
+    limit: int = 20,
+) -> list[tuple[LessonNote, float, str]]:
+    """Search a user's notes by content, best matches first.
+
+    On PostgreSQL this uses the Russian full-text index: results are ranked
+    with ts_rank_cd and snippets come from ts_headline. Other databases fall
+    back to substring matching ordered by recency (rank 0).
+
+    Args:
+        db: Database session.
+        user_id: Current user ID.
+        search: Search string; every word must match (as a prefix).
+        limit: Maximum number of results.
+
+    Returns:
+        List of (note, rank, snippet) tuples. Snippets are HTML-escaped,
+        with matches wrapped in <mark> tags.
+
+    Raises:
+        ValueError: If the search string contains no words.
+    """
+    terms = _search_terms(search)
+    if not terms:
+        raise ValueError("Search query is empty")
+
+    if not _uses_full_text_search(db):
+        result = await db.execute(
+            select(LessonNote)
+            .where(
+                LessonNote.user_id == user_id,
+                *(
+                    LessonNote.content.ilike(_like_pattern(t), escape="\\")
+                    for t in terms
+                ),
+            )
+            .order_by(*(column.desc() for column in NOTE_SORT_KEY))
+            .limit(limit)
+        )
+        return [
+            (note, 0.0, _fallback_snippet(note.content, terms))
+            for note in result.scalars().all()
+        ]
+
+    tsquery = _prefix_tsquery(terms)
+    rank = func.ts_rank_cd(_note_tsvector(), tsquery)
+    # PostgreSQL defers the costly headline until after ORDER BY ... LIMIT
+    headline = func.ts_headline(
+        _search_config(), LessonNote.content, tsquery, _HEADLINE_OPTIONS
+    )
+    result = await db.execute(
+        select(LessonNote, rank.label("rank"), headline.label("snippet"))
+        .where(LessonNote.user_id == user_id, _note_tsvector().op("@@")(tsquery))
+        .order_by(rank.desc(), *(column.desc() for column in NOTE_SORT_KEY))
+        .limit(limit)
+    )
+    return [
+        (note, float(note_rank), _render_snippet(snippet))
+        for note, note_rank, snippet in result.all()
+    ]
+
+
 async def get_note_for_subject(
     db: AsyncSession,
     user_id: int,
@@ -0,0 +1,164 @@
+"""Preview generation for study files.
+
+Uploads get a small WebP preview (first page of a PDF, downscaled image)
+stored next to the original. Rendering is CPU-bound, so it runs in a
+process pool after the upload has been committed, never on the event loop.
+Pillow and PyMuPDF come with the optional "previews" extra; without them
+previews are simply not generated.
+"""
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from src.config import settings
+from src.metrics import FILE_PREVIEWS_TOTAL
+from src.services.file import get_file_path, get_preview_path
+
+# Preview libraries are optional - only import if available
+try:
+    from PIL import Image
+
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+    Image = None  # type: ignore[assignment]
+
+try:
+    import pymupdf
+
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    pymupdf = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MIME_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+PDF_MIME_TYPE = "application/pdf"
+WEBP_QUALITY = 80
+
+_preview_executor: ProcessPoolExecutor | None = None
+
+
+def supports_preview(mime_type: str) -> bool:
+    """Check whether a preview can be rendered for a MIME type."""
+    if not PILLOW_AVAILABLE:
+        return False
+    if mime_type == PDF_MIME_TYPE:
+        return PYMUPDF_AVAILABLE
+    return mime_type in IMAGE_MIME_TYPES
+
+
+def render_preview(source: str, target: str, mime_type: str, max_px: int) -> bool:
+    """Render a WebP preview of a file (runs in a worker process).
+
+    Args:
+        source: Path of the original file.
+        target: Path of the preview to write (replaced atomically).
+        mime_type: MIME type of the original.
+        max_px: Maximum width and height of the preview.
+
+    Returns:
+        False if the original was deleted while rendering (no preview is
+        left behind), True otherwise.
+    """
+    if mime_type == PDF_MIME_TYPE:
+        with pymupdf.open(source) as document:
+            page = document[0]
+            scale = max_px / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+            image = Image.frombytes(
+                "RGB", (pixmap.width, pixmap.height), pixmap.samples
+            )
+    else:
+        image = Image.open(source)
+        image.seek(0)  # first frame of animations
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    image.thumbnail((max_px, max_px))
+    # Unique per render: concurrent uploads of the same content share a target
+    tmp_target = f"{target}.{os.getpid()}.{uuid.uuid4().hex}.part"
+    try:
+        image.save(tmp_target, format="WEBP", quality=WEBP_QUALITY)
+        if not os.path.exists(source):
+            return False
+        os.replace(tmp_target, target)
+    finally:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+
+    # release_stored_file() may have run between the check and the replace
+    if not os.path.exists(source):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(target)
+        return False
+    return True
+
+
+def _get_preview_executor() -> ProcessPoolExecutor:
+    """Get or create the process pool for preview rendering."""
+    global _preview_executor
+    if _preview_executor is None:
+        _preview_executor = ProcessPoolExecutor(
+            max_workers=settings.file_preview_workers,
+            # Forking a process with running threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _preview_executor
+
+
+def shutdown_preview_executor() -> None:
+    """Shut down the preview process pool (on application shutdown)."""
+    global _preview_executor
+    if _preview_executor is not None:
+        _preview_executor.shutdown(wait=False, cancel_futures=True)
+        _preview_executor = None
+
+
+async def generate_preview(stored_filename: str, mime_type: str) -> bool:
+    """Generate the preview of a stored file unless it already exists.
+
+    Meant to run as a background task after the upload is committed; errors
+    are logged, not raised. Deduplicated uploads reuse the existing preview.
+
+    Args:
+        stored_filename: Stored filename of the original.
+        mime_type: MIME type of the original.
+
+    Returns:
+        True if a preview is available afterwards.
+    """
+    if not settings.file_previews_enabled or not supports_preview(mime_type):
+        FILE_PREVIEWS_TOTAL.labels(result="unsupported").inc()
+        return False
+
+    target = get_preview_path(stored_filename)
+    if target.exists():
+        FILE_PREVIEWS_TOTAL.labels(result="reused").inc()
+        return True
+
+    loop = asyncio.get_running_loop()
+    try:
+        rendered = await loop.run_in_executor(
+            _get_preview_executor(),
+            render_preview,
+            str(get_file_path(stored_filename)),
+            str(target),
+            mime_type,
+            settings.file_preview_max_px,
+        )
+    except Exception:
+        FILE_PREVIEWS_TOTAL.labels(result="failed").inc()
+        logger.exception("Failed to render preview of %s", stored_filename)
+        return False
+
+    if not rendered:
+        FILE_PREVIEWS_TOTAL.labels(result="discarded").inc()
+        return False
+    FILE_PREVIEWS_TOTAL.labels(result="generated").inc()
+    return True
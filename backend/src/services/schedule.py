@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, TypedDict
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import and_, delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.config import settings
+from src.metrics import (
+    SCHEDULE_GROUP_SYNC_DURATION_SECONDS,
+    SCHEDULE_GROUP_SYNC_TOTAL,
+    SCHEDULE_SYNC_ROWS_TOTAL,
+)
 from src.models.schedule import ScheduleEntry, ScheduleSnapshot
 from src.parser.exceptions import ParserException
 from src.parser.hash_utils import DateEncoder
@@ -25,8 +32,13 @@ from src.schemas.schedule import (
     ScheduleSnapshotCreate,
     WeekScheduleResponse,
 )
+from src.services.attendance import invalidate_attendance_aggregates
+from src.services.schedule_cache import get_or_build_view, invalidate_schedule_cache
+from src.services.schedule_scope import visible_entries
 
 if TYPE_CHECKING:
+    import httpx
+
     from src.parser.omsu_parser import ParseResult
 
 logger = logging.getLogger(__name__)
@@ -52,6 +64,40 @@ class SyncResult(TypedDict, total=False):
     entries_count: int
     content_hash: str
     message: str
+    inserted: int
+    updated: int
+    deleted: int
+
+
+class ScheduleDiff(TypedDict):
+    """Changes required to bring schedule_entries in line with parsed data."""
+
+    inserts: list[dict]
+    updates: list[dict]
+    deletes: list[int]
+
+
+# Columns that identify a lesson across re-syncs. Everything else is payload
+# that may change in place (room, teacher, ...) without changing entry id.
+SYNC_KEY_FIELDS = (
+    "lesson_date",
+    "start_time",
+    "subject_name",
+    "lesson_type",
+    "subgroup",
+)
+SYNC_VALUE_FIELDS = (
+    "day_of_week",
+    "end_time",
+    "week_type",
+    "teacher_name",
+    "room",
+    "building",
+    "group_name",
+    "notes",
+    "subject_id",
+    "teacher_id",
+)
 
 
 def get_week_number(d: date) -> int:
@@ -96,7 +142,7 @@ async def get_schedule_entries(
     if conditions:
         query = query.where(and_(*conditions))
 
-    result = await db.execute(query)
+    result = await db.execute(query.where(visible_entries()))
     return list(result.scalars().all())
 
 
@@ -121,7 +167,8 @@ async def get_schedule_entries_by_date_range(
             and_(
                 ScheduleEntry.lesson_date >= start_date,
                 ScheduleEntry.lesson_date <= end_date,
-            )
+            ),
+            visible_entries(),
         )
         .order_by(ScheduleEntry.lesson_date, ScheduleEntry.start_time)
     )
@@ -145,7 +192,7 @@ async def get_schedule_entries_by_date(
     """
     query = (
         select(ScheduleEntry)
-        .where(ScheduleEntry.lesson_date == target_date)
+        .where(ScheduleEntry.lesson_date == target_date, visible_entries())
         .order_by(ScheduleEntry.start_time)
     )
 
@@ -183,8 +230,10 @@ async def create_schedule_entry(
         teacher_id=data.teacher_id,
     )
     db.add(entry)
+    await invalidate_attendance_aggregates(db, [entry.lesson_date])
     await db.commit()
     await db.refresh(entry)
+    await invalidate_schedule_cache()
     return entry
 
 
@@ -192,6 +241,7 @@ async def update_schedule_entry(
     db: AsyncSession, entry: ScheduleEntry, data: ScheduleEntryUpdate
 ) -> ScheduleEntry:
     """Update schedule entry."""
+    old_lesson_date = entry.lesson_date
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         if (
@@ -204,15 +254,19 @@ async def update_schedule_entry(
         ):
             value = value.value
         setattr(entry, field, value)
+    await invalidate_attendance_aggregates(db, [old_lesson_date, entry.lesson_date])
     await db.commit()
     await db.refresh(entry)
+    await invalidate_schedule_cache()
     return entry
 
 
 async def delete_schedule_entry(db: AsyncSession, entry: ScheduleEntry) -> None:
     """Delete schedule entry."""
     await db.delete(entry)
+    await invalidate_attendance_aggregates(db, [entry.lesson_date])
     await db.commit()
+    await invalidate_schedule_cache()
 
 
 # High-level schedule operations
@@ -236,57 +290,72 @@ async def get_today_schedule(
     )
 
 
+# Columns selected for entry responses (skips ORM instantiation)
+_ENTRY_RESPONSE_FIELDS = tuple(ScheduleEntryResponse.model_fields)
+_ENTRY_RESPONSE_COLUMNS = tuple(
+    getattr(ScheduleEntry, name) for name in _ENTRY_RESPONSE_FIELDS
+)
+
+
 async def get_week_schedule(
     db: AsyncSession, target_date: date | None = None
 ) -> WeekScheduleResponse:
-    """Get schedule for the week containing the specified date."""
+    """Get schedule for the week containing the specified date.
+
+    Selects only the response columns as plain rows, buckets them by date in
+    a single pass and validates the whole response at once.
+    """
     if target_date is None:
         target_date = datetime.now(OMSK_TZ).date()
 
     week_start, week_end = get_week_bounds(target_date)
-    week_number = get_week_number(target_date)
-    odd_week = is_odd_week(target_date)
-
-    # Get all entries for this week by date range
-    entries = await get_schedule_entries_by_date_range(db, week_start, week_end)
-
-    # Group entries by day
-    days: list[DayScheduleResponse] = []
-    for day_num in range(1, 8):  # Monday to Sunday
-        day_date = week_start + timedelta(days=day_num - 1)
-        day_entries = [e for e in entries if e.lesson_date == day_date]
-
-        days.append(
-            DayScheduleResponse(
-                date=day_date,
-                day_of_week=DayOfWeek(day_num),
-                day_name=DAY_NAMES_RU[day_num],
-                entries=[ScheduleEntryResponse.model_validate(e) for e in day_entries],
-            )
-        )
+    days = [week_start + timedelta(days=offset) for offset in range(7)]
+    buckets: dict[date, list[dict]] = {day_date: [] for day_date in days}
 
-    return WeekScheduleResponse(
-        week_start=week_start,
-        week_end=week_end,
-        week_number=week_number,
-        is_odd_week=odd_week,
-        days=days,
+    result = await db.execute(
+        select(*_ENTRY_RESPONSE_COLUMNS)
+        .where(
+            ScheduleEntry.lesson_date >= week_start,
+            ScheduleEntry.lesson_date <= week_end,
+            visible_entries(),
+        )
+        .order_by(ScheduleEntry.lesson_date, ScheduleEntry.start_time)
+    )
+    fields = _ENTRY_RESPONSE_FIELDS
+    for row in result.all():
+        entry = dict(zip(fields, row, strict=True))
+        buckets[entry["lesson_date"]].append(entry)
+
+    return WeekScheduleResponse.model_validate(
+        {
+            "week_start": week_start,
+            "week_end": week_end,
+            "week_number": get_week_number(target_date),
+            "is_odd_week": is_odd_week(target_date),
+            "days": [
+                {
+                    "date": day_date,
+                    "day_of_week": day_num,
+                    "day_name": DAY_NAMES_RU[day_num],
+                    "entries": buckets[day_date],
+                }
+                for day_num, day_date in enumerate(days, start=1)
+            ],
+        }
     )
 
 
-async def get_current_lesson(db: AsyncSession) -> CurrentLessonResponse:
-    """Get current and next lesson."""
-    now = datetime.now(OMSK_TZ)
+def _build_current_lesson(
+    entries: list[ScheduleEntry] | list[ScheduleEntryResponse], now: datetime
+) -> CurrentLessonResponse:
+    """Find current and next lesson among a day's entries (sorted by start)."""
     current_date = now.date()
     current_time = now.time()
 
-    # Get today's entries by date
-    today_entries = await get_schedule_entries_by_date(db, current_date)
-
     current_lesson = None
     next_lesson = None
 
-    for entry in today_entries:
+    for entry in entries:
         if entry.start_time <= current_time <= entry.end_time:
             current_lesson = entry
         elif entry.start_time > current_time and next_lesson is None:
@@ -310,6 +379,72 @@ async def get_current_lesson(db: AsyncSession) -> CurrentLessonResponse:
     )
 
 
+async def get_current_lesson(db: AsyncSession) -> CurrentLessonResponse:
+    """Get current and next lesson."""
+    now = datetime.now(OMSK_TZ)
+
+    # Get today's entries by date
+    today_entries = await get_schedule_entries_by_date(db, now.date())
+    return _build_current_lesson(today_entries, now)
+
+
+# Cached views (pre-serialized JSON, see services.schedule_cache)
+def week_view_key(target_date: date | None = None) -> str:
+    """Get the cache view key for the week containing the date."""
+    if target_date is None:
+        target_date = datetime.now(OMSK_TZ).date()
+    week_start, _ = get_week_bounds(target_date)
+    return f"week:{week_start.isoformat()}"
+
+
+def day_view_key(target_date: date | None = None) -> str:
+    """Get the cache view key for a day."""
+    if target_date is None:
+        target_date = datetime.now(OMSK_TZ).date()
+    return f"day:{target_date.isoformat()}"
+
+
+def current_view_key() -> str:
+    """Get the view key for /current (changes every minute)."""
+    now = datetime.now(OMSK_TZ)
+    return f"current:{now.date().isoformat()}T{now:%H:%M}"
+
+
+async def get_week_schedule_json(
+    db: AsyncSession, target_date: date | None = None
+) -> bytes:
+    """Get the week schedule as JSON bytes, served from cache when possible."""
+    if target_date is None:
+        target_date = datetime.now(OMSK_TZ).date()
+    return await get_or_build_view(
+        db,
+        week_view_key(target_date),
+        lambda: get_week_schedule(db, target_date),
+    )
+
+
+async def get_today_schedule_json(
+    db: AsyncSession, target_date: date | None = None
+) -> bytes:
+    """Get a day's schedule as JSON bytes, served from cache when possible."""
+    if target_date is None:
+        target_date = datetime.now(OMSK_TZ).date()
+    return await get_or_build_view(
+        db,
+        day_view_key(target_date),
+        lambda: get_today_schedule(db, target_date),
+    )
+
+
+async def get_current_lesson_json(db: AsyncSession) -> bytes:
+    """Get current and next lesson as JSON bytes, computed from the cached day."""
+    now = datetime.now(OMSK_TZ)
+    day = DayScheduleResponse.model_validate_json(
+        await get_today_schedule_json(db, now.date())
+    )
+    return _build_current_lesson(day.entries, now).model_dump_json().encode()
+
+
 # Schedule Snapshot operations
 async def get_snapshots(db: AsyncSession, limit: int = 10) -> list[ScheduleSnapshot]:
     """Get recent schedule snapshots."""
@@ -321,12 +456,17 @@ async def get_snapshots(db: AsyncSession, limit: int = 10) -> list[ScheduleSnaps
     return list(result.scalars().all())
 
 
-async def get_latest_snapshot(db: AsyncSession) -> ScheduleSnapshot | None:
-    """Get the most recent schedule snapshot."""
+async def get_latest_snapshot(
+    db: AsyncSession, group_id: int | None = None
+) -> ScheduleSnapshot | None:
+    """Get the most recent schedule snapshot (of any group unless specified)."""
+    query = select(ScheduleSnapshot)
+    if group_id is not None:
+        query = query.where(ScheduleSnapshot.group_id == group_id)
     result = await db.execute(
-        select(ScheduleSnapshot)
-        .order_by(ScheduleSnapshot.snapshot_date.desc())
-        .limit(1)
+        query.order_by(
+            ScheduleSnapshot.snapshot_date.desc(), ScheduleSnapshot.id.desc()
+        ).limit(1)
     )
     return result.scalar_one_or_none()
 
@@ -341,6 +481,7 @@ async def create_snapshot(
         raw_data=data.raw_data,
         source_url=data.source_url,
         entries_count=data.entries_count,
+        group_id=data.group_id,
     )
     db.add(snapshot)
     await db.commit()
@@ -349,11 +490,17 @@ async def create_snapshot(
 
 
 # Parser integration functions
-async def parse_schedule(url: str | None = None) -> ParseResult:
+async def parse_schedule(
+    url: str | None = None,
+    group_id: int | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> ParseResult:
     """Parse schedule from OmGU API.
 
     Args:
         url: Schedule API URL. Defaults to constructed from group_id.
+        group_id: Group ID. Defaults to settings.schedule_group_id.
+        client: HTTP client; the shared upstream client is used if omitted.
 
     Returns:
         ParseResult with parsed entries and metadata.
@@ -363,44 +510,179 @@ async def parse_schedule(url: str | None = None) -> ParseResult:
     """
     from src.parser import OmsuScheduleParser
 
-    async with OmsuScheduleParser(url=url) as parser:
+    async with OmsuScheduleParser(url=url, group_id=group_id, client=client) as parser:
         return await parser.parse()
 
 
-async def _clear_schedule_entries(db: AsyncSession) -> int:
-    """Delete all schedule entries.
+def get_schedule_group_ids() -> list[int]:
+    """Get the registry of schedule groups synced by this backend.
+
+    Returns:
+        Group IDs from settings.schedule_group_ids (deduplicated), or just
+        settings.schedule_group_id if none are configured.
+    """
+    return list(dict.fromkeys(settings.schedule_group_ids)) or [
+        settings.schedule_group_id
+    ]
+
+
+def _entry_values(data: ScheduleEntryCreate) -> dict:
+    """Convert a parsed entry into a column -> value mapping for ScheduleEntry."""
+    return {
+        "lesson_date": data.lesson_date,
+        "day_of_week": data.day_of_week.value,
+        "start_time": data.start_time,
+        "end_time": data.end_time,
+        "week_type": data.week_type.value if data.week_type else None,
+        "subject_name": data.subject_name,
+        "lesson_type": data.lesson_type.value,
+        "teacher_name": data.teacher_name,
+        "room": data.room,
+        "building": data.building,
+        "group_name": data.group_name,
+        "subgroup": data.subgroup,
+        "notes": data.notes,
+        "subject_id": data.subject_id,
+        "teacher_id": data.teacher_id,
+    }
+
+
+def compute_schedule_diff(
+    existing: list[dict], parsed: list[ScheduleEntryCreate]
+) -> ScheduleDiff:
+    """Compute inserts, updates and deletes between stored and parsed entries.
+
+    Entries are matched on SYNC_KEY_FIELDS. When several entries share the
+    same key (e.g. one lesson in two rooms), they are paired in order and
+    the surplus on either side becomes an insert or a delete.
+
+    Args:
+        existing: Stored rows as dicts with "id" and all sync fields.
+        parsed: Entries produced by the parser.
+
+    Returns:
+        ScheduleDiff with rows to insert, {"id": ..., **changes} rows to
+        update and ids to delete.
+    """
+    stored: dict[tuple, list[dict]] = {}
+    for row in existing:
+        key = tuple(row[f] for f in SYNC_KEY_FIELDS)
+        stored.setdefault(key, []).append(row)
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for data in parsed:
+        values = _entry_values(data)
+        key = tuple(values[f] for f in SYNC_KEY_FIELDS)
+        candidates = stored.get(key)
+        if not candidates:
+            inserts.append(values)
+            continue
+        row = candidates.pop(0)
+        changes = {f: values[f] for f in SYNC_VALUE_FIELDS if row[f] != values[f]}
+        if changes:
+            updates.append({"id": row["id"], **changes})
+
+    deletes = [row["id"] for rows in stored.values() for row in rows]
+    return ScheduleDiff(inserts=inserts, updates=updates, deletes=deletes)
+
+
+async def _insert_rows(db: AsyncSession, rows: list[dict]) -> None:
+    """Insert prepared rows with multi-row INSERT statements.
+
+    Rows are split into chunks of settings.schedule_sync_batch_size to stay
+    below the driver's bind parameter limit.
+    """
+    start = time.perf_counter()
+    batch_size = settings.schedule_sync_batch_size
+    for i in range(0, len(rows), batch_size):
+        await db.execute(insert(ScheduleEntry).values(rows[i : i + batch_size]))
+    duration = time.perf_counter() - start
+
+    SCHEDULE_SYNC_ROWS_TOTAL.labels(operation="insert").inc(len(rows))
+    logger.debug("Bulk inserted %d schedule entries in %.3fs", len(rows), duration)
+
+
+async def _apply_schedule_diff(
+    db: AsyncSession, parsed: list[ScheduleEntryCreate], group_id: int
+) -> ScheduleDiff:
+    """Bring a group's schedule_entries in line with parsed data.
+
+    Unchanged rows keep their ids, so Absence and LessonNote references
+    survive a re-sync. Changes are applied with one statement per kind
+    (insert / update / delete); the caller is responsible for the commit.
+    Rows of other groups and manual entries are left alone. Materialized
+    attendance counts covering the changed lessons are dropped.
 
     Args:
         db: Database session.
+        parsed: Entries produced by the parser.
+        group_id: Group the entries were parsed for.
 
     Returns:
-        Number of deleted entries.
+        The applied ScheduleDiff.
     """
-    result = await db.execute(delete(ScheduleEntry))
-    await db.commit()
-    return result.rowcount
+    columns = [getattr(ScheduleEntry, f) for f in SYNC_KEY_FIELDS + SYNC_VALUE_FIELDS]
+    result = await db.execute(
+        select(ScheduleEntry.id, *columns).where(
+            ScheduleEntry.source_group_id == group_id
+        )
+    )
+    existing = [dict(row._mapping) for row in result.all()]
+
+    diff = compute_schedule_diff(existing, parsed)
+    for row in diff["inserts"]:
+        row["source_group_id"] = group_id
+
+    if diff["deletes"]:
+        await db.execute(
+            delete(ScheduleEntry).where(ScheduleEntry.id.in_(diff["deletes"]))
+        )
+        SCHEDULE_SYNC_ROWS_TOTAL.labels(operation="delete").inc(len(diff["deletes"]))
+    if diff["updates"]:
+        await db.execute(update(ScheduleEntry), diff["updates"])
+        SCHEDULE_SYNC_ROWS_TOTAL.labels(operation="update").inc(len(diff["updates"]))
+    if diff["inserts"]:
+        await _insert_rows(db, diff["inserts"])
+
+    # Lessons of other groups are not counted (see schedule_scope)
+    if group_id == settings.schedule_group_id:
+        lesson_dates = {row["id"]: row["lesson_date"] for row in existing}
+        await invalidate_attendance_aggregates(
+            db,
+            [row["lesson_date"] for row in diff["inserts"]]
+            + [lesson_dates[row["id"]] for row in diff["updates"]]
+            + [lesson_dates[entry_id] for entry_id in diff["deletes"]],
+        )
+    return diff
 
 
 async def sync_schedule(
     db: AsyncSession,
     force: bool = False,
     url: str | None = None,
+    group_id: int | None = None,
+    client: httpx.AsyncClient | None = None,
 ) -> SyncResult:
-    """Synchronize schedule: parse, compare hash, update if changed.
+    """Synchronize one group's schedule: parse, compare hash, update if changed.
 
     Args:
         db: Database session.
         force: Force update even if content hash unchanged.
         url: Schedule API URL. Defaults to constructed from group_id.
+        group_id: Group to sync. Defaults to settings.schedule_group_id.
+        client: HTTP client; the shared upstream client is used if omitted.
 
     Returns:
         SyncResult with sync status details.
     """
-    logger.info("Starting schedule sync (force=%s)", force)
+    if group_id is None:
+        group_id = settings.schedule_group_id
+    logger.info("Starting schedule sync (group=%d, force=%s)", group_id, force)
 
     try:
         # Parse schedule
-        parse_result = await parse_schedule(url=url)
+        parse_result = await parse_schedule(url=url, group_id=group_id, client=client)
 
         if parse_result.entries_count == 0:
             logger.warning("No entries parsed from schedule")
@@ -412,7 +694,7 @@ async def sync_schedule(
             )
 
         # Check if content changed
-        latest_snapshot = await get_latest_snapshot(db)
+        latest_snapshot = await get_latest_snapshot(db, group_id)
         if (
             latest_snapshot
             and latest_snapshot.content_hash == parse_result.content_hash
@@ -430,15 +712,16 @@ async def sync_schedule(
                 )
             logger.info("Force sync requested, updating despite unchanged hash")
 
-        # Clear existing entries
-        deleted_count = await _clear_schedule_entries(db)
-        logger.info("Deleted %d existing entries", deleted_count)
-
-        # Create new entries
-        for entry_data in parse_result.entries:
-            await create_schedule_entry(db, entry_data)
+        # Apply only the differences, keeping ids of unchanged lessons
+        diff = await _apply_schedule_diff(db, parse_result.entries, group_id)
+        logger.info(
+            "Schedule diff: %d inserted, %d updated, %d deleted",
+            len(diff["inserts"]),
+            len(diff["updates"]),
+            len(diff["deletes"]),
+        )
 
-        # Create snapshot
+        # Create snapshot (commits the diff in the same transaction)
         snapshot_data = ScheduleSnapshotCreate(
             snapshot_date=parse_result.parsed_date,
             content_hash=parse_result.content_hash,
@@ -447,8 +730,10 @@ async def sync_schedule(
             ),
             source_url=parse_result.source_url,
             entries_count=parse_result.entries_count,
+            group_id=group_id,
         )
         await create_snapshot(db, snapshot_data)
+        await invalidate_schedule_cache(parse_result.content_hash)
 
         logger.info(
             "Schedule synced: %d entries, hash: %s...",
@@ -462,9 +747,13 @@ async def sync_schedule(
             entries_count=parse_result.entries_count,
             content_hash=parse_result.content_hash,
             message="Schedule updated successfully",
+            inserted=len(diff["inserts"]),
+            updated=len(diff["updates"]),
+            deleted=len(diff["deletes"]),
         )
 
     except ParserException as e:
+        await db.rollback()
         logger.error("Parser error during schedule sync: %s", e)
         return SyncResult(
             success=False,
@@ -473,6 +762,7 @@ async def sync_schedule(
             message=f"Parser error: {e}",
         )
     except Exception as e:
+        await db.rollback()
         logger.error("Unexpected error during schedule sync: %s", e, exc_info=True)
         return SyncResult(
             success=False,
@@ -480,3 +770,59 @@ async def sync_schedule(
             entries_count=0,
             message=str(e),
         )
+
+
+async def sync_all_groups(
+    session_maker: async_sessionmaker[AsyncSession], force: bool = False
+) -> dict[int, SyncResult]:
+    """Sync every registered group concurrently.
+
+    Groups are fetched over the shared upstream client, at most
+    settings.schedule_sync_concurrency at a time, each in its own session
+    and transaction. A failing group is reported in its result and does not
+    affect the others.
+
+    Args:
+        session_maker: Factory for per-group database sessions.
+        force: Force update even if content hashes are unchanged.
+
+    Returns:
+        SyncResult per group ID.
+    """
+    from src.parser.http_pool import get_upstream_client
+
+    semaphore = asyncio.Semaphore(settings.schedule_sync_concurrency)
+
+    async def sync_group(group_id: int, client: httpx.AsyncClient) -> SyncResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with session_maker() as db:
+                    result = await sync_schedule(
+                        db, force=force, group_id=group_id, client=client
+                    )
+            except Exception as e:
+                logger.exception("Schedule sync of group %d crashed", group_id)
+                result = SyncResult(
+                    success=False, changed=False, entries_count=0, message=str(e)
+                )
+
+        label = str(group_id)
+        SCHEDULE_GROUP_SYNC_DURATION_SECONDS.labels(group=label).observe(
+            time.perf_counter() - start
+        )
+        if not result.get("success"):
+            status = "error"
+        elif result.get("changed"):
+            status = "changed"
+        else:
+            status = "unchanged"
+        SCHEDULE_GROUP_SYNC_TOTAL.labels(group=label, status=status).inc()
+        return result
+
+    group_ids = get_schedule_group_ids()
+    client = get_upstream_client()
+    results = await asyncio.gather(
+        *(sync_group(group_id, client) for group_id in group_ids)
+    )
+    return dict(zip(group_ids, results, strict=True))
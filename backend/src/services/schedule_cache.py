@@ -0,0 +1,151 @@
+"""Redis read cache for schedule views.
+
+Schedule data only changes on sync or manual entry edits, so rendered week
+and day views are stored as JSON bytes and served without touching the
+database. Cache keys embed a schedule version made of the latest snapshot
+content_hash and a generation counter; bumping the version makes all old
+keys unreachable (they expire via TTL).
+
+The version is maintained whether or not the view cache is enabled: view
+ETags are derived from it, so conditional requests are answered with 304
+before any view is queried.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import get_cache_redis
+from src.config import settings
+from src.metrics import SCHEDULE_CACHE_REQUESTS_TOTAL
+from src.models.schedule import ScheduleSnapshot
+from src.utils.http_cache import make_etag
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "studyhelper:schedule:version"
+VIEW_KEY_PREFIX = "studyhelper:schedule:view"
+
+
+async def _load_content_hash(db: AsyncSession) -> str:
+    """Get content_hash of the latest snapshot ("none" if there is none)."""
+    result = await db.execute(
+        select(ScheduleSnapshot.content_hash)
+        .order_by(ScheduleSnapshot.snapshot_date.desc(), ScheduleSnapshot.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none() or "none"
+
+
+async def get_schedule_version(db: AsyncSession) -> str:
+    """Get the current schedule version ("<content_hash>.<generation>").
+
+    The version lives in Redis; on a cold Redis it is seeded from the latest
+    snapshot, which is the only time this touches the database.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        Version string used in cache keys and ETags.
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unavailable.
+    """
+    redis = get_cache_redis()
+    data = await redis.hgetall(VERSION_KEY)
+    if b"hash" not in data or b"gen" not in data:
+        await redis.hsetnx(VERSION_KEY, "hash", await _load_content_hash(db))
+        # Seed the generation with the clock so a re-seeded version never
+        # matches keys written before the version record was lost
+        await redis.hsetnx(VERSION_KEY, "gen", int(time.time()))
+        data = await redis.hgetall(VERSION_KEY)
+    return f"{data[b'hash'].decode()}.{data[b'gen'].decode()}"
+
+
+async def get_view_etag(db: AsyncSession, view: str) -> str | None:
+    """Get the ETag of a schedule view without rendering it.
+
+    Args:
+        db: Database session (only used to seed a cold version record).
+        view: View identifier, as passed to get_or_build_view.
+
+    Works with the view cache disabled; only the version record is read.
+
+    Returns:
+        ETag derived from the schedule version, or None if Redis is
+        unavailable.
+    """
+    try:
+        version = await get_schedule_version(db)
+    except Exception:
+        logger.warning("Schedule version unavailable, cannot derive ETag")
+        return None
+    return make_etag(version, view)
+
+
+async def get_or_build_view(
+    db: AsyncSession,
+    view: str,
+    build: Callable[[], Awaitable[BaseModel]],
+) -> bytes:
+    """Get a rendered schedule view from cache, building it on a miss.
+
+    Args:
+        db: Database session.
+        view: View identifier, e.g. "week:2026-10-12" or "day:2026-10-17".
+        build: Coroutine factory producing the response model.
+
+    Returns:
+        JSON-encoded response body.
+    """
+    if not settings.schedule_cache_enabled:
+        return (await build()).model_dump_json().encode()
+
+    key: str | None = None
+    try:
+        version = await get_schedule_version(db)
+        key = f"{VIEW_KEY_PREFIX}:{version}:{view}"
+        cached = await get_cache_redis().get(key)
+    except Exception:
+        logger.warning("Schedule cache unavailable, serving from DB")
+        cached = None
+
+    if cached is not None:
+        SCHEDULE_CACHE_REQUESTS_TOTAL.labels(result="hit").inc()
+        return cached
+
+    SCHEDULE_CACHE_REQUESTS_TOTAL.labels(result="miss").inc()
+    body = (await build()).model_dump_json().encode()
+
+    if key is not None:
+        try:
+            await get_cache_redis().set(
+                key, body, ex=settings.schedule_cache_ttl_seconds
+            )
+        except Exception:
+            logger.warning("Failed to store schedule view %s in cache", view)
+    return body
+
+
+async def invalidate_schedule_cache(content_hash: str | None = None) -> None:
+    """Bump the schedule version so cached views and ETags are no longer used.
+
+    Done even with the view cache disabled, since ETags depend on the version.
+
+    Args:
+        content_hash: New snapshot hash after a sync; None for manual edits.
+    """
+    try:
+        redis = get_cache_redis()
+        if content_hash is not None:
+            await redis.hset(VERSION_KEY, "hash", content_hash)
+        await redis.hincrby(VERSION_KEY, "gen", 1)
+    except Exception:
+        logger.error("Failed to bump schedule version, views may be stale")
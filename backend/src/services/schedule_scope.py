@@ -0,0 +1,36 @@
+"""Which schedule entries users see.
+
+Entries of every group in settings.schedule_group_ids are synced, but users
+have no group of their own yet, so read views, attendance and exam lists
+show the default group (settings.schedule_group_id) plus manual entries.
+"""
+
+from sqlalchemy import ColumnElement, or_
+
+from src.config import settings
+from src.models.schedule import ScheduleEntry
+
+
+def visible_entries() -> ColumnElement[bool]:
+    """Condition selecting the schedule entries shown to users.
+
+    Returns:
+        Filter matching entries synced for the default group and manual
+        entries (no source group).
+    """
+    return or_(
+        ScheduleEntry.source_group_id == settings.schedule_group_id,
+        ScheduleEntry.source_group_id.is_(None),
+    )
+
+
+def is_visible(entry: ScheduleEntry) -> bool:
+    """Check whether a loaded schedule entry is shown to users.
+
+    Args:
+        entry: Schedule entry.
+
+    Returns:
+        True if visible_entries() matches the entry.
+    """
+    return entry.source_group_id in (None, settings.schedule_group_id)
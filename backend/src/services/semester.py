@@ -1,13 +1,12 @@
 """Semester service."""
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from src.models.schedule import ScheduleEntry
 from src.models.semester import Semester
 from src.models.subject import Subject
-from src.models.work import Work
+from src.models.work import Work, WorkStatus, WorkStatusEnum
 from src.schemas.semester import (
     SemesterCreate,
     SemesterUpdate,
@@ -15,6 +14,7 @@ from src.schemas.semester import (
     TimelineExam,
     TimelineResponse,
 )
+from src.services.schedule_scope import visible_entries
 
 
 async def get_semesters(db: AsyncSession) -> list[Semester]:
@@ -122,8 +122,14 @@ async def get_semester_timeline(
     deadlines: list[TimelineDeadline] = []
     if subject_ids:
         works_query = (
-            select(Work)
-            .options(selectinload(Work.statuses))
+            select(
+                Work,
+                func.coalesce(WorkStatus.status, WorkStatusEnum.NOT_STARTED.value),
+            )
+            .outerjoin(
+                WorkStatus,
+                and_(WorkStatus.work_id == Work.id, WorkStatus.user_id == user_id),
+            )
             .where(
                 Work.subject_id.in_(subject_ids),
                 Work.deadline.isnot(None),
@@ -131,16 +137,7 @@ async def get_semester_timeline(
             .order_by(Work.deadline)
         )
         works_result = await db.execute(works_query)
-        works = list(works_result.scalars().all())
-
-        for work in works:
-            # Find status for this user
-            user_status = None
-            for ws in work.statuses:
-                if ws.user_id == user_id:
-                    user_status = ws.status
-                    break
-
+        for work, user_status in works_result.all():
             deadlines.append(
                 TimelineDeadline(
                     work_id=work.id,
@@ -161,6 +158,7 @@ async def get_semester_timeline(
             ScheduleEntry.lesson_date.isnot(None),
             ScheduleEntry.lesson_date >= semester.start_date,
             ScheduleEntry.lesson_date <= semester.end_date,
+            visible_entries(),
         )
         .order_by(ScheduleEntry.lesson_date, ScheduleEntry.start_time)
     )
@@ -1,6 +1,9 @@
 """Upload service for file management."""
 
+import asyncio
+import hashlib
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
 
 from fastapi import HTTPException, UploadFile, status
@@ -29,6 +32,17 @@ _FILE_SIGNATURES: dict[str, tuple[bytes, ...]] = {
 }
 
 CHUNK_SIZE = 8192
+# Study files are written straight to disk, so larger reads are cheap
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """Study file streamed into a temporary file next to its destination."""
+
+    path: Path
+    size: int
+    sha256: str
 
 
 def get_upload_dir() -> Path:
@@ -119,6 +133,66 @@ async def read_upload_streaming(
     return b"".join(chunks)
 
 
+async def spool_upload(
+    file: UploadFile, directory: Path, extension: str, max_size_mb: int
+) -> SpooledUpload:
+    """Stream an upload into a temporary file, validating it on the way.
+
+    Magic bytes are checked on the first chunk and the size limit on every
+    chunk; an empty file is rejected only when its extension has a signature
+    to check, and the SHA-256 is computed incrementally, so memory use stays at
+    one chunk regardless of file size. The temporary file lives in
+    `directory` so it can be renamed into place atomically.
+
+    Args:
+        file: The uploaded file.
+        directory: Directory for the temporary file (the storage directory).
+        extension: Expected file extension (e.g. '.pdf').
+        max_size_mb: Maximum file size in MB.
+
+    Returns:
+        SpooledUpload pointing to the temporary file.
+
+    Raises:
+        HTTPException: If the content does not match the extension or the
+            file exceeds the maximum size (the temporary file is removed).
+    """
+    max_size = max_size_mb * 1024 * 1024
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path = directory / f".{uuid.uuid4().hex}.part"
+
+    out = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        while chunk := await file.read(FILE_CHUNK_SIZE):
+            if size == 0 and not validate_file_content(chunk, extension):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File content does not match expected format",
+                )
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File too large. Maximum size: {max_size_mb}MB",
+                )
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+        # Only formats with a signature have magic bytes an empty file lacks
+        if size == 0 and extension.lower() in _FILE_SIGNATURES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File content does not match expected format",
+            )
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        tmp_path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(out.close)
+
+    return SpooledUpload(path=tmp_path, size=size, sha256=digest.hexdigest())
+
+
 def save_avatar(content: bytes, extension: str) -> str:
     """Save avatar content to disk.
 
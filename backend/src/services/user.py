@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.user import User
 from src.schemas.user import UserCreate
-from src.utils.security import hash_password
+from src.utils.security import hash_password_async
 
 
 async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
@@ -30,7 +30,7 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     """Create a new user."""
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         name=user_data.name,
     )
     db.add(user)
@@ -0,0 +1,167 @@
+"""Short-TTL cache of authenticated users.
+
+Saves the per-request user lookup in get_current_user. Entries are keyed by
+user id and the token's ``iat`` claim, held in process memory and optionally
+mirrored to Redis so that several workers share them. Cached users are
+attached to the request session without a query, so routers can keep
+treating them as regular persistent objects. Secret columns (the password
+hash) are never cached; code that needs them loads the user from the
+database.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.cache import get_cache_redis
+from src.config import settings
+from src.metrics import USER_CACHE_REQUESTS_TOTAL
+from src.models.user import User
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "studyhelper:user:"
+
+# Columns that must not leave the database (Redis is less protected)
+SECRET_COLUMNS = frozenset({"password_hash"})
+_CACHED_COLUMNS = [c for c in User.__table__.columns if c.key not in SECRET_COLUMNS]
+
+# (user_id, iat) -> (expires_at, column values)
+_local: dict[tuple[int, int], tuple[float, dict[str, Any]]] = {}
+
+
+def _snapshot(user: User) -> dict[str, Any]:
+    """Get the cacheable (non-secret) column values of a user."""
+    return {c.key: getattr(user, c.key) for c in _CACHED_COLUMNS}
+
+
+def _serialize(values: dict[str, Any]) -> str:
+    """Serialize column values for Redis."""
+    return json.dumps(
+        {k: v.isoformat() if isinstance(v, datetime) else v for k, v in values.items()}
+    )
+
+
+def _deserialize(raw: bytes) -> dict[str, Any]:
+    """Deserialize column values stored in Redis."""
+    values = json.loads(raw)
+    for column in _CACHED_COLUMNS:
+        if isinstance(column.type, DateTime) and values.get(column.key):
+            values[column.key] = datetime.fromisoformat(values[column.key])
+    return values
+
+
+def _get_redis() -> Redis | None:
+    """Get the cache Redis client if Redis backing is enabled."""
+    if not settings.user_cache_redis_enabled:
+        return None
+    return get_cache_redis()
+
+
+def _store_local(key: tuple[int, int], values: dict[str, Any]) -> None:
+    """Store values in process memory, evicting expired/oldest entries."""
+    now = time.monotonic()
+    if len(_local) >= settings.user_cache_max_size:
+        for k in [k for k, (exp, _) in _local.items() if exp <= now]:
+            del _local[k]
+        while len(_local) >= settings.user_cache_max_size:
+            del _local[next(iter(_local))]
+    _local[key] = (now + settings.user_cache_ttl_seconds, values)
+
+
+async def get_cached_user(db: AsyncSession, user_id: int, iat: int) -> User | None:
+    """Get a cached user and attach it to the session.
+
+    Args:
+        db: Database session of the current request.
+        user_id: User ID from the token.
+        iat: Token issue time.
+
+    Returns:
+        User attached to the session, or None on a cache miss.
+    """
+    if settings.user_cache_ttl_seconds <= 0:
+        return None
+
+    key = (user_id, iat)
+    values: dict[str, Any] | None = None
+
+    entry = _local.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        values = entry[1]
+    else:
+        raw = None
+        try:
+            redis = _get_redis()
+            if redis:
+                raw = await redis.hget(f"{REDIS_KEY_PREFIX}{user_id}", str(iat))
+        except Exception:
+            logger.warning("User cache: Redis unavailable, falling back to DB")
+        if raw:
+            values = _deserialize(raw)
+            _store_local(key, values)
+
+    if values is None:
+        USER_CACHE_REQUESTS_TOTAL.labels(result="miss").inc()
+        return None
+
+    USER_CACHE_REQUESTS_TOTAL.labels(result="hit").inc()
+    user = User(**values)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+async def cache_user(user: User, iat: int) -> None:
+    """Put a freshly loaded user into the cache.
+
+    Args:
+        user: User loaded from the database.
+        iat: Token issue time.
+    """
+    if settings.user_cache_ttl_seconds <= 0:
+        return
+
+    values = _snapshot(user)
+    _store_local((user.id, iat), values)
+
+    try:
+        redis = _get_redis()
+        if redis:
+            key = f"{REDIS_KEY_PREFIX}{user.id}"
+            await redis.hset(key, str(iat), _serialize(values))
+            await redis.expire(key, settings.user_cache_ttl_seconds)
+    except Exception:
+        logger.warning("User cache: failed to write user %d to Redis", user.id)
+
+
+async def invalidate_user(user_id: int) -> None:
+    """Drop all cached entries for a user (call after updating the user).
+
+    Args:
+        user_id: User ID.
+    """
+    for key in [k for k in _local if k[0] == user_id]:
+        del _local[key]
+
+    try:
+        redis = _get_redis()
+        if redis:
+            await redis.delete(f"{REDIS_KEY_PREFIX}{user_id}")
+    except Exception:
+        logger.warning("User cache: failed to invalidate user %d in Redis", user_id)
+
+
+def clear_user_cache() -> None:
+    """Clear the in-process cache."""
+    _local.clear()
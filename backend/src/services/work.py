@@ -3,31 +3,67 @@
 import logging
 from datetime import UTC, datetime
 
-from sqlalchemy import and_, select
+from sqlalchemy import ColumnElement, and_, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from src.models.subject import Subject
 from src.models.user import User
 from src.models.work import Work, WorkStatus, WorkStatusHistory
 from src.schemas.work import (
+    UpcomingWorkResponse,
     WorkCreate,
+    WorkStatusDefaultResponse,
     WorkStatusEnum,
+    WorkStatusResponse,
     WorkStatusUpdate,
     WorkUpdate,
+    WorkWithStatusResponse,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _my_status_join(user_id: int) -> ColumnElement[bool]:
+    """Outer join condition picking only the given user's WorkStatus."""
+    return and_(WorkStatus.work_id == Work.id, WorkStatus.user_id == user_id)
+
+
+def _status_or_default() -> ColumnElement[str]:
+    """The joined status, not_started when the user has no WorkStatus row."""
+    return func.coalesce(WorkStatus.status, WorkStatusEnum.NOT_STARTED.value)
+
+
+def _with_status(
+    work: Work, work_status: WorkStatus | None, user_id: int
+) -> WorkWithStatusResponse:
+    """Build a work response carrying the user's status.
+
+    Without a status row the user has not touched the work yet: a default
+    not_started status without id or timestamps is returned.
+    """
+    result = WorkWithStatusResponse.model_validate(work)
+    if work_status is not None:
+        result.my_status = WorkStatusResponse.model_validate(work_status)
+    else:
+        result.my_status = WorkStatusDefaultResponse(work_id=work.id, user_id=user_id)
+    return result
+
+
 async def get_works(
     db: AsyncSession,
+    user_id: int,
     subject_id: int | None = None,
     status: WorkStatusEnum | None = None,
-    user_id: int | None = None,
     has_deadline: bool | None = None,
-) -> list[Work]:
-    """Get all works with optional filters."""
-    query = select(Work).options(selectinload(Work.statuses))
+) -> list[WorkWithStatusResponse]:
+    """Get all works with optional filters and the user's status of each.
+
+    Only the user's WorkStatus rows are joined (LEFT OUTER JOIN on work and
+    user), so the cost does not grow with the number of other users. Works
+    the user has never updated have no row and count as not_started.
+    """
+    query = select(Work, WorkStatus).outerjoin(WorkStatus, _my_status_join(user_id))
 
     if subject_id is not None:
         query = query.where(Work.subject_id == subject_id)
@@ -37,37 +73,44 @@ async def get_works(
     elif has_deadline is False:
         query = query.where(Work.deadline.is_(None))
 
-    # Status filtering requires joining with WorkStatus
-    if status is not None and user_id is not None:
-        query = query.join(WorkStatus).where(
-            and_(
-                WorkStatus.user_id == user_id,
-                WorkStatus.status == status.value,
-            )
-        )
+    if status is not None:
+        query = query.where(_status_or_default() == status.value)
 
     query = query.order_by(Work.deadline.asc().nullslast(), Work.created_at.desc())
     result = await db.execute(query)
-    return list(result.scalars().unique().all())
+    return [
+        _with_status(work, work_status, user_id) for work, work_status in result.all()
+    ]
 
 
-async def get_work_by_id(
-    db: AsyncSession, work_id: int, with_statuses: bool = False
-) -> Work | None:
+async def get_work_by_id(db: AsyncSession, work_id: int) -> Work | None:
     """Get work by ID."""
-    query = select(Work).where(Work.id == work_id)
+    result = await db.execute(select(Work).where(Work.id == work_id))
+    return result.scalar_one_or_none()
 
-    if with_statuses:
-        query = query.options(selectinload(Work.statuses))
 
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+async def get_work_with_status(
+    db: AsyncSession, work_id: int, user_id: int
+) -> WorkWithStatusResponse | None:
+    """Get a work by ID with the user's status."""
+    result = await db.execute(
+        select(Work, WorkStatus)
+        .outerjoin(WorkStatus, _my_status_join(user_id))
+        .where(Work.id == work_id)
+    )
+    row = result.first()
+    return _with_status(*row, user_id) if row else None
 
 
 async def create_work(
     db: AsyncSession, work_data: WorkCreate, created_by: User
 ) -> Work:
-    """Create a new work and initialize status for all users."""
+    """Create a new work.
+
+    No WorkStatus rows are created: a user without one is treated as
+    not_started, and the row appears on the user's first status update
+    (see ensure_work_status_exists).
+    """
     try:
         work = Work(
             title=work_data.title,
@@ -78,33 +121,9 @@ async def create_work(
             subject_id=work_data.subject_id,
         )
         db.add(work)
-        await db.flush()
-
-        # Get all users to create status for each (pair mode)
-        users_result = await db.execute(select(User))
-        users = users_result.scalars().all()
-
-        for user in users:
-            work_status = WorkStatus(
-                work_id=work.id,
-                user_id=user.id,
-                status=WorkStatusEnum.NOT_STARTED.value,
-            )
-            db.add(work_status)
-            await db.flush()
-
-            # Create initial history entry
-            history = WorkStatusHistory(
-                work_status_id=work_status.id,
-                old_status=None,
-                new_status=WorkStatusEnum.NOT_STARTED.value,
-                changed_at=datetime.now(UTC),
-                changed_by_id=created_by.id,
-            )
-            db.add(history)
-
         await db.commit()
         await db.refresh(work)
+        logger.info("User %d created work %d", created_by.id, work.id)
         return work
     except Exception:
         await db.rollback()
@@ -190,13 +209,22 @@ async def get_work_status_history(
 
 async def get_upcoming_works(
     db: AsyncSession, user_id: int, limit: int = 10
-) -> list[Work]:
-    """Get works with upcoming deadlines."""
+) -> list[UpcomingWorkResponse]:
+    """Get works with upcoming deadlines and the user's status of each."""
     now = datetime.now(UTC)
 
     query = (
-        select(Work)
-        .options(selectinload(Work.statuses), selectinload(Work.subject))
+        select(
+            Work.id,
+            Work.title,
+            Work.work_type,
+            Work.deadline,
+            Work.subject_id,
+            Subject.name.label("subject_name"),
+            _status_or_default().label("my_status"),
+        )
+        .join(Subject, Subject.id == Work.subject_id)
+        .outerjoin(WorkStatus, _my_status_join(user_id))
         .where(
             and_(
                 Work.deadline.isnot(None),
@@ -208,32 +236,43 @@ async def get_upcoming_works(
     )
 
     result = await db.execute(query)
-    return list(result.scalars().unique().all())
+    return [UpcomingWorkResponse.model_validate(row) for row in result.all()]
 
 
 async def ensure_work_status_exists(
     db: AsyncSession, work: Work, user: User
 ) -> WorkStatus:
-    """Ensure work status exists for user (create if missing)."""
+    """Ensure work status exists for user (create if missing).
+
+    The row is inserted with ON CONFLICT DO NOTHING, so two concurrent first
+    updates of the same user end up sharing one row.
+    """
     status = await get_work_status(db, work.id, user.id)
-    if status is None:
-        status = WorkStatus(
+    if status is not None:
+        return status
+
+    is_sqlite = db.get_bind().dialect.name == "sqlite"
+    insert = sqlite.insert if is_sqlite else postgresql.insert
+    result = await db.execute(
+        insert(WorkStatus)
+        .values(
             work_id=work.id,
             user_id=user.id,
             status=WorkStatusEnum.NOT_STARTED.value,
         )
-        db.add(status)
-        await db.flush()
-
+        .on_conflict_do_nothing(index_elements=["work_id", "user_id"])
+        .returning(WorkStatus.id)
+    )
+    status_id = result.scalar_one_or_none()
+    if status_id is not None:
         history = WorkStatusHistory(
-            work_status_id=status.id,
+            work_status_id=status_id,
             old_status=None,
             new_status=WorkStatusEnum.NOT_STARTED.value,
             changed_at=datetime.now(UTC),
             changed_by_id=user.id,
         )
         db.add(history)
-        await db.commit()
-        await db.refresh(status)
+    await db.commit()
 
-    return status
+    return await get_work_status(db, work.id, user.id)
@@ -0,0 +1,355 @@
+"""Background job queue on Redis.
+
+Long upstream syncs (schedule refresh, LK sync) are enqueued instead of run
+inside the HTTP request. A job is a Redis hash holding its state, progress
+and result; job ids wait in a Redis list that worker tasks started with the
+application pop with BRPOP. Identical requests are deduplicated through a
+per-kind key pointing at the job that serves them, so a burst of refresh
+clicks runs one sync and everyone polls the same job.
+
+Concurrency is bounded per process by the number of worker tasks and, per
+job kind, by a semaphore given at registration. Jobs are not persisted
+beyond Redis: a worker killed mid-job leaves it "running" until the record
+expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from redis.asyncio import Redis
+
+from src.config import settings
+from src.metrics import JOB_DURATION_SECONDS, JOBS_DEDUPLICATED_TOTAL, JOBS_TOTAL
+from src.schemas.job import JobResponse, JobStatus
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "studyhelper:jobs:queue"
+JOB_KEY_PREFIX = "studyhelper:job"
+DEDUP_KEY_PREFIX = "studyhelper:job:dedup"
+
+ProgressCallback = Callable[[int, str], Awaitable[None]]
+JobHandler = Callable[[dict[str, Any], ProgressCallback], Awaitable[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class _JobKind:
+    """Registered job handler with its concurrency limit."""
+
+    handler: JobHandler
+    semaphore: asyncio.Semaphore
+
+
+_kinds: dict[str, _JobKind] = {}
+_redis: Redis | None = None
+_workers: list[asyncio.Task] = []
+
+
+def register_job(kind: str, concurrency: int) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine as the handler of a job kind.
+
+    The handler gets the job payload and a progress callback and returns a
+    JSON-serializable result. Raised exceptions fail the job; the exception's
+    ``detail`` (for HTTPException) or its message becomes the job error.
+
+    Args:
+        kind: Job kind name.
+        concurrency: Maximum number of jobs of this kind running at once in
+            one process.
+
+    Returns:
+        Decorator registering the handler.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        _kinds[kind] = _JobKind(handler, asyncio.Semaphore(concurrency))
+        return handler
+
+    return decorator
+
+
+def _get_redis() -> Redis:
+    """Get or create the job queue Redis client.
+
+    Separate from the cache client: BRPOP blocks longer than the cache's
+    short socket timeout allows.
+    """
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}:{job_id}"
+
+
+def _dedup_key(kind: str, dedup_key: str) -> str:
+    return f"{DEDUP_KEY_PREFIX}:{kind}:{dedup_key}"
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _decode(value: bytes | str | None) -> str | None:
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+async def _update_job(redis: Redis, job_id: str, **fields: Any) -> None:
+    """Set fields of a job record (and bump updated_at)."""
+    await redis.hset(_job_key(job_id), mapping={**fields, "updated_at": _now()})
+
+
+async def get_job(job_id: str) -> tuple[JobResponse, int | None] | None:
+    """Get the state of a job.
+
+    Args:
+        job_id: Job ID.
+
+    Returns:
+        Tuple of (job state, owner user ID or None for shared jobs), or None
+        if the job does not exist (or has expired).
+    """
+    data = await _get_redis().hgetall(_job_key(job_id))
+    if not data:
+        return None
+    fields = {_decode(k): _decode(v) for k, v in data.items()}
+    job = JobResponse(
+        id=job_id,
+        kind=fields["kind"],
+        status=JobStatus(fields["status"]),
+        progress=int(fields.get("progress") or 0),
+        message=fields.get("message") or None,
+        result=json.loads(fields["result"]) if fields.get("result") else None,
+        error=fields.get("error") or None,
+        created_at=datetime.fromisoformat(fields["created_at"]),
+        updated_at=datetime.fromisoformat(fields["updated_at"]),
+    )
+    user_id = int(fields["user_id"]) if fields.get("user_id") else None
+    return job, user_id
+
+
+async def enqueue_job(
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    user_id: int | None = None,
+    dedup_key: str | None = None,
+) -> JobResponse:
+    """Enqueue a job, or return the job already serving an identical request.
+
+    Args:
+        kind: Registered job kind.
+        payload: JSON-serializable handler arguments.
+        user_id: Owner of the job; None makes it visible to every user.
+        dedup_key: Requests of the same kind with the same key share one job
+            while it is queued or running and for settings.jobs_dedup_ttl_seconds
+            after it succeeded.
+
+    Returns:
+        State of the new (or deduplicated) job.
+
+    Raises:
+        ValueError: If the job kind is not registered.
+    """
+    if kind not in _kinds:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    redis = _get_redis()
+    job_id = uuid.uuid4().hex
+    now = _now()
+    await redis.hset(
+        _job_key(job_id),
+        mapping={
+            "kind": kind,
+            "user_id": "" if user_id is None else user_id,
+            "status": JobStatus.QUEUED.value,
+            "progress": 0,
+            "payload": json.dumps(payload),
+            "dedup": dedup_key or "",
+            "created_at": now,
+            "updated_at": now,
+        },
+    )
+    await redis.expire(_job_key(job_id), settings.jobs_result_ttl_seconds)
+
+    if dedup_key is not None:
+        key = _dedup_key(kind, dedup_key)
+        claimed = await redis.set(
+            key, job_id, nx=True, ex=settings.jobs_result_ttl_seconds
+        )
+        if not claimed:
+            existing_id = _decode(await redis.get(key))
+            existing = await get_job(existing_id) if existing_id else None
+            if existing is not None:
+                await redis.delete(_job_key(job_id))
+                JOBS_DEDUPLICATED_TOTAL.labels(kind=kind).inc()
+                return existing[0]
+            # The job the key pointed to has expired; take the key over
+            await redis.set(key, job_id, ex=settings.jobs_result_ttl_seconds)
+
+    await redis.lpush(QUEUE_KEY, job_id)
+    logger.info("Enqueued %s job %s", kind, job_id)
+    result = await get_job(job_id)
+    assert result is not None
+    return result[0]
+
+
+async def run_job(job_id: str) -> None:
+    """Run one job and record its outcome (errors are stored, not raised).
+
+    Args:
+        job_id: ID of a queued job.
+    """
+    redis = _get_redis()
+    data = await redis.hgetall(_job_key(job_id))
+    if not data:
+        logger.warning("Job %s expired before it could run", job_id)
+        return
+    fields = {_decode(k): _decode(v) for k, v in data.items()}
+    kind_name = fields["kind"]
+    kind = _kinds.get(kind_name)
+    if kind is None:
+        await _update_job(
+            redis,
+            job_id,
+            status=JobStatus.FAILED.value,
+            error=f"Unknown job kind: {kind_name}",
+        )
+        return
+
+    async def report_progress(percent: int, message: str) -> None:
+        await _update_job(redis, job_id, progress=percent, message=message)
+
+    async with kind.semaphore:
+        await _update_job(redis, job_id, status=JobStatus.RUNNING.value)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                kind.handler(json.loads(fields["payload"]), report_progress),
+                timeout=settings.jobs_timeout_seconds,
+            )
+        except Exception as e:
+            status = JobStatus.FAILED
+            error = str(getattr(e, "detail", None) or e) or type(e).__name__
+            logger.exception("%s job %s failed", kind_name, job_id)
+            await _update_job(redis, job_id, status=status.value, error=error)
+        else:
+            status = JobStatus.SUCCEEDED
+            await _update_job(
+                redis,
+                job_id,
+                status=status.value,
+                progress=100,
+                result=json.dumps(result, default=str),
+            )
+        finally:
+            JOB_DURATION_SECONDS.labels(kind=kind_name).observe(
+                time.perf_counter() - start
+            )
+
+    JOBS_TOTAL.labels(kind=kind_name, status=status.value).inc()
+    if fields.get("dedup"):
+        key = _dedup_key(kind_name, fields["dedup"])
+        if status is JobStatus.SUCCEEDED:
+            # Identical requests keep getting this result for a short while
+            await redis.expire(key, settings.jobs_dedup_ttl_seconds)
+        elif _decode(await redis.get(key)) == job_id:
+            # Let the next request retry right away
+            await redis.delete(key)
+
+
+async def run_pending_jobs() -> int:
+    """Run queued jobs in the current task until the queue is empty.
+
+    Used by tests and by tooling that processes the queue without workers.
+
+    Returns:
+        Number of jobs run.
+    """
+    redis = _get_redis()
+    count = 0
+    while (job_id := _decode(await redis.rpop(QUEUE_KEY))) is not None:
+        await run_job(job_id)
+        count += 1
+    return count
+
+
+async def _worker(number: int) -> None:
+    """Pop and run jobs forever."""
+    redis = _get_redis()
+    while True:
+        try:
+            item = await redis.brpop(
+                [QUEUE_KEY], timeout=settings.jobs_poll_timeout_seconds
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Job worker %d could not poll the queue", number)
+            await asyncio.sleep(settings.jobs_poll_timeout_seconds)
+            continue
+        if item is None:
+            continue
+        job_id = _decode(item[1])
+        try:
+            await run_job(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # run_job stores handler errors itself; this is Redis failing
+            # around them. The id is already off the queue, so fail the job
+            # rather than leave it queued forever, and keep the worker alive.
+            logger.exception("Job worker %d could not run job %s", number, job_id)
+            with contextlib.suppress(Exception):
+                await _update_job(
+                    redis,
+                    job_id,
+                    status=JobStatus.FAILED.value,
+                    error="Internal error while running the job",
+                )
+
+
+async def start_job_workers() -> None:
+    """Start the job worker tasks.
+
+    Does nothing if background_jobs_enabled is False.
+    """
+    if not settings.background_jobs_enabled:
+        return
+    # Register the job kinds
+    import src.tasks.sync_jobs  # noqa: F401
+
+    _workers.extend(
+        asyncio.create_task(_worker(i), name=f"job-worker-{i}")
+        for i in range(settings.jobs_worker_concurrency)
+    )
+    logger.info("Started %d background job workers", len(_workers))
+
+
+async def stop_job_workers() -> None:
+    """Cancel the job workers and close the Redis connection."""
+    global _redis
+    for task in _workers:
+        task.cancel()
+    for task in _workers:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    _workers.clear()
+
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,92 @@
+"""Background jobs for upstream syncs (schedule refresh, LK sync)."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.config import settings
+from src.database import get_session_maker
+from src.scheduler import schedule_sync_lock
+from src.schemas.job import JobResponse
+from src.services import lk as lk_service
+from src.services import schedule as schedule_service
+from src.tasks.queue import ProgressCallback, enqueue_job, register_job
+
+SCHEDULE_REFRESH_JOB = "schedule_refresh"
+LK_SYNC_JOB = "lk_sync"
+
+
+@register_job(SCHEDULE_REFRESH_JOB, concurrency=1)
+async def _refresh_schedule(
+    payload: dict[str, Any], progress: ProgressCallback
+) -> dict[str, Any]:
+    """Parse the schedule and apply changes (POST /schedule/refresh).
+
+    Like the synchronous endpoint, only the default group is refreshed: it
+    is the group users see (see src.services.schedule_scope). The other
+    groups in settings.schedule_group_ids are kept up to date by the
+    periodic sync_all_groups() in the scheduler.
+
+    Takes the scheduler's sync lock; the job fails right away if another
+    sync (scheduled, or a refresh in another worker) holds it.
+    """
+    async with schedule_sync_lock() as acquired:
+        if not acquired:
+            # Running alongside it could insert the same entries twice
+            raise RuntimeError("Another schedule sync is running, try again later")
+        await progress(10, "Fetching schedule")
+        async with get_session_maker()() as db:
+            result = await schedule_service.sync_schedule(db, force=payload["force"])
+    if not result["success"]:
+        raise RuntimeError(result.get("message", "Schedule refresh failed"))
+    return dict(result)
+
+
+@register_job(LK_SYNC_JOB, concurrency=settings.jobs_lk_sync_concurrency)
+async def _sync_lk(
+    payload: dict[str, Any], progress: ProgressCallback
+) -> dict[str, Any]:
+    """Sync a user's grades and disciplines from LK (POST /lk/sync)."""
+    user_id = payload["user_id"]
+    async with get_session_maker()() as db:
+        grades_count, disciplines_count = await lk_service.sync_from_lk(
+            db, user_id, progress
+        )
+        creds = await lk_service.get_credentials(db, user_id)
+    return {
+        "grades_synced": grades_count,
+        "disciplines_synced": disciplines_count,
+        "last_sync_at": creds.last_sync_at.isoformat() if creds else None,
+    }
+
+
+async def enqueue_schedule_refresh(user_id: int, force: bool) -> JobResponse:
+    """Enqueue a schedule refresh shared by everyone asking at the same time.
+
+    Args:
+        user_id: User requesting the refresh (for logging only; the job is
+            visible to every user).
+        force: Force update even if content hash is unchanged.
+
+    Returns:
+        State of the refresh job.
+    """
+    return await enqueue_job(
+        SCHEDULE_REFRESH_JOB,
+        {"force": force, "requested_by": user_id},
+        dedup_key=f"force={force}",
+    )
+
+
+async def enqueue_lk_sync(user_id: int) -> JobResponse:
+    """Enqueue an LK sync of a user (one at a time per user).
+
+    Args:
+        user_id: User whose LK data is synced.
+
+    Returns:
+        State of the sync job.
+    """
+    return await enqueue_job(
+        LK_SYNC_JOB, {"user_id": user_id}, user_id=user_id, dedup_key=str(user_id)
+    )
@@ -1,11 +1,17 @@
 """Cryptographic utilities for credential encryption.
 
 Uses Fernet symmetric encryption with key derived from SECRET_KEY via PBKDF2HMAC.
+Derived keys are cached per process and per secret, so the expensive KDF runs
+once instead of on every encrypt/decrypt call. Old secrets listed in
+PREVIOUS_SECRET_KEYS stay readable through a MultiFernet keyring, which makes
+SECRET_KEY rotation possible without losing stored credentials.
 """
 
+import asyncio
 import base64
+from functools import lru_cache
 
-from cryptography.fernet import Fernet, InvalidToken
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
@@ -15,6 +21,12 @@ from src.config import settings
 # Combined with SECRET_KEY provides unique encryption key
 APP_SALT = b"studyhelper-lk-credentials-v1"
 
+# PBKDF2HMAC iterations (Django 2025 recommendation)
+KDF_ITERATIONS = 1_200_000
+
+# Built keyrings, keyed by the tuple of secrets they were derived from
+_keyrings: dict[tuple[str, ...], MultiFernet] = {}
+
 
 class CryptoError(Exception):
     """Exception for cryptographic operation errors."""
@@ -22,23 +34,67 @@ class CryptoError(Exception):
     pass
 
 
-def get_fernet() -> Fernet:
-    """Get Fernet instance using SECRET_KEY + PBKDF2.
+@lru_cache(maxsize=8)
+def derive_key(secret: str) -> bytes:
+    """Derive a Fernet key from a secret using PBKDF2.
 
-    Uses PBKDF2HMAC with 1,200,000 iterations (Django 2025 recommendation).
     Source: https://cryptography.io/en/latest/fernet/
 
+    Args:
+        secret: Application secret.
+
     Returns:
-        Fernet instance for encryption/decryption.
+        URL-safe base64-encoded 32-byte key.
     """
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=APP_SALT,
-        iterations=1_200_000,
+        iterations=KDF_ITERATIONS,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(settings.secret_key.encode()))
-    return Fernet(key)
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+
+def _keyring_secrets() -> tuple[str, ...]:
+    """Get secrets for the keyring, current SECRET_KEY first."""
+    previous = [s for s in settings.previous_secret_keys if s != settings.secret_key]
+    return (settings.secret_key, *previous)
+
+
+def _build_keyring(secrets: tuple[str, ...]) -> MultiFernet:
+    """Build (or reuse) a keyring for the given secrets."""
+    keyring = _keyrings.get(secrets)
+    if keyring is None:
+        keyring = MultiFernet([Fernet(derive_key(s)) for s in secrets])
+        _keyrings[secrets] = keyring
+    return keyring
+
+
+def get_fernet() -> MultiFernet:
+    """Get the credential keyring.
+
+    The first key (from SECRET_KEY) is used for encryption; all keys are
+    tried for decryption. Keys are derived once per process.
+
+    Returns:
+        MultiFernet instance for encryption/decryption.
+    """
+    return _build_keyring(_keyring_secrets())
+
+
+async def load_fernet() -> MultiFernet:
+    """Get the credential keyring, deriving missing keys in a worker thread.
+
+    Use from async code so a cold cache never blocks the event loop.
+
+    Returns:
+        MultiFernet instance for encryption/decryption.
+    """
+    secrets = _keyring_secrets()
+    keyring = _keyrings.get(secrets)
+    if keyring is not None:
+        return keyring
+    return await asyncio.to_thread(_build_keyring, secrets)
 
 
 def encrypt_credential(value: str) -> str:
@@ -0,0 +1,97 @@
+"""Conditional GET helpers (ETag / If-None-Match / If-Modified-Since)."""
+
+import hashlib
+from email.utils import parsedate_to_datetime
+
+from fastapi import Request
+from starlette.responses import Response
+
+# Clients may store responses but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: str | bytes) -> str:
+    """Build a strong ETag from version strings or a response body.
+
+    Args:
+        parts: Values that together identify the representation.
+
+    Returns:
+        Quoted ETag value.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match matches an ETag.
+
+    Uses weak comparison as required for If-None-Match (RFC 9110 13.1.2).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Evaluate the request's validators against the current representation.
+
+    If-Modified-Since is only considered without If-None-Match
+    (RFC 9110 13.2.2).
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag.
+        last_modified: Modification time as a Unix timestamp.
+
+    Returns:
+        True if a 304 should be sent.
+    """
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if not since:
+        return False
+    try:
+        since_ts = parsedate_to_datetime(since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(last_modified) <= since_ts
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def json_response(request: Request, body: bytes, etag: str | None = None) -> Response:
+    """Return a JSON body with an ETag, or 304 if the client already has it.
+
+    Args:
+        request: Incoming request.
+        body: Serialized JSON body.
+        etag: Precomputed ETag; derived from the body if omitted.
+
+    Returns:
+        200 response with the body, or 304 without it.
+    """
+    if etag is None:
+        etag = make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,81 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque URL-safe token holding the sort key of the last item
+of a page. The next page continues strictly after it, so the cost of a page
+does not depend on how deep the client has scrolled (unlike OFFSET).
+"""
+
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any
+
+from sqlalchemy import ColumnElement, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from starlette.responses import Response
+
+# Response header carrying the cursor of the next page (absent on the last one)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+CursorValue = date | time | datetime | int
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """Encode sort key values into an opaque cursor.
+
+    Args:
+        values: Sort key of the last item, in ORDER BY order.
+
+    Returns:
+        URL-safe cursor token.
+    """
+    payload = [v if isinstance(v, int) else v.isoformat() for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type[CursorValue]) -> tuple[Any, ...]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor token from the client.
+        types: Expected type of each sort key value.
+
+    Returns:
+        Tuple of decoded values.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the types.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError
+        return tuple(
+            int(value) if kind is int else kind.fromisoformat(value)
+            for kind, value in zip(types, payload, strict=True)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def after_cursor(
+    columns: tuple[InstrumentedAttribute, ...], values: tuple[Any, ...]
+) -> ColumnElement[bool]:
+    """Build the keyset condition for a descending sort on the columns.
+
+    Args:
+        columns: Sort columns, in ORDER BY order (all descending).
+        values: Decoded cursor values.
+
+    Returns:
+        Row-value comparison selecting items after the cursor.
+    """
+    return tuple_(*columns) < tuple_(*values)
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    """Expose the next page cursor in the response headers."""
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,11 +1,18 @@
 """Security utilities for password hashing and JWT tokens."""
 
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 
 import bcrypt
 import jwt
 
 from src.config import settings
+from src.metrics import PASSWORD_HASH_QUEUE_WAIT_SECONDS
+
+_password_executor: ThreadPoolExecutor | None = None
 
 
 def hash_password(password: str) -> str:
@@ -22,6 +29,47 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def _get_password_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded executor for bcrypt work."""
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            thread_name_prefix="bcrypt",
+        )
+    return _password_executor
+
+
+async def _run_password_job[T](func: Callable[..., T], *args: str) -> T:
+    """Run a bcrypt call on the password executor, recording queue wait time."""
+    enqueued_at = time.perf_counter()
+
+    def job() -> T:
+        PASSWORD_HASH_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - enqueued_at)
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_executor(), job)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password using bcrypt without blocking the event loop."""
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+def shutdown_password_executor() -> None:
+    """Shut down the bcrypt executor (called on application shutdown)."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -31,7 +79,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         expire = datetime.now(UTC) + timedelta(
             minutes=settings.access_token_expire_minutes
         )
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.now(UTC), "type": "access"})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
@@ -42,7 +90,7 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
         expire = datetime.now(UTC) + expires_delta
     else:
         expire = datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": datetime.now(UTC), "type": "refresh"})
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
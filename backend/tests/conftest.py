@@ -7,12 +7,111 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from src.database import get_db
 from src.main import app
 from src.models.base import Base
+from src.parser.http_pool import close_upstream_client
+from src.services.user_cache import clear_user_cache
 from src.utils.rate_limit import limiter
 
 # Use SQLite in-memory for tests (avoids Windows PostgreSQL issues)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis (bytes responses)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, object] = {}
+
+    @staticmethod
+    def _b(value: object) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: object, ex: int | None = None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._b(value)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        return key in self.data
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = int(self.data.get(key, b"0")) + amount
+        self.data[key] = self._b(value)
+        return value
+
+    async def hget(self, key: str, field: str) -> bytes | None:
+        return self.data.get(key, {}).get(self._b(field))
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.data.get(key, {}))
+
+    async def hset(self, key: str, field=None, value=None, mapping=None) -> int:
+        bucket = self.data.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        for f, v in items.items():
+            bucket[self._b(f)] = self._b(v)
+        return len(items)
+
+    async def hsetnx(self, key: str, field: str, value: object) -> bool:
+        bucket = self.data.setdefault(key, {})
+        if self._b(field) in bucket:
+            return False
+        bucket[self._b(field)] = self._b(value)
+        return True
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        bucket = self.data.setdefault(key, {})
+        value = int(bucket.get(self._b(field), b"0")) + amount
+        bucket[self._b(field)] = self._b(value)
+        return value
+
+    async def lpush(self, key: str, *values: object) -> int:
+        items = self.data.setdefault(key, [])
+        for value in values:
+            items.insert(0, self._b(value))
+        return len(items)
+
+    async def rpop(self, key: str) -> bytes | None:
+        items = self.data.get(key) or []
+        return items.pop() if items else None
+
+    async def brpop(self, keys: list[str], timeout: float = 0):
+        for key in keys:
+            value = await self.rpop(key)
+            if value is not None:
+                return key.encode(), value
+        return None
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """In-memory Redis replacement for cache tests."""
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def _clear_user_cache():
+    """Drop cached users so ids reused across test databases don't leak."""
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+
+@pytest.fixture(autouse=True)
+async def _close_upstream_client():
+    """Close the shared upstream pool, which is bound to each test's loop."""
+    yield
+    await close_upstream_client()
+
+
 @pytest.fixture(scope="function")
 async def engine():
     """Create test database engine."""
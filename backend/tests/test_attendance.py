@@ -1,9 +1,16 @@
 """Tests for attendance (absences) endpoints."""
 
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models.attendance import AttendanceAggregate
 
 
 def _past_entry(subject_name: str = "Математический анализ", **kwargs) -> dict:
@@ -239,6 +246,161 @@ class TestMarkPresent:
         assert response.status_code == 401
 
 
+class TestMarkAttendanceBatch:
+    """Tests for POST /api/v1/attendance/batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_marks_and_unmarks(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test absences are added and removed in one request."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        ids = [
+            await _create_entry(client, auth_headers, _past_entry(f"Subject {i}"))
+            for i in range(3)
+        ]
+        await client.post(
+            "/api/v1/attendance/mark-absent",
+            json={"schedule_entry_id": ids[2]},
+            headers=auth_headers,
+        )
+
+        response = await client.post(
+            "/api/v1/attendance/batch",
+            json={
+                "items": [
+                    {"schedule_entry_id": ids[0], "absent": True},
+                    {"schedule_entry_id": ids[1], "absent": True},
+                    {"schedule_entry_id": ids[2], "absent": False},
+                ]
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"marked_absent": 2, "marked_present": 1}
+        entries = (
+            await client.get(
+                f"/api/v1/attendance/?semester_id={sem_id}", headers=auth_headers
+            )
+        ).json()
+        absent = {e["id"] for e in entries if e["is_absent"]}
+        assert absent == {ids[0], ids[1]}
+
+    @pytest.mark.asyncio
+    async def test_batch_is_idempotent(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test re-applying the same states changes nothing and does not fail."""
+        entry_id = await _create_entry(client, auth_headers, _past_entry())
+        body = {"items": [{"schedule_entry_id": entry_id, "absent": True}]}
+
+        await client.post("/api/v1/attendance/batch", json=body, headers=auth_headers)
+        response = await client.post(
+            "/api/v1/attendance/batch", json=body, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"marked_absent": 0, "marked_present": 0}
+
+    @pytest.mark.asyncio
+    async def test_batch_unknown_entry_applies_nothing(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test one unknown entry rejects the whole batch with 404."""
+        entry_id = await _create_entry(client, auth_headers, _past_entry())
+
+        response = await client.post(
+            "/api/v1/attendance/batch",
+            json={
+                "items": [
+                    {"schedule_entry_id": entry_id, "absent": True},
+                    {"schedule_entry_id": 99999, "absent": True},
+                ]
+            },
+            headers=auth_headers,
+        )
+        retry = await client.post(
+            "/api/v1/attendance/mark-absent",
+            json={"schedule_entry_id": entry_id},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 404
+        assert "99999" in response.json()["detail"]
+        assert retry.status_code == 201
+
+    @pytest.mark.asyncio
+    async def test_batch_future_lesson_400(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a future lesson cannot be marked absent in a batch."""
+        entry_id = await _create_entry(client, auth_headers, _future_entry())
+
+        response = await client.post(
+            "/api/v1/attendance/batch",
+            json={"items": [{"schedule_entry_id": entry_id, "absent": True}]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+        assert "future" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_batch_conflicting_states_400(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test the same entry cannot be both absent and present."""
+        entry_id = await _create_entry(client, auth_headers, _past_entry())
+
+        response = await client.post(
+            "/api/v1/attendance/batch",
+            json={
+                "items": [
+                    {"schedule_entry_id": entry_id, "absent": True},
+                    {"schedule_entry_id": entry_id, "absent": False},
+                ]
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_batch_statement_count_is_constant(
+        self, client: AsyncClient, auth_headers: dict[str, str], engine
+    ) -> None:
+        """Test the number of statements does not grow with the batch size."""
+        from src.services.attendance import mark_attendance_batch
+
+        ids = [
+            await _create_entry(client, auth_headers, _past_entry(f"Subject {i}"))
+            for i in range(12)
+        ]
+
+        async def count_statements(marks: list[tuple[int, bool]]) -> int:
+            statements: list[str] = []
+
+            def record(conn, cursor, statement, *args) -> None:
+                statements.append(statement)
+
+            async with AsyncSession(engine) as db:
+                event.listen(engine.sync_engine, "before_cursor_execute", record)
+                try:
+                    await mark_attendance_batch(db, 1, marks)
+                finally:
+                    event.remove(engine.sync_engine, "before_cursor_execute", record)
+            return len(statements)
+
+        small = await count_statements([(ids[0], True), (ids[1], False)])
+        large = await count_statements(
+            [(i, True) for i in ids[2:8]] + [(i, False) for i in ids[8:]]
+        )
+
+        # Validation + INSERT + DELETE + aggregate invalidation
+        assert small == large == 4
+
+
 class TestGetAttendance:
     """Tests for GET /api/v1/attendance/."""
 
@@ -363,6 +525,78 @@ class TestGetAttendance:
         data2 = response2.json()
         assert len(data2) == 2
 
+    @pytest.mark.asyncio
+    async def test_get_entries_cursor_pagination(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test cursor pages cover all entries once, ties broken by id."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+
+        # Same date and start time: order falls back to id
+        ids = [
+            await _create_entry(client, auth_headers, _past_entry(f"Subject {i}"))
+            for i in range(5)
+        ]
+        await _create_entry(
+            client,
+            auth_headers,
+            _past_entry(
+                "Earlier",
+                lesson_date=str(date.today() - timedelta(days=2)),
+            ),
+        )
+
+        seen: list[int] = []
+        url = f"/api/v1/attendance/?semester_id={sem_id}&limit=2"
+        cursor = None
+        for _ in range(3):
+            query = url if cursor is None else f"{url}&cursor={cursor}"
+            response = await client.get(query, headers=auth_headers)
+            assert response.status_code == 200
+            seen.extend(e["id"] for e in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            assert cursor is not None
+
+        last = await client.get(f"{url}&cursor={cursor}", headers=auth_headers)
+        assert last.status_code == 200
+        assert last.json() == []
+        assert "X-Next-Cursor" not in last.headers
+
+        assert seen[:5] == sorted(ids, reverse=True)
+        assert len(seen) == len(set(seen)) == 6
+
+    @pytest.mark.asyncio
+    async def test_get_entries_last_page_has_no_cursor(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a short page does not advertise a next cursor."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+
+        response = await client.get(
+            f"/api/v1/attendance/?semester_id={sem_id}&limit=2",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_get_entries_invalid_cursor_400(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a malformed cursor is rejected."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+
+        response = await client.get(
+            f"/api/v1/attendance/?semester_id={sem_id}&cursor=not-a-cursor",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
     @pytest.mark.asyncio
     async def test_get_entries_no_auth(self, client: AsyncClient) -> None:
         """Test getting entries without authentication returns 401."""
@@ -482,6 +716,32 @@ class TestGetStats:
         assert data["attended"] == 1
         assert data["attendance_percent"] == 50.0
 
+    @pytest.mark.asyncio
+    async def test_stats_etag(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test stats honour If-None-Match until the data changes."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        entry_id = await _create_entry(client, auth_headers, _past_entry())
+        url = f"/api/v1/attendance/stats?semester_id={sem_id}"
+
+        first = await client.get(url, headers=auth_headers)
+        etag = first.headers["etag"]
+        conditional = {**auth_headers, "If-None-Match": etag}
+
+        response = await client.get(url, headers=conditional)
+        assert response.status_code == 304
+        assert response.content == b""
+
+        await client.post(
+            "/api/v1/attendance/mark-absent",
+            json={"schedule_entry_id": entry_id},
+            headers=auth_headers,
+        )
+        response = await client.get(url, headers=conditional)
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
     @pytest.mark.asyncio
     async def test_stats_with_planned_classes(
         self, client: AsyncClient, auth_headers: dict[str, str]
@@ -635,3 +895,187 @@ class TestGetSubjectStats:
         )
 
         assert response.status_code == 404
+
+
+class TestAttendanceStatsQueries:
+    """Tests for the single-query and materialized stats paths."""
+
+    @pytest.mark.asyncio
+    async def test_stats_single_query(
+        self, client: AsyncClient, auth_headers: dict[str, str], engine
+    ) -> None:
+        """Test totals and breakdown are computed by one statement."""
+        from src.services.attendance import get_attendance_stats
+
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+        await _create_entry(client, auth_headers, _past_entry("Физика"))
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        async with AsyncSession(engine) as db:
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+            try:
+                stats = await get_attendance_stats(db, user_id=1, semester_id=sem_id)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        # Semester lookup + stats query
+        assert len(statements) == 2
+        assert stats["total_completed"] == 2
+        assert [s["subject_name"] for s in stats["by_subject"]] == [
+            "Математический анализ",
+            "Физика",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_aggregates_match_live_stats(
+        self, client: AsyncClient, auth_headers: dict[str, str], db_session
+    ) -> None:
+        """Test materialized stats stay equal to live ones across changes."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        entry_id = await _create_entry(client, auth_headers, _past_entry())
+        await _create_entry(client, auth_headers, _past_entry("Физика"))
+        url = f"/api/v1/attendance/stats?semester_id={sem_id}"
+
+        async def both() -> tuple[dict, dict]:
+            live = (await client.get(url, headers=auth_headers)).json()
+            with patch.object(settings, "attendance_aggregates_enabled", True):
+                cached = (await client.get(url, headers=auth_headers)).json()
+            return live, cached
+
+        live, cached = await both()
+        assert cached == live
+
+        await client.post(
+            "/api/v1/attendance/mark-absent",
+            json={"schedule_entry_id": entry_id},
+            headers=auth_headers,
+        )
+        aggregate = await db_session.scalar(
+            select(AttendanceAggregate).where(
+                AttendanceAggregate.subject_name == "Математический анализ"
+            )
+        )
+        assert aggregate.absences == 1  # updated in place, not rebuilt
+        live, cached = await both()
+        assert cached == live
+        assert cached["absences"] == 1
+
+        await client.post(
+            "/api/v1/attendance/mark-present",
+            json={"schedule_entry_id": entry_id},
+            headers=auth_headers,
+        )
+        live, cached = await both()
+        assert cached == live
+        assert cached["absences"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_aggregates_rebuilt_in_place(
+        self, client: AsyncClient, auth_headers: dict[str, str], db_session
+    ) -> None:
+        """Test a stale rebuild upserts the per-subject rows, one per subject."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+        await _create_entry(client, auth_headers, _past_entry("Физика"))
+        url = f"/api/v1/attendance/stats?semester_id={sem_id}"
+
+        with patch.object(settings, "attendance_aggregates_enabled", True):
+            await client.get(url, headers=auth_headers)
+            ids = set(await db_session.scalars(select(AttendanceAggregate.id)))
+            await db_session.execute(
+                update(AttendanceAggregate).values(
+                    as_of=date.today() - timedelta(days=1)
+                )
+            )
+            await db_session.commit()
+
+            response = await client.get(url, headers=auth_headers)
+
+        assert response.json()["total_completed"] == 2
+        db_session.expire_all()
+        rows = (await db_session.scalars(select(AttendanceAggregate))).all()
+        assert {row.id for row in rows} == ids
+        assert all(row.as_of == date.today() for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_aggregate_key_is_unique(
+        self, client: AsyncClient, auth_headers: dict[str, str], db_session
+    ) -> None:
+        """Test a second row for the same subject is rejected."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+        with patch.object(settings, "attendance_aggregates_enabled", True):
+            await client.get(
+                f"/api/v1/attendance/stats?semester_id={sem_id}", headers=auth_headers
+            )
+        stored = await db_session.scalar(select(AttendanceAggregate))
+
+        db_session.add(
+            AttendanceAggregate(
+                user_id=stored.user_id,
+                semester_id=stored.semester_id,
+                subject_name=stored.subject_name,
+                subject_id=None,
+                completed=0,
+                absences=0,
+                start_date=stored.start_date,
+                end_date=stored.end_date,
+                as_of=stored.as_of,
+            )
+        )
+        with pytest.raises(IntegrityError):
+            await db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_schedule_change_invalidates_aggregates(
+        self, client: AsyncClient, auth_headers: dict[str, str], db_session
+    ) -> None:
+        """Test editing the schedule drops materialized counts."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+        url = f"/api/v1/attendance/stats?semester_id={sem_id}"
+
+        with patch.object(settings, "attendance_aggregates_enabled", True):
+            await client.get(url, headers=auth_headers)
+            assert await db_session.scalar(select(AttendanceAggregate.id))
+
+            await _create_entry(client, auth_headers, _past_entry("Физика"))
+            assert await db_session.scalar(select(AttendanceAggregate.id)) is None
+
+            response = await client.get(url, headers=auth_headers)
+
+        assert response.json()["total_completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unrelated_schedule_changes_keep_aggregates(
+        self, client: AsyncClient, auth_headers: dict[str, str], db_session, engine
+    ) -> None:
+        """Test only changes to counted lessons drop materialized counts."""
+        sem_id = await _create_semester_with_dates(client, auth_headers)
+        await _create_entry(client, auth_headers, _past_entry())
+        url = f"/api/v1/attendance/stats?semester_id={sem_id}"
+        with patch.object(settings, "attendance_aggregates_enabled", True):
+            await client.get(url, headers=auth_headers)
+
+            # Lessons from today on are counted live, not materialized
+            await _create_entry(client, auth_headers, _future_entry())
+            assert await db_session.scalar(select(AttendanceAggregate.id))
+
+        # Invalidation is skipped entirely while aggregates are disabled
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await _create_entry(client, auth_headers, _past_entry("Физика"))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert not any("attendance_aggregates" in sql for sql in statements)
@@ -283,3 +283,56 @@ class TestSettings:
         assert data["preferred_subgroup"] == 2
         assert data["theme_mode"] == "light"
         assert "preferred_pe_teacher" in data
+
+
+class TestPasswordHashingAsync:
+    """Tests for bcrypt offloaded to the password executor."""
+
+    async def test_hash_and_verify_roundtrip(self):
+        """Test async hash can be verified by both variants."""
+        from src.utils.security import (
+            hash_password_async,
+            verify_password,
+            verify_password_async,
+        )
+
+        hashed = await hash_password_async("s3cret-password")
+
+        assert verify_password("s3cret-password", hashed)
+        assert await verify_password_async("s3cret-password", hashed)
+        assert not await verify_password_async("wrong-password", hashed)
+
+    async def test_runs_outside_event_loop_thread(self):
+        """Test bcrypt work runs on a dedicated worker thread."""
+        import threading
+        from unittest.mock import patch
+
+        from src.utils import security
+
+        seen: list[str] = []
+
+        def fake_hash(password: str) -> str:
+            seen.append(threading.current_thread().name)
+            return "hashed"
+
+        with patch.object(security, "hash_password", fake_hash):
+            assert await security.hash_password_async("x") == "hashed"
+
+        assert seen[0].startswith("bcrypt")
+
+    async def test_queue_wait_metric_observed(self):
+        """Test each job records its queue wait time."""
+        from src.metrics import PASSWORD_HASH_QUEUE_WAIT_SECONDS
+        from src.utils.security import hash_password_async
+
+        def observed() -> float:
+            for metric in PASSWORD_HASH_QUEUE_WAIT_SECONDS.collect():
+                for sample in metric.samples:
+                    if sample.name.endswith("_count"):
+                        return sample.value
+            return 0.0
+
+        before = observed()
+        await hash_password_async("metric-password")
+
+        assert observed() == before + 1
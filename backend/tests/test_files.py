@@ -1,13 +1,17 @@
 """Tests for file management router."""
 
+import hashlib
 import io
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from fastapi import HTTPException, UploadFile
 from httpx import AsyncClient
 
 from src.config import settings
+from src.services.preview import render_preview
+from src.services.upload import FILE_CHUNK_SIZE, spool_upload
 
 
 async def _create_semester(client: AsyncClient, headers: dict[str, str]) -> int:
@@ -57,6 +61,18 @@ def _gif_content() -> bytes:
     return b"GIF89a" + b"\x00" * 100
 
 
+async def _upload_pdf(client: AsyncClient, headers: dict[str, str]) -> int:
+    """Helper to upload a PDF (upload_dir must be patched) and return its ID."""
+    resp = await client.post(
+        "/api/v1/files/upload",
+        files={"file": ("notes.pdf", io.BytesIO(_pdf_content()), "application/pdf")},
+        data={"category": "lecture"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
 class TestUploadFile:
     """Tests for POST /api/v1/files/upload."""
 
@@ -218,6 +234,64 @@ class TestUploadFile:
 
         assert response.status_code == 400
         assert "content does not match" in response.json()["detail"]
+        assert list((tmp_path / "files").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_upload_too_large_leaves_no_temp_file(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test a rejected upload removes its partially written temp file."""
+        content = b"%PDF-1.4" + b"\x00" * (2 * 1024 * 1024)
+
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch.object(settings, "max_file_size_mb", 1),
+        ):
+            response = await client.post(
+                "/api/v1/files/upload",
+                files={"file": ("big.pdf", io.BytesIO(content), "application/pdf")},
+                data={"category": "textbook"},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 400
+        assert list((tmp_path / "files").iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_streams_and_hashes(self, tmp_path: Path) -> None:
+        """Test a multi-chunk upload is written intact with its SHA-256."""
+        content = b"%PDF-1.4" + bytes(range(256)) * (FILE_CHUNK_SIZE // 64)
+        upload = UploadFile(io.BytesIO(content), filename="slides.pdf")
+
+        spooled = await spool_upload(upload, tmp_path, ".pdf", max_size_mb=1)
+
+        assert spooled.path.parent == tmp_path
+        assert spooled.path.read_bytes() == content
+        assert spooled.size == len(content)
+        assert spooled.sha256 == hashlib.sha256(content).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_rejects_empty_file(self, tmp_path: Path) -> None:
+        """Test an empty upload is rejected and nothing is left behind."""
+        upload = UploadFile(io.BytesIO(b""), filename="empty.pdf")
+
+        with pytest.raises(HTTPException):
+            await spool_upload(upload, tmp_path, ".pdf", max_size_mb=1)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_spool_upload_accepts_empty_unsigned_file(
+        self, tmp_path: Path
+    ) -> None:
+        """Test an empty upload passes when the extension has no signature."""
+        upload = UploadFile(io.BytesIO(b""), filename="empty.txt")
+
+        spooled = await spool_upload(upload, tmp_path, ".txt", max_size_mb=1)
+
+        assert spooled.size == 0
+        assert spooled.path.read_bytes() == b""
+        assert spooled.sha256 == hashlib.sha256(b"").hexdigest()
 
     @pytest.mark.asyncio
     async def test_upload_unauthorized(self, client: AsyncClient) -> None:
@@ -397,6 +471,90 @@ class TestDownloadFile:
         assert "notes.pdf" in response.headers.get("content-disposition", "")
         assert response.headers.get("content-type") == "application/pdf"
 
+    @pytest.mark.asyncio
+    async def test_download_range(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test a Range request returns 206 with the requested bytes."""
+        with patch.object(settings, "upload_dir", str(tmp_path)):
+            file_id = await _upload_pdf(client, auth_headers)
+            response = await client.get(
+                f"/api/v1/files/{file_id}/download",
+                headers={**auth_headers, "Range": "bytes=0-3"},
+            )
+
+        assert response.status_code == 206
+        assert response.content == b"%PDF"
+        assert response.headers["content-range"] == (f"bytes 0-3/{len(_pdf_content())}")
+
+    @pytest.mark.asyncio
+    async def test_download_stale_if_range_sends_full_file(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test a Range with an outdated If-Range validator returns 200."""
+        with patch.object(settings, "upload_dir", str(tmp_path)):
+            file_id = await _upload_pdf(client, auth_headers)
+            response = await client.get(
+                f"/api/v1/files/{file_id}/download",
+                headers={**auth_headers, "Range": "bytes=0-3", "If-Range": '"old"'},
+            )
+
+        assert response.status_code == 200
+        assert response.content == _pdf_content()
+
+    @pytest.mark.asyncio
+    async def test_download_conditional_304(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test revalidation by ETag and by Last-Modified returns 304."""
+        with patch.object(settings, "upload_dir", str(tmp_path)):
+            file_id = await _upload_pdf(client, auth_headers)
+            url = f"/api/v1/files/{file_id}/download"
+            first = await client.get(url, headers=auth_headers)
+            by_etag = await client.get(
+                url, headers={**auth_headers, "If-None-Match": first.headers["etag"]}
+            )
+            by_date = await client.get(
+                url,
+                headers={
+                    **auth_headers,
+                    "If-Modified-Since": first.headers["last-modified"],
+                },
+            )
+
+        assert first.status_code == 200
+        assert by_etag.status_code == 304
+        assert by_etag.content == b""
+        assert by_date.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_download_accel_redirect(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test downloads are handed off to nginx when a prefix is set."""
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch.object(settings, "files_accel_redirect_prefix", "/protected-files/"),
+        ):
+            upload_resp = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("notes.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "lecture"},
+                headers=auth_headers,
+            )
+            stored = upload_resp.json()["stored_filename"]
+            response = await client.get(
+                f"/api/v1/files/{upload_resp.json()['id']}/download",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.content == b""
+        assert response.headers["x-accel-redirect"] == f"/protected-files/{stored}"
+        assert "notes.pdf" in response.headers["content-disposition"]
+
     @pytest.mark.asyncio
     async def test_download_not_found(
         self, client: AsyncClient, auth_headers: dict[str, str]
@@ -416,6 +574,152 @@ class TestDownloadFile:
         assert response.status_code == 401
 
 
+class TestThumbnail:
+    """Tests for preview generation and GET /api/v1/files/{file_id}/thumbnail."""
+
+    @pytest.mark.asyncio
+    async def test_upload_schedules_preview(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test the preview is generated in the background after upload."""
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch(
+                "src.routers.files.generate_preview", new_callable=AsyncMock
+            ) as mock_preview,
+        ):
+            response = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("a.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "lecture"},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 201
+        mock_preview.assert_awaited_once_with(
+            response.json()["stored_filename"], "application/pdf"
+        )
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_served_with_long_cache(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test an existing preview is served as immutable WebP."""
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch("src.routers.files.generate_preview", new_callable=AsyncMock),
+        ):
+            upload_resp = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("a.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "lecture"},
+                headers=auth_headers,
+            )
+            stored = upload_resp.json()["stored_filename"]
+            (tmp_path / "files" / f"{stored}.preview.webp").write_bytes(b"RIFFwebp")
+
+            response = await client.get(
+                f"/api/v1/files/{upload_resp.json()['id']}/thumbnail",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.content == b"RIFFwebp"
+        assert response.headers["content-type"] == "image/webp"
+        assert "immutable" in response.headers["cache-control"]
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_not_available_404(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test a file without a renderable preview returns 404."""
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch(
+                "src.routers.files.generate_preview",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+        ):
+            file_id = await _upload_pdf(client, auth_headers)
+            response = await client.get(
+                f"/api/v1/files/{file_id}/thumbnail", headers=auth_headers
+            )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Preview not available"
+
+    @pytest.mark.asyncio
+    async def test_delete_last_reference_removes_preview(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test the preview goes away together with the stored file."""
+        with (
+            patch.object(settings, "upload_dir", str(tmp_path)),
+            patch("src.routers.files.generate_preview", new_callable=AsyncMock),
+        ):
+            upload_resp = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("a.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "lecture"},
+                headers=auth_headers,
+            )
+            preview = (
+                tmp_path / "files" / f"{upload_resp.json()['stored_filename']}"
+                ".preview.webp"
+            )
+            preview.write_bytes(b"RIFFwebp")
+
+            await client.delete(
+                f"/api/v1/files/{upload_resp.json()['id']}", headers=auth_headers
+            )
+
+        assert not preview.exists()
+
+    def test_render_image_preview(self, tmp_path: Path) -> None:
+        """Test an image is downscaled into a WebP preview."""
+        image_module = pytest.importorskip("PIL.Image")
+        source = tmp_path / "photo.png"
+        image_module.new("RGB", (2000, 1000), "white").save(source)
+        target = tmp_path / "photo.png.preview.webp"
+
+        render_preview(str(source), str(target), "image/png", max_px=480)
+
+        with image_module.open(target) as preview:
+            assert preview.format == "WEBP"
+            assert preview.size == (480, 240)
+
+    def test_render_preview_of_deleted_file_leaves_nothing(
+        self, tmp_path: Path
+    ) -> None:
+        """Test no preview is left if the original is deleted while rendering."""
+        image_module = pytest.importorskip("PIL.Image")
+        source = tmp_path / "photo.png"
+        image_module.new("RGB", (200, 100), "white").save(source)
+        save = image_module.Image.save
+
+        def save_then_delete_source(image, *args, **kwargs):
+            save(image, *args, **kwargs)
+            source.unlink()
+
+        with patch.object(image_module.Image, "save", save_then_delete_source):
+            rendered = render_preview(
+                str(source),
+                str(tmp_path / "photo.png.preview.webp"),
+                "image/png",
+                max_px=480,
+            )
+
+        assert rendered is False
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestDeleteFile:
     """Tests for DELETE /api/v1/files/{file_id}."""
 
@@ -454,6 +758,50 @@ class TestDeleteFile:
             list_resp = await client.get("/api/v1/files/", headers=auth_headers)
         assert len(list_resp.json()) == 0
 
+    @pytest.mark.asyncio
+    async def test_duplicate_uploads_share_stored_file(
+        self, client: AsyncClient, auth_headers: dict[str, str], tmp_path: Path
+    ) -> None:
+        """Test identical content is stored once and kept until the last delete."""
+        with patch.object(settings, "upload_dir", str(tmp_path)):
+            first = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("a.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "lecture"},
+                headers=auth_headers,
+            )
+            second = await client.post(
+                "/api/v1/files/upload",
+                files={
+                    "file": ("b.pdf", io.BytesIO(_pdf_content()), "application/pdf")
+                },
+                data={"category": "textbook"},
+                headers=auth_headers,
+            )
+            stored = first.json()["stored_filename"]
+            storage = tmp_path / "files"
+
+            assert second.json()["stored_filename"] == stored
+            assert stored == f"{hashlib.sha256(_pdf_content()).hexdigest()}.pdf"
+            assert [p.name for p in storage.iterdir()] == [stored]
+
+            await client.delete(
+                f"/api/v1/files/{first.json()['id']}", headers=auth_headers
+            )
+            assert (storage / stored).exists()
+
+            download = await client.get(
+                f"/api/v1/files/{second.json()['id']}/download", headers=auth_headers
+            )
+            assert download.content == _pdf_content()
+
+            await client.delete(
+                f"/api/v1/files/{second.json()['id']}", headers=auth_headers
+            )
+            assert not (storage / stored).exists()
+
     @pytest.mark.asyncio
     async def test_delete_not_found(
         self, client: AsyncClient, auth_headers: dict[str, str]
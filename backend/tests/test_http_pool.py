@@ -0,0 +1,133 @@
+"""Tests for the shared upstream HTTP pool."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from prometheus_client import REGISTRY
+
+from src.config import settings
+from src.parser import http_pool
+from src.parser.http_pool import (
+    borrow_upstream_client,
+    close_upstream_client,
+    get_upstream_client,
+)
+from src.parser.lk_parser import LkParser
+from src.parser.omsu_parser import OmsuScheduleParser
+
+BASE_URL = "https://eservice.omsu.ru"
+
+
+def _requests_total() -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "upstream_http_requests_total", {"http_version": "HTTP/1.1"}
+        )
+        or 0.0
+    )
+
+
+class TestUpstreamPool:
+    """Tests for the pool and the clients built on it."""
+
+    @pytest.mark.asyncio
+    async def test_pool_uses_configured_limits(self) -> None:
+        """Test the pool is built from the upstream_http_* settings."""
+        with (
+            patch.object(settings, "upstream_http_max_connections", 7),
+            patch.object(settings, "upstream_http_max_keepalive_connections", 3),
+            patch.object(settings, "upstream_http_keepalive_expiry_seconds", 12.5),
+        ):
+            get_upstream_client()
+
+        pool = http_pool._transport._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 12.5
+
+    @pytest.mark.asyncio
+    async def test_http2_disabled_without_h2(self) -> None:
+        """Test HTTP/2 falls back to HTTP/1.1 when h2 is not installed."""
+        with (
+            patch.object(settings, "upstream_http_http2", True),
+            patch.object(http_pool, "H2_AVAILABLE", False),
+        ):
+            get_upstream_client()
+
+        assert http_pool._transport._transport._pool._http2 is False
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused(self) -> None:
+        """Test callers get the same client until the pool is closed."""
+        first = get_upstream_client()
+        assert get_upstream_client() is first
+
+        await close_upstream_client()
+
+        assert get_upstream_client() is not first
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_borrowed_client_close_keeps_pool(self) -> None:
+        """Test closing a borrowed client does not close the shared pool."""
+        respx.get(f"{BASE_URL}/ping").mock(return_value=httpx.Response(200))
+
+        async with borrow_upstream_client() as client:
+            await client.get(f"{BASE_URL}/ping")
+        response = await get_upstream_client().get(f"{BASE_URL}/ping")
+
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_requests_counted(self) -> None:
+        """Test requests over the pool are recorded in the metrics."""
+        respx.get(f"{BASE_URL}/ping").mock(return_value=httpx.Response(200))
+        before = _requests_total()
+
+        await get_upstream_client().get(f"{BASE_URL}/ping")
+        async with borrow_upstream_client() as client:
+            await client.get(f"{BASE_URL}/ping")
+
+        assert _requests_total() - before == 2
+
+
+class TestParsersOnPool:
+    """Tests for the parsers borrowing from the pool."""
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_lk_parsers_share_pool_not_cookies(self) -> None:
+        """Test two LK sessions use the pool but keep their own cookies."""
+        respx.get(f"{BASE_URL}/sinfo/backend/myStudents").mock(
+            return_value=httpx.Response(
+                200, json=[], headers={"Set-Cookie": "JSESSIONID=alice; Path=/"}
+            )
+        )
+
+        async with LkParser() as alice, LkParser() as bob:
+            await alice.check_session()
+            pool = http_pool._transport
+
+            assert alice._client.cookies.get("JSESSIONID") == "alice"
+            assert bob._client.cookies.get("JSESSIONID") is None
+            assert alice._client._transport._transport is pool
+            assert bob._client._transport._transport is pool
+        assert http_pool._transport is pool
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_schedule_parser_uses_shared_client(self) -> None:
+        """Test the schedule parser fetches over the shared client."""
+        route = respx.get(OmsuScheduleParser.API_URL_TEMPLATE.format(group_id=1)).mock(
+            return_value=httpx.Response(200, json={"success": True, "data": []})
+        )
+
+        async with OmsuScheduleParser(group_id=1) as parser:
+            await parser.parse()
+        shared = get_upstream_client()
+
+        assert route.called
+        assert not shared.is_closed
@@ -0,0 +1,310 @@
+"""Tests for the background job queue and /jobs endpoints."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.parser.lk_parser import LkStudentData
+from src.tasks import queue
+from src.tasks.queue import enqueue_job, get_job, register_job, run_job
+
+
+@pytest.fixture
+def sync_lock():
+    """Scheduler sync lock (free unless a test sets acquire to False)."""
+    lock = AsyncMock()
+    lock.acquire = AsyncMock(return_value=True)
+    return lock
+
+
+@pytest.fixture(autouse=True)
+def jobs_enabled(fake_redis, engine, sync_lock):
+    """Enable background jobs on fake Redis and the test database."""
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    lock_redis = AsyncMock()
+    lock_redis.lock = MagicMock(return_value=sync_lock)
+    with (
+        patch.object(settings, "background_jobs_enabled", True),
+        patch("src.tasks.queue._get_redis", return_value=fake_redis),
+        patch("src.tasks.sync_jobs.get_session_maker", return_value=session_maker),
+        patch(
+            "src.scheduler._get_redis",
+            new_callable=AsyncMock,
+            return_value=lock_redis,
+        ),
+    ):
+        yield
+
+
+@pytest.fixture
+def test_job_kind():
+    """Register a throwaway job kind for queue tests."""
+    registered: list[str] = []
+
+    def register(kind: str, concurrency: int):
+        registered.append(kind)
+        return register_job(kind, concurrency)
+
+    yield register
+    for kind in registered:
+        queue._kinds.pop(kind, None)
+
+
+async def _save_credentials(client: AsyncClient, headers: dict[str, str]) -> None:
+    await client.post(
+        "/api/v1/lk/credentials",
+        json={"email": "test@omsu.ru", "password": "testpass"},
+        headers=headers,
+    )
+
+
+def _mock_lk_parser(login: bool = True):
+    """Patch LkParser with one returning a single grade."""
+    patcher = patch("src.services.lk.LkParser")
+    mock_class = patcher.start()
+    mock_parser = AsyncMock()
+    mock_parser.login.return_value = login
+    mock_parser.fetch_student_data.return_value = LkStudentData(
+        sessions=[
+            {
+                "number": "5 2025/2026",
+                "entries": [{"subject": "Математика", "result": "Отлично"}],
+            }
+        ]
+    )
+    mock_class.return_value.__aenter__.return_value = mock_parser
+    return patcher
+
+
+class TestLkSyncJob:
+    """Tests for POST /api/v1/lk/sync with background jobs enabled."""
+
+    @pytest.mark.asyncio
+    async def test_sync_enqueued_and_completed(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test the sync returns a job that reports the result once run."""
+        await _save_credentials(client, auth_headers)
+
+        response = await client.post("/api/v1/lk/sync", headers=auth_headers)
+        job_id = response.json()["id"]
+        queued = await client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers)
+
+        patcher = _mock_lk_parser()
+        try:
+            assert await queue.run_pending_jobs() == 1
+        finally:
+            patcher.stop()
+        done = await client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers)
+        grades = await client.get("/api/v1/lk/grades", headers=auth_headers)
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        assert queued.json()["status"] == "queued"
+        assert done.json()["status"] == "succeeded"
+        assert done.json()["progress"] == 100
+        assert done.json()["result"]["grades_synced"] == 1
+        assert len(grades.json()) == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_without_credentials_not_enqueued(
+        self, client: AsyncClient, auth_headers: dict[str, str], fake_redis
+    ) -> None:
+        """Test missing credentials are rejected before a job is queued."""
+        response = await client.post("/api/v1/lk/sync", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert await fake_redis.rpop(queue.QUEUE_KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error_and_allows_retry(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a failed sync stores its error and is not deduplicated."""
+        await _save_credentials(client, auth_headers)
+        first = (await client.post("/api/v1/lk/sync", headers=auth_headers)).json()
+
+        patcher = _mock_lk_parser(login=False)
+        try:
+            await queue.run_pending_jobs()
+        finally:
+            patcher.stop()
+        failed = await client.get(f"/api/v1/jobs/{first['id']}", headers=auth_headers)
+        retry = (await client.post("/api/v1/lk/sync", headers=auth_headers)).json()
+
+        assert failed.json()["status"] == "failed"
+        assert "authentication" in failed.json()["error"].lower()
+        assert retry["id"] != first["id"]
+
+    @pytest.mark.asyncio
+    async def test_other_users_job_not_found(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        test_user_data_2: dict,
+    ) -> None:
+        """Test a user cannot see another user's job."""
+        await _save_credentials(client, auth_headers)
+        job = (await client.post("/api/v1/lk/sync", headers=auth_headers)).json()
+
+        await client.post("/api/v1/auth/register", json=test_user_data_2)
+        login = await client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": test_user_data_2["email"],
+                "password": test_user_data_2["password"],
+            },
+        )
+        other_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        response = await client.get(f"/api/v1/jobs/{job['id']}", headers=other_headers)
+
+        assert response.status_code == 404
+
+
+class TestScheduleRefreshJob:
+    """Tests for POST /api/v1/schedule/refresh with background jobs enabled."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_job(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test identical refreshes run once and share the finished result."""
+        sync = AsyncMock(return_value={"success": True, "changed": False})
+
+        first = await client.post("/api/v1/schedule/refresh", headers=auth_headers)
+        second = await client.post("/api/v1/schedule/refresh", headers=auth_headers)
+        forced = await client.post(
+            "/api/v1/schedule/refresh?force=true", headers=auth_headers
+        )
+        with patch("src.services.schedule.sync_schedule", sync):
+            ran = await queue.run_pending_jobs()
+        after = await client.post("/api/v1/schedule/refresh", headers=auth_headers)
+
+        assert first.status_code == 202
+        assert second.json()["id"] == first.json()["id"]
+        assert forced.json()["id"] != first.json()["id"]
+        assert ran == 2
+        assert sync.await_count == 2
+        assert after.json()["id"] == first.json()["id"]
+        assert after.json()["status"] == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_while_sync_running(
+        self, client: AsyncClient, auth_headers: dict[str, str], sync_lock
+    ) -> None:
+        """Test a refresh fails without syncing while another sync holds the lock."""
+        sync_lock.acquire.return_value = False
+        sync = AsyncMock(return_value={"success": True, "changed": False})
+
+        job = await client.post("/api/v1/schedule/refresh", headers=auth_headers)
+        with patch("src.services.schedule.sync_schedule", sync):
+            await queue.run_pending_jobs()
+        response = await client.get(
+            f"/api/v1/jobs/{job.json()['id']}", headers=auth_headers
+        )
+
+        sync.assert_not_awaited()
+        sync_lock.release.assert_not_awaited()
+        assert response.json()["status"] == "failed"
+        assert "Another schedule sync is running" in response.json()["error"]
+
+
+class TestJobQueue:
+    """Tests for the queue itself."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_not_found(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test 404 for a job that does not exist."""
+        response = await client.get("/api/v1/jobs/nope", headers=auth_headers)
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_get_job_no_auth(self, client: AsyncClient) -> None:
+        """Test 401 without authentication."""
+        response = await client.get("/api/v1/jobs/nope")
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_progress_visible_while_running(self, test_job_kind) -> None:
+        """Test progress reported by a handler is visible before it finishes."""
+        release = asyncio.Event()
+
+        @test_job_kind("test_progress", concurrency=1)
+        async def handler(payload, progress):
+            await progress(50, "Halfway")
+            await release.wait()
+            return {"ok": True}
+
+        job = await enqueue_job("test_progress", {})
+        task = asyncio.create_task(run_job(job.id))
+        while (await get_job(job.id))[0].progress != 50:
+            await asyncio.sleep(0)
+        running, _ = await get_job(job.id)
+        release.set()
+        await task
+        finished, _ = await get_job(job.id)
+
+        assert running.status == "running"
+        assert running.message == "Halfway"
+        assert finished.status == "succeeded"
+        assert finished.result == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_kind_concurrency_limit(self, test_job_kind) -> None:
+        """Test no more jobs of a kind run at once than its limit."""
+        running = 0
+        peak = 0
+
+        @test_job_kind("test_limited", concurrency=2)
+        async def handler(payload, progress):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        jobs = [await enqueue_job("test_limited", {"n": n}) for n in range(5)]
+        await asyncio.gather(*(run_job(job.id) for job in jobs))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind_rejected(self) -> None:
+        """Test enqueueing an unregistered kind fails."""
+        with pytest.raises(ValueError, match="Unknown job kind"):
+            await enqueue_job("missing", {})
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_run_errors(self, test_job_kind) -> None:
+        """Test a job that cannot be run is failed and the worker goes on."""
+
+        @test_job_kind("test_worker", concurrency=1)
+        async def handler(payload, progress):
+            return {}
+
+        first = await enqueue_job("test_worker", {"n": 1})
+        await enqueue_job("test_worker", {"n": 2})
+        # The second call stops the otherwise endless worker loop
+        run = AsyncMock(
+            side_effect=[ConnectionError("Redis down"), asyncio.CancelledError]
+        )
+
+        with (
+            patch("src.tasks.queue.run_job", run),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await queue._worker(0)
+
+        failed, _ = await get_job(first.id)
+        assert run.await_count == 2
+        assert failed.status == "failed"
+        assert failed.error == "Internal error while running the job"
@@ -1,18 +1,32 @@
 """Tests for LK (личный кабинет) module."""
 
+import asyncio
 from datetime import date
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+import respx
 from httpx import AsyncClient
+from sqlalchemy import event, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.models.lk import SemesterDiscipline, SessionGrade
 from src.models.semester import Semester
 from src.parser.lk_parser import LkStudentData
-from src.services.lk import import_to_app
+from src.services.lk import (
+    _sync_disciplines,
+    _sync_grades,
+    get_disciplines,
+    get_grades,
+    import_to_app,
+)
+from src.services.lk_session import session_key
 from src.utils.crypto import decrypt_credential, encrypt_credential
 
+LK_URL = "https://eservice.omsu.ru"
+
 # ============================================================================
 # Crypto tests
 # ============================================================================
@@ -76,6 +90,60 @@ class TestCrypto:
         with pytest.raises(CryptoError):
             decrypt_credential(corrupted)
 
+    def test_key_derived_once_per_secret(self) -> None:
+        """Test PBKDF2 runs once per secret, not on every call."""
+        from src.utils.crypto import derive_key
+
+        encrypt_credential("warm-up")
+        misses = derive_key.cache_info().misses
+
+        for _ in range(5):
+            decrypt_credential(encrypt_credential("value"))
+
+        assert derive_key.cache_info().misses == misses
+
+    def test_previous_key_still_decrypts(self) -> None:
+        """Test credentials encrypted with a rotated-out key remain readable."""
+        from src.config import settings
+
+        with patch.object(settings, "secret_key", "old-secret"):
+            old_token = encrypt_credential("rotated")
+
+        with patch.object(settings, "previous_secret_keys", ["old-secret"]):
+            new_token = encrypt_credential(decrypt_credential(old_token))
+
+        # Re-encrypted token no longer needs the old key
+        assert decrypt_credential(new_token) == "rotated"
+
+    def test_removed_key_fails(self) -> None:
+        """Test credentials fail to decrypt once their key leaves the keyring."""
+        from src.config import settings
+        from src.utils.crypto import CryptoError
+
+        with patch.object(settings, "secret_key", "retired-secret"):
+            token = encrypt_credential("gone")
+
+        with pytest.raises(CryptoError):
+            decrypt_credential(token)
+
+    @pytest.mark.asyncio
+    async def test_load_fernet_derives_in_thread(self) -> None:
+        """Test cold keyring is built via asyncio.to_thread."""
+        from src.config import settings
+        from src.utils.crypto import load_fernet
+
+        with (
+            patch.object(settings, "secret_key", "cold-secret"),
+            patch(
+                "src.utils.crypto.asyncio.to_thread", wraps=asyncio.to_thread
+            ) as to_thread,
+        ):
+            first = await load_fernet()
+            second = await load_fernet()
+
+        assert first is second
+        to_thread.assert_called_once()
+
 
 # ============================================================================
 # LK Status tests
@@ -379,6 +447,304 @@ class TestLkSync:
         assert response.status_code == 401
 
 
+class TestLkSyncUpserts:
+    """Tests for the set-based _sync_grades() / _sync_disciplines() upserts."""
+
+    async def _create_user(self, db: AsyncSession) -> int:
+        """Create a test user and return user_id."""
+        from src.models.user import User
+
+        user = User(email="upsert@example.com", password_hash="x", name="Upsert")
+        db.add(user)
+        await db.flush()
+        return user.id
+
+    @staticmethod
+    def _disciplines(count: int, hours: int = 72) -> LkStudentData:
+        """Build LK data with count disciplines in semester 1."""
+        return LkStudentData(
+            sem_info=[
+                {
+                    "number": 1,
+                    "entries": [
+                        {
+                            "discipline": f"Дисциплина {i}",
+                            "controlForm": "Зачет",
+                            "length": hours,
+                        }
+                        for i in range(count)
+                    ],
+                }
+            ]
+        )
+
+    @staticmethod
+    async def _count_statements(engine, coro) -> list[str]:
+        """Run a coroutine and return the SQL statements it executed."""
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            await coro
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+        return statements
+
+    @pytest.mark.asyncio
+    async def test_unchanged_grades_not_rewritten(
+        self, db_session: AsyncSession, engine
+    ) -> None:
+        """Test a re-sync of identical grades only reads the stored rows."""
+        user_id = await self._create_user(db_session)
+        data = LkStudentData(
+            sessions=[
+                {
+                    "number": "1 2024/2025",
+                    "entries": [
+                        {"subject": "Математика", "result": "Отлично"},
+                        {"subject": "Физика", "result": "Хорошо"},
+                    ],
+                }
+            ]
+        )
+        await _sync_grades(db_session, user_id, data)
+        first = {
+            g.subject_name: g.synced_at for g in await get_grades(db_session, user_id)
+        }
+
+        statements = await self._count_statements(
+            engine, _sync_grades(db_session, user_id, data)
+        )
+
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT")
+        db_session.expire_all()
+        grades = await get_grades(db_session, user_id)
+        assert {g.subject_name: g.synced_at for g in grades} == first
+
+    @pytest.mark.asyncio
+    async def test_changed_grade_updated(self, db_session: AsyncSession) -> None:
+        """Test a changed result is written and duplicates do not conflict."""
+        user_id = await self._create_user(db_session)
+        session = {
+            "number": "1 2024/2025",
+            "entries": [{"subject": "Математика", "result": "Хорошо"}],
+        }
+        await _sync_grades(db_session, user_id, LkStudentData(sessions=[session]))
+
+        session["entries"] = [
+            {"subject": "Математика", "result": "Удовлетворительно"},
+            {"subject": "Математика", "result": "Отлично"},
+        ]
+        count = await _sync_grades(
+            db_session, user_id, LkStudentData(sessions=[session])
+        )
+
+        db_session.expire_all()
+        grades = await get_grades(db_session, user_id)
+        assert count == 1
+        assert [(g.subject_name, g.result) for g in grades] == [
+            ("Математика", "Отлично")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_disciplines_upserted_in_chunks(
+        self, db_session: AsyncSession, engine
+    ) -> None:
+        """Test disciplines go out as multi-row upserts of the batch size."""
+        user_id = await self._create_user(db_session)
+
+        with patch.object(settings, "lk_sync_batch_size", 2):
+            statements = await self._count_statements(
+                engine, _sync_disciplines(db_session, user_id, self._disciplines(5))
+            )
+            await _sync_disciplines(db_session, user_id, self._disciplines(5, 36))
+
+        # Stored rows lookup + ceil(5 / 2) upserts
+        assert len(statements) == 4
+        db_session.expire_all()
+        disciplines = await get_disciplines(db_session, user_id)
+        assert len(disciplines) == 5
+        assert {d.hours for d in disciplines} == {36}
+
+
+class _FakeLk:
+    """respx routes of an LK portal whose sessions can be expired."""
+
+    def __init__(self, router: respx.MockRouter) -> None:
+        self.router = router
+        self.session = 0
+        self.entry = router.get(f"{LK_URL}/sinfo/backend/").mock(
+            side_effect=self._entry
+        )
+        self.login = router.post(f"{LK_URL}/dasext/login.do").mock(
+            return_value=httpx.Response(
+                302, headers={"Location": f"{LK_URL}/sinfo/dashboard"}
+            )
+        )
+        router.get(f"{LK_URL}/sinfo/dashboard").mock(return_value=httpx.Response(200))
+        router.get(f"{LK_URL}/dasext/oauth/authorize").mock(
+            return_value=httpx.Response(200)
+        )
+        self.data = router.get(f"{LK_URL}/sinfo/backend/myStudents").mock(
+            side_effect=self._data
+        )
+
+    def expire(self) -> None:
+        """Invalidate the session issued by the last login."""
+        self.session += 1
+
+    def _entry(self, request: httpx.Request) -> httpx.Response:
+        self.session += 1
+        return httpx.Response(
+            200,
+            headers={
+                "X-CSRF-TOKEN": "csrf",
+                "Set-Cookie": f"JSESSIONID=s{self.session}; Path=/",
+            },
+        )
+
+    def _data(self, request: httpx.Request) -> httpx.Response:
+        if f"JSESSIONID=s{self.session}" not in request.headers.get("cookie", ""):
+            return httpx.Response(
+                302, headers={"Location": f"{LK_URL}/dasext/oauth/authorize"}
+            )
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "sessions": [
+                        {
+                            "number": "5 2025/2026",
+                            "entries": [{"subject": "Математика", "result": "5"}],
+                        }
+                    ]
+                }
+            ],
+        )
+
+
+class TestLkSessionCache:
+    """Tests for reusing cached LK sessions in sync and verify."""
+
+    @pytest.fixture(autouse=True)
+    def session_cache(self, fake_redis):
+        """Enable the session cache on fake Redis."""
+        with (
+            patch.object(settings, "lk_session_cache_enabled", True),
+            patch("src.services.lk_session.get_cache_redis", return_value=fake_redis),
+        ):
+            yield
+
+    @pytest.fixture
+    def lk(self):
+        """Fake LK portal."""
+        with respx.mock(assert_all_called=False) as router:
+            yield _FakeLk(router)
+
+    async def _save_credentials(
+        self, client: AsyncClient, headers: dict[str, str]
+    ) -> None:
+        await client.post(
+            "/api/v1/lk/credentials",
+            json={"email": "test@omsu.ru", "password": "testpass"},
+            headers=headers,
+        )
+
+    @pytest.mark.asyncio
+    async def test_second_sync_reuses_session(
+        self, client: AsyncClient, auth_headers: dict[str, str], lk, fake_redis
+    ) -> None:
+        """Test a sync resumes the cached session instead of logging in."""
+        await self._save_credentials(client, auth_headers)
+
+        first = await client.post("/api/v1/lk/sync", headers=auth_headers)
+        requests_after_first = len(lk.router.calls)
+        second = await client.post("/api/v1/lk/sync", headers=auth_headers)
+
+        assert first.json()["grades_synced"] == 1
+        assert second.json()["grades_synced"] == 1
+        assert lk.login.call_count == 1
+        assert len(lk.router.calls) - requests_after_first == 1
+        key = session_key("test@omsu.ru", "testpass")
+        stored = fake_redis.data[key]
+        assert b"JSESSIONID" not in stored
+        assert "JSESSIONID" in decrypt_credential(stored.decode())
+
+    @pytest.mark.asyncio
+    async def test_expired_session_logs_in_again(
+        self, client: AsyncClient, auth_headers: dict[str, str], lk, fake_redis
+    ) -> None:
+        """Test an expired cached session is replaced by a fresh login."""
+        await self._save_credentials(client, auth_headers)
+        await client.post("/api/v1/lk/sync", headers=auth_headers)
+        lk.expire()
+
+        response = await client.post("/api/v1/lk/sync", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["grades_synced"] == 1
+        assert lk.login.call_count == 2
+        stored = fake_redis.data[session_key("test@omsu.ru", "testpass")]
+        assert f"s{lk.session}" in decrypt_credential(stored.decode())
+
+    @pytest.mark.asyncio
+    async def test_verify_reuses_session_of_same_credentials(
+        self, client: AsyncClient, auth_headers: dict[str, str], lk
+    ) -> None:
+        """Test verify checks a cached session, but only for its credentials."""
+        body = {"email": "test@omsu.ru", "password": "testpass"}
+
+        first = await client.post("/api/v1/lk/verify", json=body, headers=auth_headers)
+        again = await client.post("/api/v1/lk/verify", json=body, headers=auth_headers)
+        logins_before_other = lk.login.call_count
+        await client.post(
+            "/api/v1/lk/verify",
+            json={**body, "password": "otherpass"},
+            headers=auth_headers,
+        )
+
+        assert first.json()["valid"] is True
+        assert again.json()["valid"] is True
+        assert logins_before_other == 1
+        assert lk.login.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_credentials_drops_session(
+        self, client: AsyncClient, auth_headers: dict[str, str], lk, fake_redis
+    ) -> None:
+        """Test deleting credentials forgets their cached session."""
+        await self._save_credentials(client, auth_headers)
+        await client.post("/api/v1/lk/sync", headers=auth_headers)
+        key = session_key("test@omsu.ru", "testpass")
+        assert key in fake_redis.data
+
+        await client.delete("/api/v1/lk/credentials", headers=auth_headers)
+
+        assert key not in fake_redis.data
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_login(
+        self, client: AsyncClient, auth_headers: dict[str, str], lk
+    ) -> None:
+        """Test syncs still work (logging in each time) when Redis is down."""
+        broken = AsyncMock()
+        broken.get.side_effect = ConnectionError("down")
+        broken.set.side_effect = ConnectionError("down")
+        await self._save_credentials(client, auth_headers)
+
+        with patch("src.services.lk_session.get_cache_redis", return_value=broken):
+            first = await client.post("/api/v1/lk/sync", headers=auth_headers)
+            second = await client.post("/api/v1/lk/sync", headers=auth_headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert lk.login.call_count == 2
+
+
 # ============================================================================
 # LK Grades tests
 # ============================================================================
@@ -984,3 +1350,62 @@ class TestLkImport:
         await db_session.refresh(sem6)
         assert sem5.is_current is False
         assert sem6.is_current is True
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("per_semester", [1, 30])
+    async def test_import_statement_count_is_constant(
+        self, db_session: AsyncSession, engine, per_semester: int
+    ) -> None:
+        """Test import runs a fixed number of statements per discipline count."""
+        from datetime import UTC, datetime
+
+        from src.models.subject import Subject
+
+        user_id = await self._create_user(db_session)
+        now = datetime.now(UTC)
+        db_session.add_all(
+            SemesterDiscipline(
+                user_id=user_id,
+                semester_number=sem_num,
+                discipline_name=f"Subject_{sem_num}_{i}",
+                control_form="Зачет",
+                hours=72,
+                synced_at=now,
+            )
+            for sem_num in (1, 2, 3)
+            for i in range(per_semester)
+        )
+        await db_session.flush()
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        async def count_import():
+            statements.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+            try:
+                return await import_to_app(db_session, user_id)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        created = await count_import()
+        # Disciplines, grades, semesters, semester INSERT, subjects, subject INSERT
+        assert len(statements) == 6
+        assert created.subjects_created == 3 * per_semester
+
+        await db_session.execute(
+            update(SemesterDiscipline)
+            .where(SemesterDiscipline.user_id == user_id)
+            .values(hours=36)
+        )
+        updated = await count_import()
+        # Disciplines, grades, semesters, semester UPDATE, subjects, subject UPDATE
+        assert len(statements) == 6
+        assert updated.semesters_updated == 3
+        assert updated.subjects_updated == 3 * per_semester
+
+        db_session.expire_all()
+        hours = await db_session.execute(select(Subject.total_hours).distinct())
+        assert hours.scalars().all() == [36]
@@ -2,9 +2,14 @@
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
 
+from src.database import _engine_options, instrument_pool
 from src.main import app
-from src.metrics import SCHEDULE_SYNC_TOTAL
+from src.metrics import (
+    DB_POOL_CHECKOUT_WAIT_SECONDS,
+    SCHEDULE_SYNC_TOTAL,
+)
 from src.middleware.prometheus import _normalize_path
 
 
@@ -127,3 +132,76 @@ class TestScheduleSyncMetrics:
         SCHEDULE_SYNC_TOTAL.labels(status="error").inc()
         after = SCHEDULE_SYNC_TOTAL.labels(status="error")._value.get()
         assert after == before + 1
+
+
+class TestDatabasePoolMetrics:
+    """Tests for connection pool configuration and metrics."""
+
+    def test_postgres_engine_options(self) -> None:
+        """Test pool settings are applied to PostgreSQL engines."""
+        options = _engine_options("postgresql+asyncpg://u:p@db/app")
+
+        assert options["pool_size"] == 10
+        assert options["max_overflow"] == 10
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"statement_cache_size": 100}
+
+    @pytest.mark.asyncio
+    async def test_pool_gauges_follow_checkouts(self) -> None:
+        """Test gauges follow checkouts and checkins."""
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=2,
+        )
+        instrument_pool(engine)
+        try:
+            async with engine.connect() as first, engine.connect() as second:
+                await first.execute(text("SELECT 1"))
+                await second.execute(text("SELECT 1"))
+                assert REGISTRY.get_sample_value("db_pool_checked_out") == 2
+                assert REGISTRY.get_sample_value("db_pool_overflow") == 1
+            assert REGISTRY.get_sample_value("db_pool_checked_out") == 0
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_checkout_wait_measured(self) -> None:
+        """Test waiting for a busy pool is recorded in the checkout histogram."""
+        import asyncio
+
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+        )
+        instrument_pool(engine)
+        held = asyncio.Event()
+
+        async def hold() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                held.set()
+                await asyncio.sleep(0.05)
+
+        waits = DB_POOL_CHECKOUT_WAIT_SECONDS._sum.get()
+        try:
+            holder = asyncio.create_task(hold())
+            await held.wait()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            await holder
+        finally:
+            await engine.dispose()
+
+        assert DB_POOL_CHECKOUT_WAIT_SECONDS._sum.get() - waits >= 0.04
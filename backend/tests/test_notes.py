@@ -1,9 +1,16 @@
 """Tests for lesson notes endpoints."""
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex
+
+from src.models.note import LessonNote
+from src.services.note import _note_tsvector
 
 
 def _past_entry(subject_name: str = "Математический анализ", **kwargs) -> dict:
@@ -275,6 +282,136 @@ class TestGetNotes:
         assert len(data) == 1
         assert "Formula" in data[0]["content"]
 
+    @pytest.mark.asyncio
+    async def test_get_notes_search_matches_substring(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test the list filter matches inside words, not just word prefixes."""
+        await _create_note(client, auth_headers, content="Homework task")
+
+        response = await client.get(
+            "/api/v1/notes/",
+            params={"search": "ework t"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert [note["content"] for note in response.json()] == ["Homework task"]
+
+    @pytest.mark.asyncio
+    async def test_get_notes_cursor_pagination(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        db_session: AsyncSession,
+    ) -> None:
+        """Test cursor pages follow updated_at desc, then id desc."""
+        notes = [
+            await _create_note(client, auth_headers, subject_name=f"Subject {i}")
+            for i in range(4)
+        ]
+        # Two notes share a timestamp to exercise the id tie-breaker
+        stamps = [datetime(2026, 10, day, 12, 0) for day in (1, 2, 2, 3)]
+        for note, stamp in zip(notes, stamps, strict=True):
+            await db_session.execute(
+                update(LessonNote)
+                .where(LessonNote.id == note["id"])
+                .values(updated_at=stamp)
+            )
+        await db_session.commit()
+
+        first = await client.get(
+            "/api/v1/notes/", params={"limit": 2}, headers=auth_headers
+        )
+        cursor = first.headers["X-Next-Cursor"]
+        second = await client.get(
+            "/api/v1/notes/",
+            params={"limit": 2, "cursor": cursor},
+            headers=auth_headers,
+        )
+
+        assert second.status_code == 200
+        assert "X-Next-Cursor" in second.headers
+        ids = [n["id"] for n in first.json() + second.json()]
+        assert ids == [notes[3]["id"], notes[2]["id"], notes[1]["id"], notes[0]["id"]]
+
+    @pytest.mark.asyncio
+    async def test_get_notes_invalid_cursor_400(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a malformed cursor is rejected."""
+        response = await client.get(
+            "/api/v1/notes/", params={"cursor": "%%%"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestSearchNotes:
+    """Tests for GET /api/v1/notes/search."""
+
+    @pytest.mark.asyncio
+    async def test_search_requires_all_words(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test every query word must occur in the note."""
+        await _create_note(client, auth_headers, content="Limits and series")
+        await _create_note(
+            client, auth_headers, subject_name="Физика", content="Limits of physics"
+        )
+
+        response = await client.get(
+            "/api/v1/notes/search",
+            params={"q": "series, limits"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["content"] == "Limits and series"
+        assert "rank" in data[0]
+
+    @pytest.mark.asyncio
+    async def test_search_snippet_is_escaped_and_highlighted(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test snippets escape note HTML and mark the matches."""
+        await _create_note(client, auth_headers, content="<b>Homework</b>: task 5")
+
+        response = await client.get(
+            "/api/v1/notes/search", params={"q": "homework"}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        snippet = response.json()[0]["snippet"]
+        assert snippet == "&lt;b&gt;<mark>Homework</mark>&lt;/b&gt;: task 5"
+
+    @pytest.mark.asyncio
+    async def test_search_without_words_400(
+        self, client: AsyncClient, auth_headers: dict[str, str]
+    ) -> None:
+        """Test a query made only of punctuation is rejected."""
+        response = await client.get(
+            "/api/v1/notes/search", params={"q": "%%"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_search_no_auth(self, client: AsyncClient) -> None:
+        """Test searching without authentication returns 401."""
+        response = await client.get("/api/v1/notes/search", params={"q": "x"})
+
+        assert response.status_code == 401
+
+    def test_query_expression_matches_index(self) -> None:
+        """Test the search predicate uses the indexed tsvector expression."""
+        index = next(i for i in LessonNote.__table__.indexes if i.name.endswith("_fts"))
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        expression = str(_note_tsvector().compile(dialect=postgresql.dialect()))
+
+        assert expression.replace("lesson_notes.", "") in ddl
+
 
 class TestGetNoteForEntry:
     """Tests for GET /api/v1/notes/entry/{schedule_entry_id}."""
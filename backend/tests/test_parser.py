@@ -431,23 +431,20 @@ class TestOmsuScheduleParser:
 
     @pytest.mark.asyncio
     async def test_parser_context_manager(self):
-        """Test parser as async context manager."""
-        with patch("src.parser.omsu_parser.httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        """Test the parser leaves an injected client open for reuse."""
+        mock_client = AsyncMock()
 
-            from src.parser import OmsuScheduleParser
+        from src.parser import OmsuScheduleParser
 
-            async with OmsuScheduleParser() as parser:
-                assert parser._client is not None
+        async with OmsuScheduleParser(client=mock_client) as parser:
+            assert parser._client is mock_client
 
-            # Verify cleanup was called
-            mock_client.aclose.assert_called_once()
+        mock_client.aclose.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_parser_without_context_manager(self):
-        """Parser can work without context manager (creates temporary client)."""
-        with patch("src.parser.omsu_parser.httpx.AsyncClient") as mock_client_class:
+        """Parser can work without context manager (uses the shared client)."""
+        with patch("src.parser.omsu_parser.get_upstream_client") as mock_get_client:
             # Create mock response
             mock_response = MagicMock()
             mock_response.json.return_value = {
@@ -475,7 +472,7 @@ class TestOmsuScheduleParser:
             mock_client = AsyncMock()
             mock_client.get = AsyncMock(return_value=mock_response)
             mock_client.aclose = AsyncMock()
-            mock_client_class.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             from src.parser import OmsuScheduleParser
 
@@ -484,3 +481,4 @@ class TestOmsuScheduleParser:
 
             assert result.entries_count == 1
             assert result.entries[0].subject_name == "Test Subject"
+            mock_client.aclose.assert_not_called()
@@ -0,0 +1,227 @@
+"""Tests for the schedule read cache."""
+
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import settings
+from src.services import schedule as schedule_service
+from src.services.schedule_cache import VERSION_KEY
+
+TARGET_DATE = date(2026, 10, 14)
+
+
+@pytest.fixture
+def cache_redis(fake_redis):
+    """Enable the schedule cache on an in-memory Redis."""
+    with (
+        patch.object(settings, "schedule_cache_enabled", True),
+        patch("src.services.schedule_cache.get_cache_redis", return_value=fake_redis),
+    ):
+        yield fake_redis
+
+
+@pytest.fixture
+def version_redis(fake_redis):
+    """Keep the schedule version on an in-memory Redis (view cache off)."""
+    with patch("src.services.schedule_cache.get_cache_redis", return_value=fake_redis):
+        yield fake_redis
+
+
+@pytest.fixture
+def entry_data() -> dict:
+    """Schedule entry on TARGET_DATE."""
+    return {
+        "lesson_date": TARGET_DATE.isoformat(),
+        "day_of_week": 3,
+        "start_time": "09:00:00",
+        "end_time": "10:30:00",
+        "subject_name": "Математический анализ",
+        "lesson_type": "lecture",
+    }
+
+
+class TestScheduleCache:
+    """Tests for cached week/day views."""
+
+    async def test_week_served_from_cache(
+        self, client: AsyncClient, auth_headers: dict, cache_redis, entry_data: dict
+    ):
+        """Test second week request does not rebuild the view."""
+        await client.post(
+            "/api/v1/schedule/entries", json=entry_data, headers=auth_headers
+        )
+
+        with patch.object(
+            schedule_service,
+            "get_week_schedule",
+            wraps=schedule_service.get_week_schedule,
+        ) as build:
+            first = await client.get(
+                "/api/v1/schedule/week",
+                params={"target_date": TARGET_DATE.isoformat()},
+                headers=auth_headers,
+            )
+            second = await client.get(
+                "/api/v1/schedule/week",
+                params={"target_date": "2026-10-17"},  # same ISO week
+                headers=auth_headers,
+            )
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first.headers["content-type"] == "application/json"
+        assert build.await_count == 1
+        assert len(first.json()["days"][2]["entries"]) == 1
+
+    async def test_crud_invalidates(
+        self, client: AsyncClient, auth_headers: dict, cache_redis, entry_data: dict
+    ):
+        """Test creating an entry makes cached views stale."""
+        params = {"target_date": TARGET_DATE.isoformat()}
+        response = await client.get(
+            "/api/v1/schedule/today", params=params, headers=auth_headers
+        )
+        assert response.json()["entries"] == []
+
+        created = await client.post(
+            "/api/v1/schedule/entries", json=entry_data, headers=auth_headers
+        )
+        response = await client.get(
+            "/api/v1/schedule/today", params=params, headers=auth_headers
+        )
+        assert len(response.json()["entries"]) == 1
+
+        await client.delete(
+            f"/api/v1/schedule/entries/{created.json()['id']}", headers=auth_headers
+        )
+        response = await client.get(
+            "/api/v1/schedule/today", params=params, headers=auth_headers
+        )
+        assert response.json()["entries"] == []
+
+    async def test_sync_sets_content_hash(self, db_session, cache_redis):
+        """Test a changed sync stores the new snapshot hash in the version."""
+        from tests.test_schedule_sync import create_mock_parse_result
+
+        parse_result = create_mock_parse_result(content_hash="fresh_hash")
+        with patch(
+            "src.services.schedule.parse_schedule",
+            new_callable=AsyncMock,
+            return_value=parse_result,
+        ):
+            await schedule_service.sync_schedule(db_session)
+
+        version = await cache_redis.hgetall(VERSION_KEY)
+        assert version[b"hash"] == b"fresh_hash"
+
+    async def test_current_uses_cached_day(
+        self, client: AsyncClient, auth_headers: dict, cache_redis
+    ):
+        """Test /current is computed from the cached day view."""
+        with patch.object(
+            schedule_service,
+            "get_today_schedule",
+            wraps=schedule_service.get_today_schedule,
+        ) as build:
+            for _ in range(2):
+                response = await client.get(
+                    "/api/v1/schedule/current", headers=auth_headers
+                )
+                assert response.status_code == 200
+                assert set(response.json()) == {"current", "next", "time_until_next"}
+
+        assert build.await_count == 1
+
+    async def test_redis_down_falls_back(self, client: AsyncClient, auth_headers: dict):
+        """Test views are built from the DB when Redis is unreachable."""
+        broken = AsyncMock()
+        broken.hgetall = AsyncMock(side_effect=ConnectionError("down"))
+
+        with (
+            patch.object(settings, "schedule_cache_enabled", True),
+            patch("src.services.schedule_cache.get_cache_redis", return_value=broken),
+        ):
+            response = await client.get("/api/v1/schedule/week", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(response.json()["days"]) == 7
+
+
+class TestConditionalRequests:
+    """Tests for ETag / If-None-Match on schedule views."""
+
+    async def test_not_modified_skips_build(
+        self, client: AsyncClient, auth_headers: dict, version_redis
+    ):
+        """Test a matching If-None-Match gets 304 without rendering the view.
+
+        The view cache is off (the default): the ETag comes from the
+        schedule version alone.
+        """
+        params = {"target_date": TARGET_DATE.isoformat()}
+        first = await client.get(
+            "/api/v1/schedule/week", params=params, headers=auth_headers
+        )
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        with (
+            patch.object(schedule_service, "get_week_schedule_json") as render,
+            patch.object(schedule_service, "get_week_schedule") as build,
+        ):
+            response = await client.get(
+                "/api/v1/schedule/week",
+                params=params,
+                headers={**auth_headers, "If-None-Match": f"W/{etag}"},
+            )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+        render.assert_not_called()
+        build.assert_not_called()
+
+    async def test_etag_changes_on_edit(
+        self, client: AsyncClient, auth_headers: dict, version_redis, entry_data: dict
+    ):
+        """Test editing the schedule invalidates previously issued ETags."""
+        params = {"target_date": TARGET_DATE.isoformat()}
+        first = await client.get(
+            "/api/v1/schedule/today", params=params, headers=auth_headers
+        )
+        etag = first.headers["etag"]
+
+        await client.post(
+            "/api/v1/schedule/entries", json=entry_data, headers=auth_headers
+        )
+        response = await client.get(
+            "/api/v1/schedule/today",
+            params=params,
+            headers={**auth_headers, "If-None-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert len(response.json()["entries"]) == 1
+
+    async def test_body_etag_without_redis(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test the ETag falls back to a body hash when Redis is unreachable."""
+        broken = AsyncMock()
+        broken.hgetall = AsyncMock(side_effect=ConnectionError("down"))
+
+        with (
+            patch.object(settings, "schedule_cache_enabled", True),
+            patch("src.services.schedule_cache.get_cache_redis", return_value=broken),
+        ):
+            first = await client.get("/api/v1/schedule/week", headers=auth_headers)
+            response = await client.get(
+                "/api/v1/schedule/week",
+                headers={**auth_headers, "If-None-Match": first.headers["etag"]},
+            )
+
+        assert response.status_code == 304
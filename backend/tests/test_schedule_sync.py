@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 from src.parser.omsu_parser import ParseResult
 from src.schemas.schedule import DayOfWeek, LessonType, ScheduleEntryCreate
@@ -367,3 +368,365 @@ class TestScheduleSyncService:
 
             assert result["success"] is True
             assert result["changed"] is True
+
+
+class TestScheduleDiffSync:
+    """Tests for diff-based schedule synchronization."""
+
+    def test_compute_diff_classifies_changes(self):
+        """Matching keys become updates, the rest inserts or deletes."""
+        from src.services.schedule import _entry_values, compute_schedule_diff
+
+        parsed = create_mock_parse_result(entries_count=3).entries
+        existing = [{"id": i + 1, **_entry_values(e)} for i, e in enumerate(parsed)]
+        existing[0]["room"] = "old room"
+        existing.append({**existing[2], "id": 99, "subject_name": "Gone"})
+
+        new_entry = parsed[0].model_copy(update={"subject_name": "New subject"})
+        diff = compute_schedule_diff(existing, [*parsed, new_entry])
+
+        assert diff["updates"] == [{"id": 1, "room": parsed[0].room}]
+        assert diff["deletes"] == [99]
+        assert len(diff["inserts"]) == 1
+        assert diff["inserts"][0]["subject_name"] == "New subject"
+
+    def test_compute_diff_pairs_duplicate_keys(self):
+        """Entries sharing a key are matched one-to-one."""
+        from src.services.schedule import _entry_values, compute_schedule_diff
+
+        entry = create_mock_parse_result(entries_count=1).entries[0]
+        existing = [{"id": 1, **_entry_values(entry)}]
+
+        diff = compute_schedule_diff(existing, [entry, entry])
+
+        assert diff["updates"] == []
+        assert diff["deletes"] == []
+        assert len(diff["inserts"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_resync_keeps_entry_ids(
+        self,
+        db_session,
+        mock_parse_result: ParseResult,
+    ):
+        """Unchanged and updated lessons keep their ids across a re-sync."""
+        from sqlalchemy import select
+
+        from src.models.schedule import ScheduleEntry
+        from src.services import schedule as schedule_service
+
+        with patch(
+            "src.services.schedule.parse_schedule",
+            new_callable=AsyncMock,
+            return_value=mock_parse_result,
+        ):
+            await schedule_service.sync_schedule(db_session)
+
+        db_result = await db_session.execute(select(ScheduleEntry))
+        ids_before = {e.subject_name: e.id for e in db_result.scalars().all()}
+
+        changed = create_mock_parse_result(entries_count=4, content_hash="v2")
+        changed.entries[0] = changed.entries[0].model_copy(update={"room": "999"})
+
+        with patch(
+            "src.services.schedule.parse_schedule",
+            new_callable=AsyncMock,
+            return_value=changed,
+        ):
+            result = await schedule_service.sync_schedule(db_session)
+
+        assert result["inserted"] == 1
+        assert result["updated"] == 1
+        assert result["deleted"] == 0
+
+        db_session.expire_all()
+        db_result = await db_session.execute(select(ScheduleEntry))
+        entries = {e.subject_name: e for e in db_result.scalars().all()}
+        assert len(entries) == 4
+        for name, entry_id in ids_before.items():
+            assert entries[name].id == entry_id
+        assert entries["Subject 1"].room == "999"
+
+    @pytest.mark.asyncio
+    async def test_resync_preserves_absence_link(
+        self,
+        db_session,
+        mock_parse_result: ParseResult,
+    ):
+        """Absences keep pointing at their lesson after a re-sync."""
+        from sqlalchemy import select
+
+        from src.models.attendance import Absence
+        from src.models.schedule import ScheduleEntry
+        from src.models.user import User
+        from src.services import schedule as schedule_service
+
+        with patch(
+            "src.services.schedule.parse_schedule",
+            new_callable=AsyncMock,
+            return_value=mock_parse_result,
+        ):
+            await schedule_service.sync_schedule(db_session)
+
+        entry = (await db_session.execute(select(ScheduleEntry))).scalars().first()
+        user = User(email="sync@example.com", password_hash="x", name="Sync")
+        db_session.add(user)
+        await db_session.flush()
+        absence = Absence(
+            user_id=user.id,
+            schedule_entry_id=entry.id,
+            subject_name=entry.subject_name,
+            lesson_date=entry.lesson_date,
+        )
+        db_session.add(absence)
+        await db_session.commit()
+
+        with patch(
+            "src.services.schedule.parse_schedule",
+            new_callable=AsyncMock,
+            return_value=mock_parse_result,
+        ):
+            result = await schedule_service.sync_schedule(db_session, force=True)
+
+        assert result["changed"] is True
+        await db_session.refresh(absence)
+        assert absence.schedule_entry_id == entry.id
+
+
+class TestBulkInsert:
+    """Tests for bulk loading of parsed schedule entries."""
+
+    @pytest.mark.asyncio
+    async def test_insert_rows_batches_rows(self, db_session):
+        """Rows are inserted in batches, counted, and committed by the caller."""
+        from sqlalchemy import func, select
+
+        from src.config import settings
+        from src.metrics import SCHEDULE_SYNC_ROWS_TOTAL
+        from src.models.schedule import ScheduleEntry
+        from src.services import schedule as schedule_service
+
+        rows = [
+            schedule_service._entry_values(entry)
+            for entry in create_mock_parse_result(entries_count=7).entries
+        ]
+        counter = SCHEDULE_SYNC_ROWS_TOTAL.labels(operation="insert")
+        before = counter._value.get()
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            with patch.object(settings, "schedule_sync_batch_size", 3):
+                await schedule_service._insert_rows(db_session, rows)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        await db_session.commit()
+
+        count = await db_session.scalar(select(func.count(ScheduleEntry.id)))
+        assert count == 7
+        assert len(statements) == 3
+        assert counter._value.get() == before + 7
+
+
+class TestMultiGroupSync:
+    """Tests for syncing several study groups."""
+
+    @pytest.fixture
+    def session_maker(self, engine):
+        """Session factory bound to the test database.
+
+        The in-memory SQLite database is a single shared connection, so
+        groups that write are synced one at a time.
+        """
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        from src.config import settings
+
+        with patch.object(settings, "schedule_sync_concurrency", 1):
+            yield async_sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+
+    @pytest.mark.asyncio
+    async def test_groups_synced_independently(self, session_maker, db_session):
+        """Each group gets its own entries and snapshot."""
+        from sqlalchemy import func, select
+
+        from src.config import settings
+        from src.models.schedule import ScheduleEntry
+        from src.services import schedule as schedule_service
+
+        results = {
+            1: create_mock_parse_result(entries_count=2, content_hash="hash_1"),
+            2: create_mock_parse_result(entries_count=3, content_hash="hash_2"),
+        }
+
+        async def fake_parse(url=None, group_id=None, client=None):
+            return results[group_id]
+
+        with (
+            patch.object(settings, "schedule_group_ids", [1, 2]),
+            patch("src.services.schedule.parse_schedule", side_effect=fake_parse),
+        ):
+            first = await schedule_service.sync_all_groups(session_maker)
+            # Group 1 shrinks; group 2 is unchanged and must be left alone
+            results[1] = create_mock_parse_result(entries_count=1, content_hash="h1b")
+            second = await schedule_service.sync_all_groups(session_maker)
+
+        assert first[1]["changed"] and first[2]["changed"]
+        assert second[1]["changed"] is True
+        assert second[2]["changed"] is False
+
+        counts = dict(
+            (
+                await db_session.execute(
+                    select(ScheduleEntry.source_group_id, func.count()).group_by(
+                        ScheduleEntry.source_group_id
+                    )
+                )
+            ).all()
+        )
+        assert counts == {1: 1, 2: 3}
+        snapshot = await schedule_service.get_latest_snapshot(db_session, group_id=2)
+        assert snapshot.content_hash == "hash_2"
+
+    @pytest.mark.asyncio
+    async def test_failing_group_isolated(self, session_maker):
+        """A group whose fetch fails does not affect the others."""
+        from src.config import settings
+        from src.metrics import SCHEDULE_GROUP_SYNC_TOTAL
+        from src.parser.exceptions import PageLoadError
+        from src.services import schedule as schedule_service
+
+        async def fake_parse(url=None, group_id=None, client=None):
+            if group_id == 13:
+                raise PageLoadError("API returned status 502")
+            return create_mock_parse_result(content_hash=f"hash_{group_id}")
+
+        errors = SCHEDULE_GROUP_SYNC_TOTAL.labels(group="13", status="error")
+        before = errors._value.get()
+        with (
+            patch.object(settings, "schedule_group_ids", [11, 13, 17]),
+            patch("src.services.schedule.parse_schedule", side_effect=fake_parse),
+        ):
+            results = await schedule_service.sync_all_groups(session_maker)
+
+        assert results[13]["success"] is False
+        assert results[11]["success"] and results[17]["success"]
+        assert errors._value.get() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_concurrency_bounded(self, session_maker):
+        """No more than schedule_sync_concurrency groups run at once."""
+        import asyncio
+
+        from src.config import settings
+        from src.services import schedule as schedule_service
+
+        active = peak = 0
+        clients = set()
+
+        async def fake_sync(db, force=False, group_id=None, client=None):
+            nonlocal active, peak
+            clients.add(id(client))
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"success": True, "changed": False, "entries_count": 0}
+
+        with (
+            patch.object(settings, "schedule_group_ids", list(range(1, 7))),
+            patch.object(settings, "schedule_sync_concurrency", 2),
+            patch("src.services.schedule.sync_schedule", side_effect=fake_sync),
+        ):
+            results = await schedule_service.sync_all_groups(session_maker)
+
+        assert sorted(results) == [1, 2, 3, 4, 5, 6]
+        assert peak == 2
+        assert len(clients) == 1
+
+
+class TestGroupScopedReads:
+    """Read views only show the default group's entries (and manual ones)."""
+
+    @pytest.fixture
+    async def entries(self, db_session):
+        """Yesterday's lessons of the default group, another group and manual."""
+        from datetime import timedelta
+
+        from src.config import settings
+        from src.models.schedule import ScheduleEntry
+
+        yesterday = date.today() - timedelta(days=1)
+        rows = {
+            "default": settings.schedule_group_id,
+            "other": settings.schedule_group_id + 1,
+            "manual": None,
+        }
+        created = {}
+        for name, group_id in rows.items():
+            entry = ScheduleEntry(
+                day_of_week=yesterday.isoweekday(),
+                lesson_date=yesterday,
+                start_time=time(9, 0),
+                end_time=time(10, 30),
+                subject_name=f"Subject {name}",
+                lesson_type="lecture",
+                source_group_id=group_id,
+            )
+            db_session.add(entry)
+            created[name] = entry
+        await db_session.commit()
+        return {name: entry.id for name, entry in created.items()}
+
+    @pytest.mark.asyncio
+    async def test_day_view_excludes_other_groups(
+        self, client: AsyncClient, auth_headers: dict, entries: dict
+    ):
+        """The day view lists the default group's and manual lessons only."""
+        from datetime import timedelta
+
+        yesterday = date.today() - timedelta(days=1)
+        response = await client.get(
+            f"/api/v1/schedule/today?target_date={yesterday}", headers=auth_headers
+        )
+
+        ids = {entry["id"] for entry in response.json()["entries"]}
+        assert ids == {entries["default"], entries["manual"]}
+
+    @pytest.mark.asyncio
+    async def test_attendance_excludes_other_groups(
+        self, client: AsyncClient, auth_headers: dict, entries: dict
+    ):
+        """Other groups' lessons are neither counted nor markable."""
+        from datetime import timedelta
+
+        semester = await client.post(
+            "/api/v1/semesters",
+            json={
+                "number": 1,
+                "year_start": 2025,
+                "year_end": 2026,
+                "name": "Test Semester",
+                "start_date": str(date.today() - timedelta(days=30)),
+                "end_date": str(date.today() + timedelta(days=30)),
+            },
+            headers=auth_headers,
+        )
+        stats = await client.get(
+            f"/api/v1/attendance/stats?semester_id={semester.json()['id']}",
+            headers=auth_headers,
+        )
+        mark = await client.post(
+            "/api/v1/attendance/mark-absent",
+            json={"schedule_entry_id": entries["other"]},
+            headers=auth_headers,
+        )
+
+        assert stats.json()["total_completed"] == 2
+        assert mark.status_code == 404
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from redis.exceptions import LockNotOwnedError
 
+from src.config import settings
+
 
 @pytest.fixture(autouse=True)
 def _reset_scheduler_globals():
@@ -64,7 +66,12 @@ class TestSyncScheduleWithLock:
             await _sync_schedule_with_lock()
 
             mock_lock.acquire.assert_awaited_once()
-            mock_sync.assert_awaited_once_with(mock_session)
+            mock_sync.assert_awaited_once_with(
+                mock_session,
+                force=False,
+                group_id=settings.schedule_group_id,
+                client=ANY,
+            )
             mock_lock.release.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -167,6 +174,49 @@ class TestSyncScheduleWithLock:
 
             mock_lock.release.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("outcomes", "status"),
+        [
+            ([True, True], "success"),
+            ([True, False], "partial"),
+            ([False, False], "error"),
+        ],
+    )
+    async def test_status_derived_from_group_results(self, outcomes, status):
+        """The sync counter reflects how many groups succeeded."""
+        from src.metrics import SCHEDULE_SYNC_TOTAL
+
+        mock_lock = AsyncMock()
+        mock_lock.acquire = AsyncMock(return_value=True)
+        mock_redis = AsyncMock()
+        mock_redis.lock = MagicMock(return_value=mock_lock)
+        results = {
+            group_id: {"success": ok, "changed": False, "entries_count": 0}
+            for group_id, ok in enumerate(outcomes, start=1)
+        }
+        counter = SCHEDULE_SYNC_TOTAL.labels(status=status)
+        before = counter._value.get()
+
+        with (
+            patch(
+                "src.scheduler._get_redis",
+                new_callable=AsyncMock,
+                return_value=mock_redis,
+            ),
+            patch("src.scheduler.get_session_maker"),
+            patch(
+                "src.services.schedule.sync_all_groups",
+                new_callable=AsyncMock,
+                return_value=results,
+            ),
+        ):
+            from src.scheduler import _sync_schedule_with_lock
+
+            await _sync_schedule_with_lock()
+
+        assert counter._value.get() == before + 1
+
 
 class TestGetRedis:
     """Tests for _get_redis."""
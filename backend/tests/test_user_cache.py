@@ -0,0 +1,144 @@
+"""Tests for the authenticated user cache."""
+
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import settings
+from src.metrics import USER_CACHE_REQUESTS_TOTAL
+from src.services import user_cache
+
+
+def _count(result: str) -> float:
+    """Get the current value of the user cache counter."""
+    return USER_CACHE_REQUESTS_TOTAL.labels(result=result)._value.get()
+
+
+class TestGetCurrentUserCache:
+    """Tests for caching in get_current_user."""
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_db(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test repeated requests with the same token hit the cache."""
+        from src.services.user import get_user_by_id
+
+        with patch("src.dependencies.get_user_by_id", wraps=get_user_by_id) as lookup:
+            hits = _count("hit")
+            first = await client.get("/api/v1/auth/me", headers=auth_headers)
+            second = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert lookup.await_count == 1
+        assert _count("hit") == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_settings_update_invalidates(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test /me reflects settings changes made with the same token."""
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        response = await client.patch(
+            "/api/v1/auth/me/settings",
+            json={"theme_mode": "dark"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.json()["theme_mode"] == "dark"
+
+    @pytest.mark.asyncio
+    async def test_cached_user_can_be_updated(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test a cached user attached to the session persists updates."""
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        response = await client.patch(
+            "/api/v1/auth/me/settings",
+            json={"preferred_subgroup": 2},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["preferred_subgroup"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_ttl(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test TTL 0 disables the cache."""
+        from src.services.user import get_user_by_id
+
+        with (
+            patch.object(settings, "user_cache_ttl_seconds", 0),
+            patch("src.dependencies.get_user_by_id", wraps=get_user_by_id) as lookup,
+        ):
+            await client.get("/api/v1/auth/me", headers=auth_headers)
+            await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert lookup.await_count == 2
+
+
+class TestRedisBacking:
+    """Tests for the optional Redis mirror."""
+
+    @pytest.mark.asyncio
+    async def test_shared_through_redis(self, db_session, fake_redis):
+        """Test entries written by one worker are readable by another."""
+        from src.models.user import User
+
+        user = User(email="redis@example.com", password_hash="x", name="Redis")
+        db_session.add(user)
+        await db_session.commit()
+
+        with (
+            patch.object(settings, "user_cache_redis_enabled", True),
+            patch("src.services.user_cache.get_cache_redis", return_value=fake_redis),
+        ):
+            await user_cache.cache_user(user, iat=123)
+            user_cache.clear_user_cache()  # simulate another process
+
+            cached = await user_cache.get_cached_user(db_session, user.id, 123)
+            assert cached is not None
+            assert cached.email == "redis@example.com"
+            assert cached.created_at == user.created_at
+
+            await user_cache.invalidate_user(user.id)
+            assert await user_cache.get_cached_user(db_session, user.id, 123) is None
+
+    @pytest.mark.asyncio
+    async def test_password_hash_not_cached(self, db_session, fake_redis):
+        """Test the password hash stays out of the local and Redis caches."""
+        from src.models.user import User
+
+        user = User(email="secret@example.com", password_hash="bcrypt", name="S")
+        db_session.add(user)
+        await db_session.commit()
+
+        with (
+            patch.object(settings, "user_cache_redis_enabled", True),
+            patch("src.services.user_cache.get_cache_redis", return_value=fake_redis),
+        ):
+            await user_cache.cache_user(user, iat=123)
+
+        stored = fake_redis.data[f"{user_cache.REDIS_KEY_PREFIX}{user.id}"]
+        assert all(b"password_hash" not in value for value in stored.values())
+        assert "password_hash" not in user_cache._local[(user.id, 123)][1]
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back(self, db_session):
+        """Test a broken Redis results in a plain cache miss."""
+        with (
+            patch.object(settings, "user_cache_redis_enabled", True),
+            patch(
+                "src.services.user_cache.get_cache_redis",
+                side_effect=ConnectionError("down"),
+            ),
+        ):
+            assert await user_cache.get_cached_user(db_session, 1, 1) is None
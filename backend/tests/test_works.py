@@ -117,6 +117,55 @@ class TestGetWorks:
         assert len(data) == 1
         assert data[0]["title"] == work_data["title"]
 
+    async def test_get_works_only_my_status(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        subject: dict,
+        work_data: dict,
+        test_user_data_2: dict,
+    ):
+        """Test listings carry and filter on the caller's status only."""
+        await client.post("/api/v1/auth/register", json=test_user_data_2)
+        login = await client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": test_user_data_2["email"],
+                "password": test_user_data_2["password"],
+            },
+        )
+        other_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        work_data["subject_id"] = subject["id"]
+        work = (
+            await client.post("/api/v1/works", json=work_data, headers=auth_headers)
+        ).json()
+        await client.put(
+            f"/api/v1/works/{work['id']}/status",
+            json={"status": "completed"},
+            headers=other_headers,
+        )
+
+        mine = (await client.get("/api/v1/works", headers=auth_headers)).json()
+        my_completed = await client.get(
+            "/api/v1/works?status=completed", headers=auth_headers
+        )
+        other_completed = await client.get(
+            "/api/v1/works?status=completed", headers=other_headers
+        )
+        upcoming = await client.get("/api/v1/works/upcoming", headers=auth_headers)
+
+        my_not_started = await client.get(
+            "/api/v1/works?status=not_started", headers=auth_headers
+        )
+
+        assert len(mine) == 1
+        assert mine[0]["my_status"]["status"] == "not_started"
+        assert my_completed.json() == []
+        assert [w["id"] for w in my_not_started.json()] == [work["id"]]
+        assert [w["id"] for w in other_completed.json()] == [work["id"]]
+        assert upcoming.json()[0]["my_status"] == "not_started"
+
 
 class TestCreateWork:
     """Tests for POST /api/v1/works."""
@@ -144,8 +193,9 @@ class TestCreateWork:
         assert data["max_grade"] == work_data["max_grade"]
         assert data["subject_id"] == subject["id"]
         assert "id" in data
-        assert "my_status" in data
+        # No status record until the first update: a default without an id
         assert data["my_status"]["status"] == "not_started"
+        assert "id" not in data["my_status"]
 
     async def test_create_work_minimal(
         self,
@@ -356,6 +406,39 @@ class TestUpdateWorkStatus:
         assert data["status"] == "in_progress"
         assert data["notes"] == "Started working"
 
+    async def test_first_update_creates_status_lazily(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        subject: dict,
+        work_data: dict,
+        test_user_data_2: dict,
+        db_session,
+    ):
+        """Test creating a work writes no statuses; the first update does."""
+        from sqlalchemy import func, select
+
+        from src.models.work import WorkStatus
+
+        await client.post("/api/v1/auth/register", json=test_user_data_2)
+        work_data["subject_id"] = subject["id"]
+        work = (
+            await client.post("/api/v1/works", json=work_data, headers=auth_headers)
+        ).json()
+        count = select(func.count()).select_from(WorkStatus)
+        assert (await db_session.execute(count)).scalar_one() == 0
+
+        for _ in range(2):
+            await client.put(
+                f"/api/v1/works/{work['id']}/status",
+                json={"status": "in_progress"},
+                headers=auth_headers,
+            )
+        response = await client.get(f"/api/v1/works/{work['id']}", headers=auth_headers)
+
+        assert (await db_session.execute(count)).scalar_one() == 1
+        assert response.json()["my_status"]["status"] == "in_progress"
+
     async def test_update_work_status_with_grade(
         self,
         client: AsyncClient,
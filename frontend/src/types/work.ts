@@ -36,14 +36,15 @@ export interface Work {
 }
 
 export interface WorkStatusData {
-  id: number
+  // Absent until the user first updates the status (default not_started)
+  id?: number
   work_id: number
   user_id: number
   status: WorkStatus
   grade: number | null
   notes: string | null
-  created_at: string
-  updated_at: string
+  created_at?: string
+  updated_at?: string
 }
 
 export interface WorkWithStatus extends Work {